@@ -6,11 +6,20 @@ Enhanced with proper accounting workflows and FIFO COGS tracking.
 
 import os
 import time
+import atexit
 import logging
+import queue
+import random
+import signal
 import sys
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Set
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from threading import Event, Lock
+from typing import Callable, Dict, List, Optional, Any, Set
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from src.config import Config
 from src.gmail_client import GmailClient
@@ -18,18 +27,91 @@ from src.openai_parser import EmailParser, ParseStatus, ParseResult, DataComplet
 from src.airtable_client import AirtableClient
 from src.zoho_client import ZohoClient
 from src.discord_notifier import DiscordNotifier
+from src.processed_store import ProcessedStore
+from src.http_session import create_session
+from src.stats import SessionStats
 
-# Configure logging with more detailed formatting
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler('inventory_reconciliation.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating log file written through a 64 KiB buffer.
+
+    Instead of after every record, the file is flushed when the listener has
+    drained log_queue, after an ERROR or worse, or at least every
+    flush_interval seconds under steady load, so a burst of records costs one
+    write and at most a second of INFO output is at risk in a crash.
+    """
+
+    buffer_size = 64 * 1024
+    flush_interval = 1.0
+
+    def __init__(self, filename, log_queue, **kwargs):
+        self.log_queue = log_queue
+        self._flush_now = False
+        self._last_flush = time.monotonic()
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        self._flush_now = record.levelno >= logging.ERROR
+        super().emit(record)
+
+    def flush(self):
+        now = time.monotonic()
+        if self._flush_now or self.log_queue.empty() or now - self._last_flush >= self.flush_interval:
+            super().flush()
+            self._last_flush = now
+
+
+# Configure logging with more detailed formatting. Records are handed to a
+# QueueListener thread so workers never block on file or console writes.
+_log_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s'
 )
+_log_queue = queue.SimpleQueue()
+_log_handlers = [
+    BufferedRotatingFileHandler('inventory_reconciliation.log', _log_queue,
+                                maxBytes=10 * 1024 * 1024, backupCount=5),
+    logging.StreamHandler(sys.stdout)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # full layout is applied by the listener
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
+# Per-transaction-type routing, looked up once instead of branching at every step:
+# - clean_fields: (Airtable field, default) copied into the Zoho payload
+# - price_field: per-item price key sent to Zoho
+# - order_counter / document_counters: stats bumped on a successful Zoho sync
+# - success_notifier: DiscordNotifier method for the success embed
+# - error_context: (Airtable field, Discord label, failed stage) for Zoho errors
+TRANSACTION_ROUTES = {
+    'purchase': {
+        'clean_fields': (('vendor_name', None), ('taxes', 0), ('shipping', 0)),
+        'price_field': 'unit_price',
+        'order_counter': 'purchase_orders_created',
+        'document_counters': (('bill_id', 'bills_created'),),
+        'success_notifier': 'send_purchase_order_success',
+        'error_context': ('vendor_name', 'Vendor', 'Purchase Order Creation'),
+    },
+    'sale': {
+        'clean_fields': (('channel', None), ('customer_email', None), ('taxes', 0), ('fees', 0)),
+        'price_field': 'sale_price',
+        'order_counter': 'sales_orders_created',
+        'document_counters': (('invoice_id', 'invoices_created'), ('shipment_id', 'shipments_created')),
+        'success_notifier': 'send_sales_order_success',
+        'error_context': ('channel', 'Channel', 'Sales Order Creation'),
+    },
+}
+
 
 class ProcessingStatus(Enum):
     """Status of record processing."""
@@ -40,9 +122,65 @@ class ProcessingStatus(Enum):
     READY_FOR_ZOHO = "ready_for_zoho"
     ZOHO_SYNCED = "zoho_synced"
     ZOHO_FAILED = "zoho_failed"
+    SKIPPED = "skipped"
     FAILED = "failed"
 
 
+@dataclass(slots=True)
+class PendingReview:
+    """An incomplete record saved to Airtable and waiting for human review."""
+    data: Dict
+    type: str
+    missing_fields: List[str]
+    created_at: float  # time.monotonic(); age is only computed for reports
+
+
+# Step timings are measured in integer nanoseconds and reported in whole milliseconds
+NS_PER_MS = 1_000_000
+
+# Parse status for "not an inventory email", resolved once at import rather than
+# probed per email: older parsers call it NOT_INVENTORY, current ones UNKNOWN_TYPE
+NOT_INVENTORY_STATUS = getattr(ParseStatus, 'NOT_INVENTORY', None) or getattr(ParseStatus, 'UNKNOWN_TYPE', None)
+
+# (label, counter name) rows of the Discord status and shutdown reports
+STATUS_REPORT_FIELDS = (
+    ("Emails Processed", 'emails_processed'),
+    ("Parse Success", 'parse_successful'),
+    ("Parse Failed", 'parse_failed'),
+    ("Complete Data", 'complete_data'),
+    ("Incomplete Data", 'incomplete_data'),
+    ("Airtable Records", 'airtable_saved'),
+    ("Purchase Orders", 'purchase_orders_created'),
+    ("Sales Orders", 'sales_orders_created'),
+    ("Bills Created", 'bills_created'),
+    ("Invoices Created", 'invoices_created'),
+    ("Shipments Created", 'shipments_created'),
+    ("Zoho Synced", 'synced_to_zoho'),
+    ("Pending Review", 'human_reviews_required'),
+    ("Errors", 'errors'),
+)
+SHUTDOWN_REPORT_FIELDS = (
+    ("Emails Processed", 'emails_processed'),
+    ("Purchase Orders", 'purchase_orders_created'),
+    ("Sales Orders", 'sales_orders_created'),
+    ("Bills Created", 'bills_created'),
+    ("Invoices Created", 'invoices_created'),
+    ("Shipments Created", 'shipments_created'),
+    ("Airtable Records", 'airtable_saved'),
+    ("Zoho Synced", 'synced_to_zoho'),
+    ("Human Reviews", 'human_reviews_required'),
+    ("Total Errors", 'errors'),
+)
+# (label, ZohoClient attribute) of the workflow flags, which are fixed for the session
+ZOHO_FLAG_FIELDS = (
+    ("Proper Workflows", 'use_proper_workflows'),
+    ("Auto Create Bills", 'auto_create_bills'),
+    ("Auto Create Invoices", 'auto_create_invoices'),
+    ("Auto Create Shipments", 'auto_create_shipments'),
+    ("Allow Direct Adjustments", 'allow_direct_adjustments'),
+)
+
+
 class InventoryReconciliationApp:
     """Main application orchestrator with proper Purchase/Sales Order workflows."""
     
@@ -55,72 +193,118 @@ class InventoryReconciliationApp:
         self.config = Config()
         logger.info("Configuration loaded successfully")
         
-        # Initialize clients with detailed logging
-        try:
-            self.gmail = GmailClient(self.config)
-            logger.info("Gmail client initialized")
-        except Exception as e:
-            logger.error(f"Gmail client initialization failed: {e}")
-            raise
-            
+        # Records below LOG_LEVEL are dropped before they are formatted or queued
+        log_level = str(self.config.get('LOG_LEVEL', 'INFO')).upper()
         try:
-            self.parser = EmailParser(self.config)
-            logger.info(f"OpenAI parser initialized (model: {self.parser.model})")
-        except Exception as e:
-            logger.error(f"OpenAI parser initialization failed: {e}")
-            raise
-            
-        try:
-            self.airtable = AirtableClient(self.config)
-            logger.info("Airtable client initialized (3-table architecture)")
-        except Exception as e:
-            logger.error(f"Airtable client initialization failed: {e}")
-            raise
+            logging.getLogger().setLevel(log_level)
+        except ValueError:
+            logger.warning("Unknown LOG_LEVEL '%s', keeping INFO", log_level)
+        
+        # One pooled HTTP session shared by the Airtable, Zoho and Discord clients
+        self.http = create_session(self.config)
+        
+        # Initialize clients with detailed logging. GmailClient logs in to IMAP as it
+        # is created, so that network round trip runs while the other clients are built
+        gmail_connector = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gmail-connect')
+        gmail_future = gmail_connector.submit(GmailClient, self.config)
+        gmail_connector.shutdown(wait=False)
             
         try:
-            self.zoho = ZohoClient(self.config)
-            logger.info("Zoho client initialized with lazy connection")
-            logger.info(f"   - Proper Workflows: {self.zoho.use_proper_workflows}")
-            logger.info(f"   - Auto Create Bills: {self.zoho.auto_create_bills}")
-            logger.info(f"   - Auto Create Invoices: {self.zoho.auto_create_invoices}")
-            logger.info(f"   - Auto Create Shipments: {self.zoho.auto_create_shipments}")
-            logger.info(f"   - Allow Direct Adjustments: {self.zoho.allow_direct_adjustments}")
-            logger.info(f"   - Connection: Will connect when processing emails")
-        except Exception as e:
-            logger.error(f"Zoho client initialization failed: {e}")
+            try:
+                self.parser = EmailParser(self.config)
+                logger.info("OpenAI parser initialized (model: %s)", self.parser.model)
+            except Exception as e:
+                logger.error("OpenAI parser initialization failed: %s", e)
+                raise
+                
+            try:
+                self.airtable = AirtableClient(self.config, self.http)
+                logger.info("Airtable client initialized (3-table architecture)")
+            except Exception as e:
+                logger.error("Airtable client initialization failed: %s", e)
+                raise
+                
+            try:
+                self.zoho = ZohoClient(self.config, self.http)
+                # Snapshot of the workflow flags as (label, value) pairs, logged by _log_system_status()
+                self._zoho_flags = tuple((label, getattr(self.zoho, attr)) for label, attr in ZOHO_FLAG_FIELDS)
+                logger.info("Zoho client initialized with lazy connection (connects when processing emails)")
+            except Exception as e:
+                logger.error("Zoho client initialization failed: %s", e)
+                raise
+                
+            try:
+                self.discord = DiscordNotifier(self.config, self.http)
+                logger.info("Discord notifier initialized")
+            except Exception as e:
+                logger.error("Discord notifier initialization failed: %s", e)
+                raise
+        except BaseException:
+            # Don't leave a half-started or logged-in IMAP session behind a failed start
+            gmail_future.cancel()
+            try:
+                gmail_future.result().close()
+            except Exception:
+                pass
             raise
             
         try:
-            self.discord = DiscordNotifier(self.config)
-            logger.info("Discord notifier initialized")
+            self.gmail = gmail_future.result()
+            logger.info("Gmail client initialized")
         except Exception as e:
-            logger.error(f"Discord notifier initialization failed: {e}")
+            logger.error("Gmail client initialization failed: %s", e)
             raise
         
         # Application state
-        self.stats = {
-            'emails_processed': 0,
-            'parse_successful': 0,
-            'parse_failed': 0,
-            'incomplete_data': 0,
-            'airtable_saved': 0,
-            'synced_to_zoho': 0,
-            'purchase_orders_created': 0,
-            'sales_orders_created': 0,
-            'bills_created': 0,
-            'invoices_created': 0,
-            'shipments_created': 0,
-            'inventory_updated': 0,
-            'human_reviews_required': 0,
-            'errors': 0,
-            'session_start': datetime.now()
-        }
+        self.stats = SessionStats()
+        self._reviews_lock = Lock()
         
         # Track records pending review
-        self.pending_reviews = {}  # airtable_id: data
+        self.pending_reviews: Dict[str, PendingReview] = {}  # in creation order (oldest first)
+        # Handler, stats counter and log line for each completeness outcome
+        self._completeness_routes = {
+            DataCompleteness.COMPLETE: (
+                self._process_complete_transaction, 'complete_data',
+                "Data is COMPLETE - processing through full workflow"
+            ),
+            DataCompleteness.INCOMPLETE: (
+                self._process_incomplete_transaction, 'incomplete_data',
+                "Data is INCOMPLETE - saving to Airtable for review"
+            ),
+        }
+        # Discord success notifier and Zoho error context per transaction type, resolved once
+        self._success_notifiers = {
+            transaction_type: getattr(self.discord, route['success_notifier'], None)
+            for transaction_type, route in TRANSACTION_ROUTES.items()
+        }
+        self._workflow_error_notifier = getattr(self.discord, 'send_workflow_error', None)
+        # Incomplete transactions waiting for the end-of-cycle Airtable batch, by type
+        self._incomplete_queue = {transaction_type: [] for transaction_type in TRANSACTION_ROUTES}
+        # Step timings of each complete transaction this cycle, rolled up in the cycle summary
+        self._cycle_timings: List[Dict[str, int]] = []
+        
+        # Track processed emails by Message-ID (persisted across restarts)
+        self.processed_store = ProcessedStore(self.config)
+        
+        # Number of emails processed concurrently per cycle. The pool lives for the
+        # whole session so worker threads (and their stats shards) are reused
+        self.max_concurrency = max(1, self.config.get_int('EMAIL_CONCURRENCY'))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='email')
+        # Transaction records are written here while the email worker runs the Zoho workflow
+        self._record_pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='airtable-record')
+        
+        # Set by SIGTERM/SIGINT; the loop finishes the current cycle and shuts down
+        self._stop = Event()
         
-        # Track processed emails by sequence number
-        self.processed_seq_nums: Set[str] = set()
+        # Loop tunables, read once so the polling loop only touches plain ints
+        self._poll_interval = self.config.get_int('POLL_INTERVAL')
+        self._idle_timeout = self.config.get_int('GMAIL_IDLE_TIMEOUT')
+        self._validation_interval = self.config.get_int('VALIDATION_INTERVAL')
+        self._error_backoff_max = self.config.get_int('ERROR_BACKOFF_MAX')
+        self._status_every = max(1, self.config.get_int('STATUS_REPORT_EVERY'))
+        self._poll_interval_max = max(self._poll_interval, self.config.get_int('POLL_INTERVAL_MAX'))
+        # With IDLE push the loop only needs to wake for new mail and periodic work
+        self._idle_wait = min(self._idle_timeout, self._validation_interval)
         
         logger.info("All components initialized successfully!")
         
@@ -130,100 +314,103 @@ class InventoryReconciliationApp:
     def _log_system_status(self):
         """Log current system configuration and status."""
         logger.info("System Configuration:")
-        logger.info(f"   - Proper Workflows: {self.zoho.use_proper_workflows}")
-        logger.info(f"   - Auto Create Bills: {self.zoho.auto_create_bills}")
-        logger.info(f"   - Auto Create Invoices: {self.zoho.auto_create_invoices}")
-        logger.info(f"   - Auto Create Shipments: {self.zoho.auto_create_shipments}")
-        logger.info(f"   - Allow Direct Adjustments: {self.zoho.allow_direct_adjustments}")
+        for label, value in self._zoho_flags:
+            logger.info("   - %s: %s", label, value)
         
         logger.info("Service Status:")
         try:
             gmail_status = self.gmail.test_connection() if hasattr(self.gmail, 'test_connection') else True
-            logger.info(f"   - Gmail: {'Connected' if gmail_status else 'Failed'}")
+            logger.info("   - Gmail: %s", 'Connected' if gmail_status else 'Failed')
         except:
-            logger.info(f"   - Gmail: Initialized")
+            logger.info("   - Gmail: Initialized")
             
         try:
             openai_status = self.parser.test_connection() if hasattr(self.parser, 'test_connection') else True
-            logger.info(f"   - OpenAI: {'Available' if openai_status else 'Failed'}")
+            logger.info("   - OpenAI: %s", 'Available' if openai_status else 'Failed')
         except:
-            logger.info(f"   - OpenAI: Initialized")
+            logger.info("   - OpenAI: Initialized")
             
         try:
             airtable_status = self.airtable.test_connection() if hasattr(self.airtable, 'test_connection') else True
-            logger.info(f"   - Airtable: {'Connected' if airtable_status else 'Failed'}")
+            logger.info("   - Airtable: %s", 'Connected' if airtable_status else 'Failed')
         except:
-            logger.info(f"   - Airtable: Initialized")
+            logger.info("   - Airtable: Initialized")
             
-        logger.info(f"   - Zoho: {'Ready (lazy connection)' if hasattr(self.zoho, '_ensure_connection') else 'Failed'}")
+        logger.info("   - Zoho: %s", 'Ready (lazy connection)' if hasattr(self.zoho, '_ensure_connection') else 'Failed')
         
         try:
             discord_status = self.discord.test_webhook() if hasattr(self.discord, 'test_webhook') else True
-            logger.info(f"   - Discord: {'Ready' if discord_status else 'Failed'}")
+            logger.info("   - Discord: %s", 'Ready' if discord_status else 'Failed')
         except:
-            logger.info(f"   - Discord: Initialized")
+            logger.info("   - Discord: Initialized")
 
-    def process_email(self, email_data: Dict) -> None:
+    def process_email(self, email_data: Dict, parse_result: Optional[ParseResult] = None) -> ProcessingStatus:
         """
         Process email with sequential Airtable → Zoho workflow using proper Purchase/Sales Orders.
+        
+        Args:
+            email_data: Email dictionary from the Gmail client
+            parse_result: Result from a batch parse; the email is parsed here if omitted
+            
+        Returns:
+            Final processing status of the email
         """
         seq_num = email_data.get('seq_num', 'unknown')
         subject = email_data.get('subject', 'No Subject')[:100]
         
-        logger.info(f"Processing email [seq={seq_num}]: {subject}")
+        logger.info("Processing email [seq=%s]: %s", seq_num, subject)
         
         try:
-            self.stats['emails_processed'] += 1
-            
-            # Step 1: Parse email with OpenAI
-            logger.info(f"Parsing email with OpenAI...")
-            parse_start = time.time()
-            
-            parse_result = self.parser.parse_email(
-                email_data['body'],
-                email_data['subject']
-            )
+            self.stats.incr('emails_processed')
             
-            parse_duration = time.time() - parse_start
-            logger.info(f"OpenAI parsing completed in {parse_duration:.2f}s")
+            # Step 1: Parse email with OpenAI (unless already parsed as part of a batch)
+            # (parse_result.parse_time is reported with the other step timings)
+            if parse_result is None:
+                logger.debug("Parsing email with OpenAI...")
+                parse_result = self.parser.parse_email(
+                    email_data['body'],
+                    email_data['subject'],
+                    sender=email_data.get('from')
+                )
             
             # Check parse status
             if parse_result.status == ParseStatus.FAILED:
-                logger.error(f"OpenAI parsing failed: {', '.join(parse_result.errors)}")
+                logger.error("OpenAI parsing failed: %s", ', '.join(parse_result.errors))
                 if hasattr(self.discord, 'send_error_notification'):
                     self.discord.send_error_notification(
                         "Email Parsing Failed",
                         f"Failed to parse email: {subject}",
-                        {'errors': parse_result.errors, 'seq_num': seq_num}
+                        {'errors': parse_result.errors, 'seq_num': seq_num},
+                        queue=True
                     )
-                self.stats['parse_failed'] += 1
-                return
-                
-            # Check if this is inventory-related (use different attribute names based on what's available)
-            if hasattr(ParseStatus, 'NOT_INVENTORY'):
-                if parse_result.status == ParseStatus.NOT_INVENTORY:
-                    logger.info(f"Email not related to inventory - skipping: {subject}")
-                    return
-            elif hasattr(ParseStatus, 'UNKNOWN_TYPE'):
-                if parse_result.status == ParseStatus.UNKNOWN_TYPE:
-                    logger.info(f"Email not related to inventory - skipping: {subject}")
-                    return
-            elif hasattr(parse_result, 'status') and str(parse_result.status).upper() in ['NOT_INVENTORY', 'UNKNOWN_TYPE', 'UNKNOWN']:
-                logger.info(f"Email not related to inventory - skipping: {subject}")
-                return
+                self.stats.incr('parse_failed')
+                return ProcessingStatus.FAILED
+                
+            # Check if this is inventory-related
+            if NOT_INVENTORY_STATUS is not None:
+                not_inventory = parse_result.status == NOT_INVENTORY_STATUS
+            else:
+                not_inventory = str(getattr(parse_result, 'status', '')).upper() in ('NOT_INVENTORY', 'UNKNOWN_TYPE', 'UNKNOWN')
+            if not_inventory:
+                logger.info("Email not related to inventory - skipping: %s", subject)
+                return ProcessingStatus.SKIPPED
                 
             # Extract parsed data
             parsed_data = parse_result.data
             if not parsed_data:
-                logger.warning(f"No data extracted from email: {subject}")
-                self.stats['errors'] += 1
-                return
+                logger.warning("No data extracted from email: %s", subject)
+                self.stats.incr('errors')
+                return ProcessingStatus.FAILED
                 
-            self.stats['parse_successful'] += 1
-            
             transaction_type = parsed_data.get('type', 'unknown')
             order_number = parsed_data.get('order_number', 'N/A')
             
+            # Nothing downstream can handle an unknown type - don't write it to Airtable
+            if transaction_type not in TRANSACTION_ROUTES:
+                logger.warning("Unsupported transaction type '%s' - skipping: %s", transaction_type, subject)
+                self.stats.incr('parse_successful')
+                return ProcessingStatus.SKIPPED
+            
             # Handle different confidence attribute names
             confidence = 0.0
             if hasattr(parse_result, 'confidence'):
@@ -235,35 +422,45 @@ class InventoryReconciliationApp:
             else:
                 confidence = 0.8  # Default reasonable confidence
             
-            logger.info(f"Parse Results:")
-            logger.info(f"  - Type: {transaction_type}")
-            logger.info(f"  - Order: {order_number}")
-            logger.info(f"  - Status: {parse_result.status.value}")
-            logger.info(f"  - Completeness: {parse_result.completeness.value}")
-            logger.info(f"  - Confidence: {confidence:.2%}")
-            
-            if parse_result.missing_fields:
-                logger.info(f"  - Missing fields: {', '.join(parse_result.missing_fields)}")
+            # One record per email instead of a multi-line block; the same values
+            # ride along as structured data for handlers that want them
+            if logger.isEnabledFor(logging.INFO):
+                parse_summary = {
+                    'type': transaction_type,
+                    'order': order_number,
+                    'status': parse_result.status.value,
+                    'completeness': parse_result.completeness.value,
+                    'confidence': confidence,
+                    'missing': parse_result.missing_fields,
+                }
+                logger.info(
+                    "Parse results: type=%s order=%s status=%s completeness=%s confidence=%.2f%% missing=[%s]",
+                    transaction_type, order_number, parse_summary['status'], parse_summary['completeness'],
+                    confidence * 100, ', '.join(parse_result.missing_fields), extra={'parse': parse_summary}
+                )
             
             # Add email metadata
             parsed_data['email_seq_num'] = seq_num
             parsed_data['email_date'] = email_data['date']
-            parsed_data['parse_result'] = parse_result.to_dict()
+            # Airtable only reads these two lists; to_dict() would deep-copy the whole result
+            parsed_data['parse_result'] = {
+                'missing_fields': parse_result.missing_fields,
+                'warnings': parse_result.warnings
+            }
             parsed_data['confidence_score'] = confidence
             
             # Step 2: Process based on data completeness
-            if parse_result.completeness == DataCompleteness.COMPLETE:
-                logger.info(f"Data is COMPLETE - processing through full workflow")
-                self._process_complete_transaction(parsed_data, transaction_type, parse_result)
-                
-            elif parse_result.completeness == DataCompleteness.INCOMPLETE:
-                logger.info(f"Data is INCOMPLETE - saving to Airtable for review")
-                self._process_incomplete_transaction(parsed_data, transaction_type, parse_result)
-                self.stats['incomplete_data'] += 1
-                
-            else:
-                logger.error(f"Invalid data completeness: {parse_result.completeness}")
-                self.stats['errors'] += 1
+            route = self._completeness_routes.get(parse_result.completeness)
+            if route is None:
+                logger.error("Invalid data completeness: %s", parse_result.completeness)
+                self.stats.incr_many(('parse_successful', 'errors'))
+                return ProcessingStatus.FAILED
+            
+            handler, counter, message = route
+            logger.info(message)
+            # parse_successful is counted here, together with the completeness outcome
+            self.stats.incr_many(('parse_successful', counter))
+            return handler(parsed_data, transaction_type, parse_result)
                 
         except Exception as e:
             error_msg = f"Error processing email [seq={seq_num}]: {str(e)}"
@@ -272,49 +469,63 @@ class InventoryReconciliationApp:
                 self.discord.send_error_notification(
                     "Email Processing Error",
                     error_msg,
-                    {'seq_num': seq_num, 'subject': subject}
+                    {'seq_num': seq_num, 'subject': subject},
+                    queue=True
                 )
-            self.stats['errors'] += 1
+            self.stats.incr('errors')
+            return ProcessingStatus.FAILED
 
-    def _process_complete_transaction(self, data: Dict, transaction_type: str, parse_result: ParseResult):
-        """Process complete data through the full sequential workflow."""
+    def _process_complete_transaction(self, data: Dict, transaction_type: str, parse_result: ParseResult,
+                                      on_inventory_applied: Optional[Callable[[], None]] = None) -> ProcessingStatus:
+        """
+        Process complete data through the full sequential workflow.
+        
+        on_inventory_applied is called once Airtable has applied the inventory
+        changes, after which the transaction must not be processed again.
+        """
         order_number = data.get('order_number', 'N/A')
+        # Step durations in ms, logged together as one record when the transaction is done
+        timings = {'parse_ms': round(parse_result.parse_time * 1000)}
         
         try:
             # Step 1: Process through Airtable (3-table workflow)
-            logger.info(f"Processing complete {transaction_type} through Airtable workflow...")
-            airtable_start = time.time()
+            logger.debug("Processing complete %s through Airtable workflow...", transaction_type)
+            airtable_start = time.monotonic_ns()
             
             data['requires_review'] = False
             data['completeness'] = parse_result.completeness.value
             
-            airtable_result = self.airtable.process_transaction(data, transaction_type)
-            airtable_duration = time.time() - airtable_start
-            
-            logger.info(f"Airtable processing completed in {airtable_duration:.2f}s")
+            airtable_result = self.airtable.process_transaction(data, transaction_type, create_record=False)
+            timings['airtable_ms'] = (time.monotonic_ns() - airtable_start) // NS_PER_MS
             
             if airtable_result.get('success'):
-                self.stats['airtable_saved'] += 1
-                self.stats['inventory_updated'] += len(airtable_result.get('inventory_updates', []))
+                if on_inventory_applied is not None:
+                    on_inventory_applied()
+                self.stats.incr('inventory_updated', len(airtable_result.get('inventory_updates', [])))
                 
-                transaction_record_id = airtable_result.get('transaction_record_id')
                 items_processed = len(airtable_result.get('items_processed', []))
                 
-                logger.info(f"Airtable processing SUCCESS:")
-                logger.info(f"   - Transaction record: {transaction_record_id}")
-                logger.info(f"   - Items processed: {items_processed}")
-                logger.info(f"   - Inventory updates: {len(airtable_result.get('inventory_updates', []))}")
+                logger.info(
+                    "Airtable inventory SUCCESS: items=%s inventory_updates=%s",
+                    items_processed, len(airtable_result.get('inventory_updates', []))
+                )
                 
                 if airtable_result.get('warnings'):
-                    logger.warning(f"Airtable warnings: {'; '.join(airtable_result['warnings'][:3])}")
+                    logger.warning("Airtable warnings: %s", '; '.join(airtable_result['warnings'][:3]))
+                
+                # Zoho only needs the SKUs resolved above, so the transaction record is
+                # written to Airtable while the Zoho workflow runs
+                record_future = self._record_pool.submit(
+                    self.airtable.create_transaction_record, airtable_result, transaction_type
+                )
                 
                 # Step 2: Execute proper Zoho workflow (only if there are emails to process)
-                logger.info(f"Executing proper Zoho {transaction_type} workflow...")
-                self._execute_zoho_workflow(airtable_result, transaction_type, transaction_record_id)
+                logger.debug("Executing proper Zoho %s workflow...", transaction_type)
+                return self._execute_zoho_workflow(airtable_result, transaction_type, record_future, timings)
                 
             else:
-                logger.error(f"Airtable processing FAILED: {'; '.join(airtable_result.get('errors', []))}")
-                self.stats['errors'] += 1
+                logger.error("Airtable processing FAILED: %s", '; '.join(airtable_result.get('errors', [])))
+                self.stats.incr('errors')
                 
                 # Send error notification
                 if hasattr(self.discord, 'send_error_notification'):
@@ -324,57 +535,70 @@ class InventoryReconciliationApp:
                         {
                             "errors": airtable_result.get('errors', []),
                             "transaction_type": transaction_type
-                        }
+                        },
+                        queue=True
                     )
+                return ProcessingStatus.FAILED
                 
         except Exception as e:
-            self.stats['errors'] += 1
-            logger.error(f"Failed to process complete transaction: {e}", exc_info=True)
+            self.stats.incr('errors')
+            logger.error("Failed to process complete transaction: %s", e, exc_info=True)
             
             if hasattr(self.discord, 'send_error_notification'):
                 self.discord.send_error_notification(
                     "Transaction Processing Failed",
                     f"Unexpected error processing {transaction_type}: {order_number}",
-                    {"error": str(e), "transaction_type": transaction_type}
+                    {"error": str(e), "transaction_type": transaction_type},
+                    queue=True
                 )
+            return ProcessingStatus.FAILED
+            
+        finally:
+            self._cycle_timings.append(timings)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Timings [order=%s]: %s", order_number,
+                            ' '.join(f'{step}={ms}' for step, ms in timings.items()),
+                            extra={'timings': timings})
 
-    def _execute_zoho_workflow(self, airtable_result: Dict, transaction_type: str, transaction_record_id: str):
-        """Execute proper Zoho workflow using clean data from Airtable."""
+    def _execute_zoho_workflow(self, airtable_result: Dict, transaction_type: str, record_future: Future,
+                               timings: Optional[Dict[str, int]] = None) -> ProcessingStatus:
+        """
+        Execute proper Zoho workflow using clean data from Airtable (zoho_ms is added to timings).
+        
+        record_future is the transaction record being created concurrently; it is
+        awaited before the record is marked synced or failed. If it could not be
+        saved but Zoho has already booked the documents, the transaction still
+        counts as synced and the Zoho IDs are reported so the record can be
+        restored by hand (reprocessing the email would book them a second time).
+        """
+        transaction_record_id = None
         try:
-            zoho_start = time.time()
+            zoho_start = time.monotonic_ns()
             
             # Extract clean data from Airtable result - SKUs are guaranteed to exist
             clean_data = self._build_clean_data_from_airtable(airtable_result, transaction_type)
             
             # Execute proper workflow through ZohoClient
             zoho_result = self.zoho.process_complete_data(clean_data, transaction_type)
-            zoho_duration = time.time() - zoho_start
+            if timings is not None:
+                timings['zoho_ms'] = (time.monotonic_ns() - zoho_start) // NS_PER_MS
             
-            logger.info(f"Zoho workflow completed in {zoho_duration:.2f}s")
+            transaction_record_id = self._await_transaction_record(record_future, airtable_result, transaction_type)
             
             if zoho_result.get('success'):
-                self.stats['synced_to_zoho'] += 1
-                
-                # Update transaction-specific stats
-                if transaction_type == 'purchase':
-                    self.stats['purchase_orders_created'] += 1
-                    if zoho_result.get('bill_id'):
-                        self.stats['bills_created'] += 1
-                else:  # sale
-                    self.stats['sales_orders_created'] += 1
-                    if zoho_result.get('invoice_id'):
-                        self.stats['invoices_created'] += 1
-                    if zoho_result.get('shipment_id'):
-                        self.stats['shipments_created'] += 1
-                
-                logger.info(f"Zoho workflow SUCCESS:")
-                
-                # Log workflow steps
-                for step in zoho_result.get('workflow_steps', []):
-                    logger.info(f"   - {step}")
+                # Sync plus transaction-specific stats, in one update
+                route = TRANSACTION_ROUTES[transaction_type]
+                counters = ['synced_to_zoho', route['order_counter']]
+                counters.extend(counter for result_key, counter in route['document_counters']
+                                if zoho_result.get(result_key))
+                self.stats.incr_many(counters)
+                
+                logger.info("Zoho workflow SUCCESS: %s", '; '.join(zoho_result.get('workflow_steps', [])))
                 
+                if transaction_record_id is None:
+                    self._send_unlinked_zoho_notification(airtable_result, zoho_result, transaction_type)
                 # Mark Airtable record as synced
-                if hasattr(self.airtable, 'mark_record_synced_to_zoho'):
+                elif hasattr(self.airtable, 'mark_record_synced_to_zoho'):
                     self.airtable.mark_record_synced_to_zoho(
                         transaction_record_id,
                         transaction_type,
@@ -383,13 +607,14 @@ class InventoryReconciliationApp:
                 
                 # Send enhanced success notification
                 self._send_enhanced_success_notification(airtable_result, zoho_result, transaction_type)
+                return ProcessingStatus.ZOHO_SYNCED
                 
             else:
-                logger.error(f"Zoho workflow FAILED: {'; '.join(zoho_result.get('errors', []))}")
-                self.stats['errors'] += 1
+                logger.error("Zoho workflow FAILED: %s", '; '.join(zoho_result.get('errors', [])))
+                self.stats.incr('errors')
                 
                 # Mark as failed in Airtable
-                if hasattr(self.airtable, 'mark_record_zoho_failed'):
+                if transaction_record_id and hasattr(self.airtable, 'mark_record_zoho_failed'):
                     self.airtable.mark_record_zoho_failed(
                         transaction_record_id,
                         transaction_type,
@@ -398,13 +623,20 @@ class InventoryReconciliationApp:
                 
                 # Send error notification
                 self._send_zoho_error_notification(airtable_result, zoho_result, transaction_type)
+                # Without a record nothing of the transaction was saved
+                if transaction_record_id is None:
+                    return ProcessingStatus.FAILED
+                return ProcessingStatus.ZOHO_FAILED
                 
         except Exception as e:
-            self.stats['errors'] += 1
-            logger.error(f"Zoho workflow execution failed: {e}", exc_info=True)
+            self.stats.incr('errors')
+            logger.error("Zoho workflow execution failed: %s", e, exc_info=True)
+            
+            if transaction_record_id is None:
+                transaction_record_id = self._await_transaction_record(record_future, airtable_result, transaction_type)
             
             # Mark as failed in Airtable
-            if hasattr(self.airtable, 'mark_record_zoho_failed'):
+            if transaction_record_id and hasattr(self.airtable, 'mark_record_zoho_failed'):
                 self.airtable.mark_record_zoho_failed(
                     transaction_record_id,
                     transaction_type,
@@ -415,197 +647,297 @@ class InventoryReconciliationApp:
                 self.discord.send_error_notification(
                     "Zoho Workflow Failed",
                     f"Failed to execute Zoho workflow for {transaction_type}",
-                    {"error": str(e), "airtable_record": transaction_record_id}
+                    {"error": str(e), "airtable_record": transaction_record_id},
+                    queue=True
                 )
+            return ProcessingStatus.ZOHO_FAILED
+
+    def _send_unlinked_zoho_notification(self, airtable_result: Dict, zoho_result: Dict, transaction_type: str):
+        """Report Zoho documents that were booked although their Airtable record could not be saved."""
+        order_number = airtable_result.get('record_data', {}).get('order_number', 'N/A')
+        zoho_ids = {key: value for key, value in zoho_result.items() if key.endswith('_id') and value}
+        logger.error("Zoho %s %s booked without an Airtable record: %s", transaction_type, order_number, zoho_ids)
+        if hasattr(self.discord, 'send_error_notification'):
+            self.discord.send_error_notification(
+                "Zoho Order Missing Airtable Record",
+                f"{transaction_type.title()} {order_number} was created in Zoho but its Airtable record "
+                f"could not be saved - add the record manually, do not reprocess the email",
+                {"transaction_type": transaction_type, "order_number": order_number, **zoho_ids},
+                queue=True
+            )
+
+    def _await_transaction_record(self, record_future: Future, airtable_result: Dict,
+                                  transaction_type: str) -> Optional[str]:
+        """Wait for the transaction record, retrying the create once; None if it could not be saved."""
+        try:
+            transaction_record_id = record_future.result()
+        except Exception as e:
+            logger.warning("Creating %s record failed, retrying: %s", transaction_type, e)
+            try:
+                transaction_record_id = self.airtable.create_transaction_record(airtable_result, transaction_type)
+            except Exception as e:
+                order_number = airtable_result.get('record_data', {}).get('order_number', 'N/A')
+                logger.error("Failed to save %s record %s to Airtable: %s", transaction_type, order_number, e)
+                self.stats.incr('errors')
+                if hasattr(self.discord, 'send_error_notification'):
+                    self.discord.send_error_notification(
+                        "Airtable Processing Failed",
+                        f"Failed to save {transaction_type} to Airtable: {order_number}",
+                        {"error": str(e), "transaction_type": transaction_type},
+                        queue=True
+                    )
+                return None
+                
+        self.stats.incr('airtable_saved')
+        return transaction_record_id
 
     def _build_clean_data_from_airtable(self, airtable_result: Dict, transaction_type: str) -> Dict:
         """Build clean data structure for Zoho using Airtable as single source of truth."""
+        # record_data is the transaction the Airtable record is built from, its items
+        # carrying their assigned SKUs; the result itself only holds item summaries
+        record_data = airtable_result.get('record_data')
+        if record_data:
+            source, items = record_data, record_data.get('items', [])
+        else:
+            source, items = airtable_result, airtable_result.get('items_processed', [])
+        
+        route = TRANSACTION_ROUTES[transaction_type]
+        price_field = route['price_field']
+        
         clean_data = {
             'type': transaction_type,
-            'order_number': airtable_result.get('order_number'),
-            'date': airtable_result.get('date'),
-            'items': []
+            'order_number': source.get('order_number'),
+            'date': source.get('date'),
+            # Clean item list with guaranteed SKUs from Airtable
+            'items': [
+                {
+                    'name': item.get('name'),
+                    'sku': item.get('sku'),
+                    'quantity': item.get('quantity'),
+                    price_field: item.get(price_field, 0),
+                }
+                for item in items
+            ],
         }
         
         # Add transaction-specific fields
-        if transaction_type == 'purchase':
-            clean_data['vendor_name'] = airtable_result.get('vendor_name')
-            clean_data['taxes'] = airtable_result.get('taxes', 0)
-            clean_data['shipping'] = airtable_result.get('shipping', 0)
-        else:  # sale
-            clean_data['channel'] = airtable_result.get('channel')
-            clean_data['customer_email'] = airtable_result.get('customer_email')
-            clean_data['taxes'] = airtable_result.get('taxes', 0)
-            clean_data['fees'] = airtable_result.get('fees', 0)
-        
-        # Build clean item list with guaranteed SKUs from Airtable
-        for item_processed in airtable_result.get('items_processed', []):
-            clean_item = {
-                'name': item_processed.get('name'),
-                'sku': item_processed.get('sku'),  # Guaranteed to exist from Airtable
-                'quantity': item_processed.get('quantity')
-            }
-            
-            if transaction_type == 'purchase':
-                clean_item['unit_price'] = item_processed.get('unit_price', 0)
-            else:
-                clean_item['sale_price'] = item_processed.get('sale_price', 0)
-                
-            clean_data['items'].append(clean_item)
-        
+        clean_data.update((field, source.get(field, default)) for field, default in route['clean_fields'])
         return clean_data
 
-    def _process_incomplete_transaction(self, data: Dict, transaction_type: str, parse_result: ParseResult):
-        """Process incomplete data through Airtable-only workflow."""
-        order_number = data.get('order_number', 'N/A')
+    def _process_incomplete_transaction(self, data: Dict, transaction_type: str, parse_result: ParseResult) -> ProcessingStatus:
+        """
+        Queue incomplete data for the Airtable-only workflow.
         
-        try:
-            logger.info(f"Saving incomplete {transaction_type} to Airtable for review...")
-            airtable_start = time.time()
+        Records are created in batches by _flush_incomplete_transactions() at the
+        end of the cycle, which also registers the reviews and notifications.
+        """
+        logger.debug("Queueing incomplete %s for Airtable review...", transaction_type)
+        
+        data['requires_review'] = True
+        data['completeness'] = parse_result.completeness.value
+        data['processing_status'] = ProcessingStatus.AIRTABLE_INCOMPLETE.value
+        data['missing_fields'] = parse_result.missing_fields
+        
+        with self._reviews_lock:
+            self._incomplete_queue[transaction_type].append((data, parse_result))
+        
+        logger.debug("SKIPPING inventory and Zoho processing - data incomplete")
+        return ProcessingStatus.PENDING_REVIEW
+
+    def _flush_incomplete_transactions(self) -> Set[str]:
+        """
+        Save queued incomplete transactions to Airtable, up to 10 records per request.
+        
+        Returns:
+            Sequence numbers of emails whose record could not be created
+        """
+        with self._reviews_lock:
+            queued = self._incomplete_queue
+            self._incomplete_queue = {transaction_type: [] for transaction_type in TRANSACTION_ROUTES}
+        
+        failed = set()
+        for transaction_type, entries in queued.items():
+            if not entries:
+                continue
             
-            data['requires_review'] = True
-            data['completeness'] = parse_result.completeness.value
-            data['processing_status'] = ProcessingStatus.AIRTABLE_INCOMPLETE.value
-            data['missing_fields'] = parse_result.missing_fields
+            logger.info("Saving %s incomplete %s records to Airtable for review...", len(entries), transaction_type)
+            airtable_start = time.monotonic()
             
             # Save directly to transaction table (skip inventory processing)
-            if transaction_type == 'purchase':
-                airtable_record = self.airtable.create_purchase(data)
-            else:
-                airtable_record = self.airtable.create_sale(data)
-                
-            airtable_duration = time.time() - airtable_start
-            airtable_id = airtable_record.get('id')
-            
-            logger.info(f"Incomplete data saved in {airtable_duration:.2f}s")
-            logger.info(f"   - Record ID: {airtable_id}")
-            logger.info(f"   - Status: REQUIRES_REVIEW")
+            records = self.airtable.batch_create(transaction_type, [data for data, _ in entries])
+            logger.info("Incomplete data saved in %.2fs", time.monotonic() - airtable_start)
             
-            # Track for review
-            if airtable_id:
-                self.pending_reviews[airtable_id] = {
-                    'data': data,
-                    'type': transaction_type,
-                    'missing_fields': parse_result.missing_fields,
-                    'created_at': datetime.now()
-                }
-                self.stats['human_reviews_required'] += 1
-                
-                logger.info(f"Added to review queue:")
-                logger.info(f"   - Missing: {', '.join(parse_result.missing_fields[:5])}")
-                logger.info(f"   - Total pending: {self.stats['human_reviews_required']}")
-                
-            # Send human review notification using enhanced Discord notifier
-            if hasattr(self.discord, 'send_human_review_notification'):
-                # Handle different confidence attribute names
-                confidence = 0.0
-                if hasattr(parse_result, 'confidence'):
-                    confidence = parse_result.confidence
-                elif hasattr(parse_result, 'confidence_score'):
-                    confidence = parse_result.confidence_score
-                elif hasattr(parse_result, 'score'):
-                    confidence = parse_result.score
-                else:
-                    confidence = 0.5  # Default for incomplete data
-                    
-                self.discord.send_human_review_notification(
-                    transaction_type,
-                    order_number,
-                    parse_result.missing_fields,
-                    airtable_id,
-                    confidence
+            for (data, parse_result), record in zip(entries, records):
+                if record:
+                    self._track_incomplete_transaction(data, transaction_type, parse_result, record.get('id'))
+                    continue
+                
+                order_number = data.get('order_number', 'N/A')
+                failed.add(data.get('email_seq_num'))
+                logger.error("Error saving incomplete data for %s", order_number)
+                if hasattr(self.discord, 'send_error_notification'):
+                    self.discord.send_error_notification(
+                        "Incomplete Data Processing Failed",
+                        f"Error saving incomplete data for {order_number} to Airtable",
+                        {'transaction_type': transaction_type, 'order_number': order_number},
+                        queue=True
+                    )
+        
+        return failed
+
+    def _track_incomplete_transaction(self, data: Dict, transaction_type: str, parse_result: ParseResult,
+                                      airtable_id: Optional[str]):
+        """Register a saved incomplete record for review and queue its Discord notification."""
+        order_number = data.get('order_number', 'N/A')
+        
+        logger.info("Incomplete %s saved for review: record=%s status=REQUIRES_REVIEW", order_number, airtable_id)
+        
+        # Track for review
+        if airtable_id:
+            with self._reviews_lock:
+                self.pending_reviews[airtable_id] = PendingReview(
+                    data, transaction_type, parse_result.missing_fields, time.monotonic()
                 )
+            self.stats.incr('human_reviews_required')
             
-            logger.info(f"SKIPPING inventory and Zoho processing - data incomplete")
+            logger.info("Added to review queue: missing=[%s] total_pending=%s",
+                        ', '.join(parse_result.missing_fields[:5]), self.stats.human_reviews_required)
+        
+        # Send human review notification using enhanced Discord notifier
+        if self.discord.enabled and hasattr(self.discord, 'send_human_review_notification'):
+            # Handle different confidence attribute names
+            confidence = 0.0
+            if hasattr(parse_result, 'confidence'):
+                confidence = parse_result.confidence
+            elif hasattr(parse_result, 'confidence_score'):
+                confidence = parse_result.confidence_score
+            elif hasattr(parse_result, 'score'):
+                confidence = parse_result.score
+            else:
+                confidence = 0.5  # Default for incomplete data
             
-        except Exception as e:
-            error_msg = f"Error processing incomplete data for {order_number}: {e}"
-            logger.error(error_msg, exc_info=True)
-            if hasattr(self.discord, 'send_error_notification'):
-                self.discord.send_error_notification(
-                    "Incomplete Data Processing Failed",
-                    error_msg,
-                    {'transaction_type': transaction_type, 'order_number': order_number}
-                )
+            self.discord.send_human_review_notification(
+                transaction_type,
+                order_number,
+                parse_result.missing_fields,
+                airtable_id,
+                confidence,
+                queue=True
+            )
 
     def _send_enhanced_success_notification(self, airtable_result: Dict, zoho_result: Dict, transaction_type: str):
         """Send enhanced success notification with workflow details."""
-        if transaction_type == 'purchase':
-            if hasattr(self.discord, 'send_purchase_order_success'):
-                self.discord.send_purchase_order_success(airtable_result, zoho_result)
-        else:  # sale
-            if hasattr(self.discord, 'send_sales_order_success'):
-                self.discord.send_sales_order_success(airtable_result, zoho_result)
+        if not self.discord.enabled:
+            return
+            
+        notifier = self._success_notifiers.get(transaction_type)
+        if notifier:
+            notifier(airtable_result, zoho_result, queue=True)
 
     def _send_zoho_error_notification(self, airtable_result: Dict, zoho_result: Dict, transaction_type: str):
         """Send enhanced error notification for Zoho workflow failures."""
-        order_number = airtable_result.get('order_number', 'Unknown')
-        
-        if transaction_type == 'purchase':
-            vendor = airtable_result.get('vendor_name', 'Unknown')
-            context = {"Vendor": vendor}
-            workflow_stage = "Purchase Order Creation"
-        else:
-            channel = airtable_result.get('channel', 'Unknown')
-            context = {"Channel": channel}
-            workflow_stage = "Sales Order Creation"
-        
-        if hasattr(self.discord, 'send_workflow_error'):
-            self.discord.send_workflow_error(
-                transaction_type,
-                order_number,
-                workflow_stage,
-                zoho_result,
-                context
-            )
+        if not self.discord.enabled or self._workflow_error_notifier is None:
+            return
+            
+        field, label, workflow_stage = TRANSACTION_ROUTES[transaction_type]['error_context']
+        self._workflow_error_notifier(
+            transaction_type,
+            airtable_result.get('order_number', 'Unknown'),
+            workflow_stage,
+            zoho_result,
+            {label: airtable_result.get(field, 'Unknown')},
+            queue=True
+        )
 
-    def run_once(self) -> None:
-        """Run a single iteration of email processing."""
+    def run_once(self) -> int:
+        """
+        Run a single iteration of email processing.
+        
+        Returns:
+            Number of unread emails found (0 for a quiet mailbox)
+        """
+        found = 0
         try:
             logger.info("Checking for new emails...")
             
-            # Fetch all unread emails
-            new_emails = self.gmail.fetch_unread_emails()
+            # Fetch all unread emails (with prefilter rules, ones we already processed
+            # come back headers-only; otherwise they are skipped below)
+            new_emails = self.gmail.fetch_unread_emails(
+                is_processed=lambda headers: self._email_key(headers) in self.processed_store
+            )
             
             if not new_emails:
                 logger.debug("No new emails found")
-                return
+                return found
+            found = len(new_emails)
                 
-            logger.info(f"Found {len(new_emails)} new emails to process")
+            logger.info("Found %s new emails to process", len(new_emails))
             
-            for i, email in enumerate(new_emails, 1):
+            pending_emails = []
+            candidate_emails = []
+            already_processed = []
+            for email in new_emails:
                 seq_num = email.get('seq_num')
-                subject = email.get('subject', 'No Subject')[:100]
-                
-                logger.info(f"[{i}/{len(new_emails)}] Processing email [seq={seq_num}]: {subject}")
-                
-                if seq_num and seq_num not in self.processed_seq_nums:
-                    # Process the email
-                    self.process_email(email)
-                    
-                    # Mark as processed in Gmail
-                    logger.info(f"Marking email [seq={seq_num}] as processed in Gmail...")
-                    if hasattr(self.gmail, 'mark_as_processed'):
-                        mark_success = self.gmail.mark_as_processed(seq_num)
-                        
-                        if mark_success:
-                            logger.info(f"Email [seq={seq_num}] successfully marked as processed")
-                            self.processed_seq_nums.add(seq_num)
-                        else:
-                            logger.warning(f"Failed to mark email [seq={seq_num}] as processed in Gmail")
-                            # Still add to processed set to avoid reprocessing
-                            self.processed_seq_nums.add(seq_num)
-                    else:
-                        # If mark_as_processed doesn't exist, just track locally
-                        self.processed_seq_nums.add(seq_num)
-                        
+                if not seq_num:
+                    continue
+                if self._email_key(email) in self.processed_store:
+                    # Processed before a restart but never marked in Gmail
+                    logger.debug("Email [seq=%s] already processed, skipping", seq_num)
+                    already_processed.append(seq_num)
                 else:
-                    logger.info(f"Email [seq={seq_num}] already processed, skipping")
+                    pending_emails.append(email)
+                    # Prefiltered emails were fetched headers-only and never reach OpenAI
+                    if not email.get('prefiltered'):
+                        candidate_emails.append(email)
+            
+            # Parse and process are pipelined: each email goes to the worker pool as
+            # soon as its parse is final, while the rest of the batch is still parsing
+            outcomes = self._parse_and_process(candidate_emails)
+            prefiltered_count = len(pending_emails) - len(candidate_emails)
+            
+            # Emails the parse never reached are not recorded or marked, so the next cycle retries them
+            unprocessed = [email['seq_num'] for email, outcome in zip(candidate_emails, outcomes) if outcome is None]
+            if unprocessed:
+                logger.warning("Returning %s unparsed emails to the unread queue", len(unprocessed))
+                self.gmail.release(unprocessed)
+                released = set(unprocessed)
+                pending_emails = [email for email in pending_emails if email['seq_num'] not in released]
+            
+            # Incomplete transactions were queued during the batch; a worker saves them
+            # together while this thread marks the emails in Gmail
+            flush_future = self._pool.submit(self._flush_incomplete_transactions)
+            
+            # Track locally either way to avoid reprocessing
+            self.processed_store.add_many(self._email_key(email) for email in pending_emails)
+            
+            # Mark as processed in Gmail in one round trip (IMAP connection is not shared across threads)
+            seq_nums = [email['seq_num'] for email in pending_emails] + already_processed
+            marked = set()
+            if seq_nums:
+                marked = self.gmail.mark_many_as_processed(seq_nums)
+                
+                unmarked = [seq_num for seq_num in seq_nums if seq_num not in marked]
+                for seq_num in unmarked:
+                    logger.debug("Failed to mark email [seq=%s] as processed in Gmail", seq_num)
+                if unmarked:
+                    logger.warning("Failed to mark %s emails as processed in Gmail", len(unmarked))
                     
-            logger.info(f"Completed processing {len(new_emails)} emails")
+            failed_saves = flush_future.result()
+            for i, email in enumerate(candidate_emails):
+                if email['seq_num'] in failed_saves:
+                    outcomes[i] = ProcessingStatus.FAILED
+            outcomes += [ProcessingStatus.SKIPPED] * prefiltered_count
             
-            # Check for resolved human reviews
+            # Count the enum members themselves; .value is only read once per distinct status
+            summary = Counter(outcome for outcome in outcomes if outcome is not None)
+            if summary and logger.isEnabledFor(logging.INFO):
+                logger.info("Batch summary: %s", ', '.join(f'{status.value}={count}' for status, count in summary.most_common()))
+            
+            # Check for resolved human reviews (their transactions add to this cycle's timings)
             self._process_pending_reviews()
+            
+            cycle_timings, self._cycle_timings = self._cycle_timings, []
+            self._log_cycle_summary(summary, len(already_processed), len(marked), cycle_timings)
                     
         except Exception as e:
             error_msg = f"Error in run cycle: {str(e)}"
@@ -614,55 +946,167 @@ class InventoryReconciliationApp:
                 self.discord.send_error_notification(
                     "Email Processing Cycle Failed",
                     error_msg,
-                    {}
+                    {},
+                    queue=True
                 )
+        finally:
+            # Per-email notifications are queued during the batch and sent together
+            self.discord.flush()
+        
+        return found
+
+    @staticmethod
+    def _email_key(email_data: Dict) -> str:
+        """Stable identity of an email: Message-ID, or sequence number if the header is missing."""
+        return email_data.get('message_id', '').strip() or f"seq:{email_data.get('seq_num')}"
+
+    def _parse_and_process(self, emails: List[Dict]) -> List[Optional[ProcessingStatus]]:
+        """
+        Parse a batch of emails and run process_email for each on the worker pool.
+        
+        Returns:
+            Outcomes in email order; None for emails the parse never reached
+            (the batch parse raised), which should be left for the next cycle
+        """
+        if not emails:
+            return []
+            
+        total = len(emails)
+        futures: List[Optional[Future]] = [None] * total
+        
+        def _process(index: int, email_data: Dict, parse_result: ParseResult) -> ProcessingStatus:
+            logger.info("[%s/%s] Processing email [seq=%s]", index, total, email_data.get('seq_num'))
+            return self.process_email(email_data, parse_result)
+            
+        # Clients are blocking (requests/OpenAI SDK) and I/O bound, so threads overlap well
+        def _dispatch(index: int, parse_result: ParseResult) -> None:
+            futures[index] = self._pool.submit(_process, index + 1, emails[index], parse_result)
+            
+        logger.info("Parsing %s emails with OpenAI...", total)
+        try:
+            self.parser.parse_emails_batch(emails, on_result=_dispatch)
+        except Exception as e:
+            # Emails already dispatched still finish (and are marked); run_once releases the rest
+            logger.error("Batch parse failed after %s of %s emails: %s",
+                         sum(future is not None for future in futures), total, e, exc_info=True)
+            self.stats.incr('errors')
+        return [future.result() if future is not None else None for future in futures]
+
+    @staticmethod
+    def _log_cycle_summary(outcomes: Counter, already_processed: int, marked: int,
+                           timings: Optional[List[Dict[str, int]]] = None):
+        """Log one line summarising a run_once() cycle, plus per-step timings if any."""
+        skipped = outcomes[ProcessingStatus.SKIPPED] + already_processed
+        errors = outcomes[ProcessingStatus.FAILED]
+        processed = sum(outcomes.values()) - outcomes[ProcessingStatus.SKIPPED] - errors
+        logger.info("Cycle done: processed=%d skipped=%d marked=%d errors=%d", processed, skipped, marked, errors)
+        
+        if not timings or not logger.isEnabledFor(logging.INFO):
+            return
+        # Single pass: total, count and max per step (zoho_ms is missing when Airtable failed)
+        steps: Dict[str, List[int]] = {}
+        for entry in timings:
+            for step, ms in entry.items():
+                rollup = steps.get(step)
+                if rollup is None:
+                    steps[step] = [ms, 1, ms]
+                else:
+                    rollup[0] += ms
+                    rollup[1] += 1
+                    if ms > rollup[2]:
+                        rollup[2] = ms
+        logger.info("Cycle timings (%d transactions): %s", len(timings), ' '.join(
+            f'{step}=avg {total // count}/max {peak}' for step, (total, count, peak) in steps.items()
+        ))
 
     def _process_pending_reviews(self):
         """Check for resolved human reviews and process them."""
         if not self.pending_reviews:
             return
         
-        logger.debug(f"Checking {len(self.pending_reviews)} pending reviews...")
+        logger.debug("Checking %s pending reviews...", len(self.pending_reviews))
         
-        resolved_reviews = []
+        with self._reviews_lock:
+            reviews = dict(self.pending_reviews)
         
-        for record_id, review_data in self.pending_reviews.items():
+        # One filtered Airtable query per transaction type returns just the resolved records
+        record_ids = {transaction_type: [] for transaction_type in TRANSACTION_ROUTES}
+        for record_id, review in reviews.items():
+            record_ids.setdefault(review.type, []).append(record_id)
+            
+        resolved = {}
+        for transaction_type, ids in record_ids.items():
+            if not ids:
+                continue
             try:
-                # Check if record has been marked as resolved
-                if hasattr(self.airtable, 'get_record'):
-                    record = self.airtable.get_record(record_id, review_data['type'])
-                    
-                    if record and not record.get('requires_review', True):
-                        logger.info(f"Human review resolved: {record_id}")
-                        
-                        # Process as complete transaction
-                        transaction_type = review_data['type']
-                        
-                        # Update the data with resolved information
-                        updated_data = {**review_data['data'], **record}
-                        
-                        # Create a new parse result for complete data
-                        parse_result = ParseResult(
-                            status=ParseStatus.SUCCESS,
-                            completeness=DataCompleteness.COMPLETE,
-                            data=updated_data,
-                            confidence=1.0,
-                            missing_fields=[],
-                            errors=[]
-                        )
-                        
-                        self._process_complete_transaction(updated_data, transaction_type, parse_result)
-                        resolved_reviews.append(record_id)
+                resolved.update(self.airtable.get_resolved_reviews(transaction_type, ids))
+            except Exception as e:
+                logger.error("Error checking %s %s reviews: %s", len(ids), transaction_type, e)
+                
+        if not resolved:
+            return
+        
+        def _process_resolved(record_id: str) -> bool:
+            """
+            Process a resolved review as a complete transaction; returns whether it is done.
+            
+            A review is done once its inventory changes are applied. A Zoho failure after
+            that is marked on the record and notified, not retried, as rerunning the
+            transaction would apply the inventory (and any created orders) twice.
+            """
+            review = reviews[record_id]
+            applied = []
+            logger.info("Human review resolved: %s", record_id)
+            try:
+                # Process as complete transaction
+                transaction_type = review.type
+                
+                # Update the data with resolved information. resolved carries the
+                # record ID, so the reviewed record is completed in place
+                updated_data = {**review.data, **resolved[record_id]}
+                updated_data.pop('missing_fields', None)
+                updated_data['parse_result'] = {
+                    'missing_fields': [],
+                    'warnings': review.data.get('parse_result', {}).get('warnings', [])
+                }
+                updated_data['confidence_score'] = 1.0
+                
+                # Create a new parse result for complete data
+                parse_result = ParseResult(
+                    status=ParseStatus.SUCCESS,
+                    completeness=DataCompleteness.COMPLETE,
+                    data=updated_data,
+                    confidence_score=1.0,
+                    missing_fields=[],
+                    errors=[]
+                )
+                
+                status = self._process_complete_transaction(updated_data, transaction_type, parse_result,
+                                                            on_inventory_applied=lambda: applied.append(True))
+                if status == ProcessingStatus.ZOHO_SYNCED:
+                    return True
+                if applied:
+                    logger.warning("Resolved review %s saved to Airtable but not synced to Zoho (%s), not retrying",
+                                   record_id, status.value)
+                else:
+                    logger.warning("Resolved review %s not completed (%s), retrying next cycle", record_id, status.value)
                     
             except Exception as e:
-                logger.error(f"Error checking review {record_id}: {e}")
+                logger.error("Error processing review %s: %s", record_id, e)
+            return bool(applied)
+        
+        # Each resolved review runs the Airtable and Zoho workflow; run them on the worker pool
+        record_order = list(resolved)
+        processed = self._pool.map(_process_resolved, record_order)
+        resolved_reviews = [record_id for record_id, ok in zip(record_order, processed) if ok]
         
         # Remove resolved reviews
-        for record_id in resolved_reviews:
-            del self.pending_reviews[record_id]
+        with self._reviews_lock:
+            for record_id in resolved_reviews:
+                self.pending_reviews.pop(record_id, None)
         
         if resolved_reviews:
-            logger.info(f"Processed {len(resolved_reviews)} resolved reviews")
+            logger.info("Processed %s resolved reviews", len(resolved_reviews))
 
     def run(self) -> None:
         """Main run loop with proper workflow support."""
@@ -671,56 +1115,78 @@ class InventoryReconciliationApp:
         
         # Send startup notification using enhanced Discord notifier
         if hasattr(self.discord, 'send_info_notification'):
+            proper_workflows, auto_bills, auto_invoices, auto_shipments, direct_adjustments = (
+                value for _, value in self._zoho_flags
+            )
             self.discord.send_info_notification(
                 "Inventory System Started",
                 "System initialized with proper Purchase/Sales Order workflows",
                 {
-                    "Proper Workflows": "Enabled" if self.zoho.use_proper_workflows else "Disabled",
-                    "Auto Bills": "Yes" if self.zoho.auto_create_bills else "No",
-                    "Auto Invoices": "Yes" if self.zoho.auto_create_invoices else "No",
-                    "Auto Shipments": "Yes" if self.zoho.auto_create_shipments else "No",
-                    "Direct Adjustments": "Disabled" if not self.zoho.allow_direct_adjustments else "Enabled",
+                    "Proper Workflows": "Enabled" if proper_workflows else "Disabled",
+                    "Auto Bills": "Yes" if auto_bills else "No",
+                    "Auto Invoices": "Yes" if auto_invoices else "No",
+                    "Auto Shipments": "Yes" if auto_shipments else "No",
+                    "Direct Adjustments": "Enabled" if direct_adjustments else "Disabled",
                     "Gmail": "Connected",
                     "Airtable": "3-table architecture",
                     "Zoho": "Connected" if self.zoho.is_available else "Unavailable"
                 }
             )
         
-        poll_interval = self.config.get_int('POLL_INTERVAL')
-        logger.info(f"Email polling interval: {poll_interval} seconds")
+        logger.info("Email polling interval: %s seconds", self._poll_interval)
+        
+        # systemd and Docker stop the service with SIGTERM; treat it like Ctrl+C
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
         
         try:
             cycle_count = 0
-            while True:
+            consecutive_failures = 0
+            empty_streak = 0
+            last_milestone = self.stats.emails_processed // self._status_every
+            last_validation = time.monotonic()
+            while not self._stop.is_set():
                 try:
                     cycle_count += 1
-                    logger.info(f"Starting email check cycle #{cycle_count}")
+                    logger.info("Starting email check cycle #%s", cycle_count)
                     
-                    cycle_start = time.time()
-                    self.run_once()
-                    cycle_duration = time.time() - cycle_start
+                    cycle_start = time.monotonic()
+                    found = self.run_once()
+                    cycle_duration = time.monotonic() - cycle_start
+                    consecutive_failures = 0
+                    empty_streak = 0 if found else empty_streak + 1
                     
-                    logger.info(f"Cycle #{cycle_count} completed in {cycle_duration:.2f}s")
+                    logger.info("Cycle #%s completed in %.2fs", cycle_count, cycle_duration)
                     
-                    # Periodic status report and validation
-                    if self.stats['emails_processed'] > 0 and self.stats['emails_processed'] % 25 == 0:
-                        logger.info(f"Milestone reached: {self.stats['emails_processed']} emails processed")
+                    # Status report every STATUS_REPORT_EVERY emails (a cycle may cross
+                    # the boundary without landing on an exact multiple)
+                    milestone = self.stats.emails_processed // self._status_every
+                    if milestone > last_milestone:
+                        last_milestone = milestone
+                        logger.info("Milestone reached: %s emails processed", self.stats.emails_processed)
                         self._send_status_report()
                         
-                    # Periodic validation (every hour - 12 cycles if 5min intervals)
-                    if cycle_count % 12 == 0 and cycle_count > 0:
+                    # Periodic validation, by elapsed time since IDLE makes cycle length vary
+                    if time.monotonic() - last_validation >= self._validation_interval:
                         self._run_periodic_validation()
+                        last_validation = time.monotonic()
                         
-                    logger.info(f"Sleeping for {poll_interval} seconds until next cycle...")
-                    time.sleep(poll_interval)
+                    # Wake as soon as the server announces new mail (IMAP IDLE); without
+                    # IDLE this is a plain sleep, growing while the mailbox stays quiet
+                    if self.gmail.idle_supported:
+                        wait_timeout = self._idle_wait
+                    else:
+                        wait_timeout = self._poll_wait(self._poll_interval, self._poll_interval_max, empty_streak)
+                    logger.info("Waiting up to %s seconds for new mail...", wait_timeout)
+                    self.gmail.wait_for_new_mail(wait_timeout, stop=self._stop)
                     
                 except KeyboardInterrupt:
                     logger.info("Shutdown requested by user")
                     break
                     
                 except Exception as e:
-                    logger.error(f"Unexpected error in cycle #{cycle_count}: {str(e)}", exc_info=True)
-                    self.stats['errors'] += 1
+                    logger.error("Unexpected error in cycle #%s: %s", cycle_count, str(e), exc_info=True)
+                    self.stats.incr('errors')
                     
                     # Send error notification but continue running
                     if hasattr(self.discord, 'send_error_notification'):
@@ -730,16 +1196,21 @@ class InventoryReconciliationApp:
                             {"error": str(e), "cycle": cycle_count}
                         )
                     
-                    logger.info(f"Waiting {poll_interval}s before retry...")
-                    time.sleep(poll_interval)
+                    consecutive_failures += 1
+                    retry_delay = self._error_backoff(self._poll_interval, self._error_backoff_max, consecutive_failures)
+                    logger.info("Waiting %.0fs before retry (%s consecutive failures)...", retry_delay, consecutive_failures)
+                    self._stop.wait(retry_delay)
+                    
+            if self._stop.is_set():
+                logger.info("Shutdown requested by signal")
                     
         except Exception as e:
-            logger.critical(f"Critical error - application stopping: {e}", exc_info=True)
+            logger.critical("Critical error - application stopping: %s", e, exc_info=True)
             if hasattr(self.discord, 'send_error_notification'):
                 self.discord.send_error_notification(
                     "Critical Application Error",
                     f"Application crashed: {e}",
-                    {"stats": self.stats}
+                    {"stats": self.stats.counters()}
                 )
             raise
         
@@ -747,6 +1218,37 @@ class InventoryReconciliationApp:
             # Cleanup and final reporting
             self._shutdown_cleanup()
 
+    def _request_stop(self, signum, frame):
+        """
+        Signal handler: stop after the current cycle; a second signal stops at once.
+        
+        Nothing is logged here, since the handler may interrupt a logging call.
+        """
+        if self._stop.is_set():
+            raise KeyboardInterrupt
+        self._stop.set()
+
+    @staticmethod
+    def _poll_wait(base: int, maximum: int, empty_streak: int) -> int:
+        """
+        Seconds to sleep between polls without IDLE.
+        
+        The first empty cycle waits the base interval; each further one doubles
+        it up to maximum, and any new mail resets it.
+        """
+        return min(maximum, base * 2 ** max(0, min(empty_streak - 1, 16)))
+
+    @staticmethod
+    def _error_backoff(base: float, maximum: float, failures: int) -> float:
+        """
+        Seconds to wait after consecutive failed cycles.
+        
+        Doubles from base up to maximum; the wait is drawn from the upper half of
+        that window so repeated failures (and restarted instances) don't retry in lockstep.
+        """
+        window = min(maximum, base * 2 ** min(failures - 1, 16))
+        return random.uniform(window / 2, window)
+
     def _run_periodic_validation(self):
         """Run periodic system validation checks."""
         logger.info("Running periodic system validation...")
@@ -760,54 +1262,56 @@ class InventoryReconciliationApp:
                     logger.info("Inventory adjustments tab is clean")
                 else:
                     auto_adjustments = adjustment_check.get('auto_adjustments', 0)
-                    logger.warning(f"Found {auto_adjustments} auto-generated adjustments - should be zero with proper workflows")
+                    logger.warning("Found %s auto-generated adjustments - should be zero with proper workflows", auto_adjustments)
                     
                     # Send validation alert using enhanced Discord notifier
                     if hasattr(self.discord, 'send_validation_alert'):
-                        self.discord.send_validation_alert("inventory_adjustments", adjustment_check)
+                        self.discord.send_validation_alert("inventory_adjustments", adjustment_check, queue=True)
             
             # Generate inventory sync report
             if hasattr(self.zoho, 'generate_inventory_sync_report'):
                 sync_report = self.zoho.generate_inventory_sync_report()
                 
                 if sync_report.get('discrepancies'):
-                    logger.warning(f"Found {len(sync_report['discrepancies'])} inventory discrepancies")
+                    logger.warning("Found %s inventory discrepancies", len(sync_report['discrepancies']))
                     
                     # Send discrepancy notification if significant
                     if len(sync_report['discrepancies']) > 5 and hasattr(self.discord, 'send_validation_alert'):
-                        self.discord.send_validation_alert("inventory_sync", sync_report)
+                        self.discord.send_validation_alert("inventory_sync", sync_report, queue=True)
             
         except Exception as e:
-            logger.error(f"Validation check failed: {e}")
+            logger.error("Validation check failed: %s", e)
+        finally:
+            # Both alerts go out in one webhook call
+            self.discord.flush()
 
     def _send_status_report(self):
         """Send current status report to Discord using enhanced notifier."""
-        runtime = (datetime.now() - self.stats['session_start']).total_seconds()
-        
-        details = {
-            "Runtime": f"{runtime/3600:.2f} hours",
-            "Emails Processed": self.stats['emails_processed'],
-            "Parse Success": self.stats['parse_successful'],
-            "Parse Failed": self.stats['parse_failed'],
-            "Complete Data": self.stats['complete_data'],
-            "Incomplete Data": self.stats['incomplete_data'],
-            "Airtable Records": self.stats['airtable_saved'],
-            "Purchase Orders": self.stats['purchase_orders_created'],
-            "Sales Orders": self.stats['sales_orders_created'],
-            "Bills Created": self.stats['bills_created'],
-            "Invoices Created": self.stats['invoices_created'],
-            "Shipments Created": self.stats['shipments_created'],
-            "Zoho Synced": self.stats['synced_to_zoho'],
-            "Pending Review": self.stats['human_reviews_required'],
-            "Errors": self.stats['errors']
-        }
+        runtime = self.stats.runtime_seconds
+        # One snapshot sums the per-thread shards once instead of once per field
+        counters = self.stats.counters()
+        
+        details = {"Runtime": f"{runtime/3600:.2f} hours"}
+        details.update((label, counters[name]) for label, name in STATUS_REPORT_FIELDS)
+        details["Gmail Reconnects"] = getattr(self.gmail, 'reconnect_count', 0)
+        
+        with self._reviews_lock:
+            # Reviews are only ever appended, so the first entries are the oldest
+            oldest_reviews = list(islice(self.pending_reviews.values(), 10))
+        if oldest_reviews:
+            now = time.monotonic()
+            details["Oldest Pending Review"] = f"{(now - oldest_reviews[0].created_at) / 3600:.1f} hours"
+            details["Oldest Pending Orders"] = '\n'.join(
+                f"{review.data.get('order_number', 'N/A')} ({review.type}, {(now - review.created_at) / 3600:.1f}h)"
+                for review in oldest_reviews
+            )
         
-        if self.stats['emails_processed'] > 0:
-            complete_rate = (self.stats['complete_data'] / self.stats['emails_processed']) * 100
+        if counters['emails_processed'] > 0:
+            complete_rate = (counters['complete_data'] / counters['emails_processed']) * 100
             details["Data Completeness Rate"] = f"{complete_rate:.1f}%"
             
-            if self.zoho.is_available and self.stats['airtable_saved'] > 0:
-                sync_rate = (self.stats['synced_to_zoho'] / self.stats['airtable_saved']) * 100
+            if self.zoho.is_available and counters['airtable_saved'] > 0:
+                sync_rate = (counters['synced_to_zoho'] / counters['airtable_saved']) * 100
                 details["Zoho Sync Rate"] = f"{sync_rate:.1f}%"
         
         if hasattr(self.discord, 'send_info_notification'):
@@ -821,33 +1325,34 @@ class InventoryReconciliationApp:
         """Handle shutdown cleanup and final reporting."""
         logger.info("Cleaning up resources...")
         
+        self._pool.shutdown(wait=True)
+        self._record_pool.shutdown(wait=True)
+        
         try:
             if hasattr(self.gmail, 'close'):
                 self.gmail.close()
                 logger.info("Gmail connection closed")
         except Exception as e:
-            logger.error(f"Error closing Gmail connection: {e}")
+            logger.error("Error closing Gmail connection: %s", e)
+        
+        self.processed_store.close()
+        
+        # Send anything still queued before the final report
+        try:
+            self.discord.flush()
+        except Exception as e:
+            logger.error("Error flushing Discord notifications: %s", e)
         
         # Send final report
         logger.info("Generating final session report...")
         
         # Final shutdown notification using enhanced Discord notifier
-        runtime = (datetime.now() - self.stats['session_start']).total_seconds()
-        
-        final_stats = {
-            "Total Runtime": f"{runtime/3600:.2f} hours",
-            "Emails Processed": self.stats['emails_processed'],
-            "Purchase Orders": self.stats['purchase_orders_created'],
-            "Sales Orders": self.stats['sales_orders_created'],
-            "Bills Created": self.stats['bills_created'],
-            "Invoices Created": self.stats['invoices_created'],
-            "Shipments Created": self.stats['shipments_created'],
-            "Airtable Records": self.stats['airtable_saved'],
-            "Zoho Synced": self.stats['synced_to_zoho'],
-            "Human Reviews": self.stats['human_reviews_required'],
-            "Total Errors": self.stats['errors'],
-            "System Mode": "Proper Workflows" if self.zoho.use_proper_workflows else "Legacy Adjustments"
-        }
+        runtime = self.stats.runtime_seconds
+        counters = self.stats.counters()
+        
+        final_stats = {"Total Runtime": f"{runtime/3600:.2f} hours"}
+        final_stats.update((label, counters[name]) for label, name in SHUTDOWN_REPORT_FIELDS)
+        final_stats["System Mode"] = "Proper Workflows" if self.zoho.use_proper_workflows else "Legacy Adjustments"
         
         if hasattr(self.discord, 'send_info_notification'):
             self.discord.send_info_notification(
@@ -856,6 +1361,13 @@ class InventoryReconciliationApp:
                 final_stats
             )
         
+        # Wait for the background sender to deliver everything, the final report included
+        try:
+            self.discord.close()
+        except Exception as e:
+            logger.error("Error sending remaining Discord notifications: %s", e)
+        
+        self.http.close()
         logger.info("Shutdown complete")
 
 
@@ -867,7 +1379,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
     except Exception as e:
-        logger.critical(f"Application crashed: {e}", exc_info=True)
+        logger.critical("Application crashed: %s", e, exc_info=True)
         sys.exit(1)
 
 
@@ -4,16 +4,52 @@ import json
 import logging
 import requests
 import hashlib
+from threading import Event, Lock
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
+from . import json_utils
+from .http_session import create_session
+
 logger = logging.getLogger(__name__)
 
+# Airtable accepts at most 10 records per create or update request
+AIRTABLE_MAX_BATCH = 10
+
+# Record IDs matched per RECORD_ID() lookup (one page of results; keeps the formula URL short)
+REVIEW_LOOKUP_CHUNK = 100
+
+# (data key, Airtable field, default) read back from purchase and sale records;
+# each type only maps the fields its own table has
+_COMMON_RECORD_FIELDS = (
+    ('order_number', 'Order Number', None),
+    ('date', 'Date', None),
+    ('subtotal', 'Subtotal', 0),
+    ('taxes', 'Taxes', 0),
+    ('total', 'Total', 0),
+)
+RECORD_FIELDS = {
+    'purchase': _COMMON_RECORD_FIELDS + (('vendor_name', 'Vendor', None), ('shipping', 'Shipping', 0)),
+    'sale': _COMMON_RECORD_FIELDS + (
+        ('channel', 'Channel', None), ('customer_email', 'Customer Email', None), ('fees', 'Fees', 0)
+    ),
+}
+
+
+class _PendingCreates:
+    """Records from concurrent callers waiting to share one create request."""
+    
+    def __init__(self):
+        self.records: List[Dict] = []
+        self.full = Event()
+        self.done = Event()
+        self.created: List[Optional[Dict]] = []
+
 
 class AirtableClient:
     """Handle Airtable API operations with three-table inventory architecture."""
     
-    def __init__(self, config):
+    def __init__(self, config, session: Optional[requests.Session] = None):
         self.config = config
         self.base_id = config.get('AIRTABLE_BASE_ID')
         self.api_key = config.get('AIRTABLE_API_KEY')
@@ -23,28 +59,54 @@ class AirtableClient:
             "Content-Type": "application/json"
         }
         
+        # Pooled keep-alive connections reused across all Airtable calls
+        self.session = session or create_session(config)
+        
         # Table names from environment variables
         self.purchases_table = config.get('AIRTABLE_PURCHASES_TABLE', 'InventoryPurchases')
         self.sales_table = config.get('AIRTABLE_SALES_TABLE', 'InventorySales')
         self.inventory_table = config.get('AIRTABLE_INVENTORY_TABLE', 'InventoryStock')
         
+        # Per-transaction-type dispatch (any other type is handled as a sale, as before)
+        self._tables = {'purchase': self.purchases_table, 'sale': self.sales_table}
+        self._creators = {'purchase': self.create_purchase, 'sale': self.create_sale}
+        self._record_builders = {'purchase': self._build_purchase_record, 'sale': self._build_sale_record}
+        self._quantity_signs = {'purchase': 1, 'sale': -1}  # sales reduce inventory
+        
+        # Serializes the inventory quantity read-modify-write across worker threads
+        self._inventory_lock = Lock()
+        # One lock per SKU so concurrent workers never create the same inventory item twice
+        self._item_locks: Dict[str, Lock] = {}
+        self._item_locks_guard = Lock()
+        
+        # Transaction records created by concurrent workers within this window share a request
+        self.create_batch_window = config.get_float('AIRTABLE_CREATE_BATCH_WINDOW', 0.05)
+        self._pending_creates: Dict[str, _PendingCreates] = {}
+        self._pending_creates_lock = Lock()
+        
         logger.info(f"🗃️ Airtable client initialized:")
         logger.info(f"   - Purchases: {self.purchases_table}")
         logger.info(f"   - Sales: {self.sales_table}")
         logger.info(f"   - Inventory: {self.inventory_table}")
         
-    def process_transaction(self, data: Dict, transaction_type: str) -> Dict:
+    def _table_for(self, transaction_type: str) -> str:
+        """Transaction table name for 'purchase' or 'sale'."""
+        return self._tables.get(transaction_type, self.sales_table)
+        
+    def process_transaction(self, data: Dict, transaction_type: str, create_record: bool = True) -> Dict:
         """
         Process a complete transaction through the three-table workflow.
         
         Args:
             data: Parsed transaction data
             transaction_type: 'purchase' or 'sale'
+            create_record: With False, only inventory is processed; the transaction
+                record is left for create_transaction_record() (result['record_data'])
             
         Returns:
             Processing result with record IDs and inventory updates
         """
-        logger.info(f"📊 Processing {transaction_type} transaction: {data.get('order_number', 'N/A')}")
+        logger.info("📊 Processing %s transaction: %s", transaction_type, data.get('order_number', 'N/A'))
         
         result = {
             'success': False,
@@ -57,50 +119,77 @@ class AirtableClient:
         }
         
         try:
-            # Step 1: Process each item through inventory management
-            processed_items = []
-            
-            for i, item in enumerate(data.get('items', []), 1):
-                logger.info(f"   📦 [{i}/{len(data.get('items', []))}] Processing item: {item.get('name', 'Unknown')}")
+            # Step 1: Process each item through inventory management. Items are looked up
+            # (or created) first; their quantity changes are then applied together, up to
+            # 10 per request, by _update_inventory_quantities()
+            items = data.get('items', [])
+            inventory_results = []
+            
+            for i, item in enumerate(items, 1):
+                logger.info("   📦 [%d/%d] Processing item: %s", i, len(items), item.get('name', 'Unknown'))
                 
                 try:
-                    # Get or create SKU and update inventory
-                    inventory_result = self._process_item_inventory(item, transaction_type, data)
+                    inventory_result = self._process_item_inventory(item)
+                except Exception as e:
+                    logger.error("      💥 Item error: %s", e)
+                    inventory_result = {
+                        'success': False,
+                        'errors': [f"Failed to process item {item.get('name')}: {str(e)}"]
+                    }
+                inventory_results.append(inventory_result)
+                
+            sign = self._quantity_signs.get(transaction_type, 1)
+            changes = {}  # inventory record ID -> quantity change
+            for item, inventory_result in zip(items, inventory_results):
+                if inventory_result['success']:
+                    record_id = inventory_result['inventory_record_id']
+                    changes[record_id] = changes.get(record_id, 0) + item.get('quantity', 0) * sign
                     
-                    if inventory_result['success']:
-                        # Add SKU to item data for transaction record
-                        item_with_sku = item.copy()
-                        item_with_sku['sku'] = inventory_result['sku']
-                        processed_items.append(item_with_sku)
-                        
-                        result['items_processed'].append({
-                            'name': item.get('name'),
-                            'sku': inventory_result['sku'],
-                            'quantity': item.get('quantity'),
-                            'inventory_record_id': inventory_result.get('inventory_record_id')
-                        })
-                        
-                        result['inventory_updates'].append(inventory_result)
-                        
-                        logger.info(f"      ✅ Item processed: SKU {inventory_result['sku']}")
-                        
+            previous_quantities = self._update_inventory_quantities(
+                changes, data.get('order_number', ''), transaction_type
+            ) if changes else {}
+            
+            processed_items = []
+            for item, inventory_result in zip(items, inventory_results):
+                if inventory_result['success']:
+                    record_id = inventory_result['inventory_record_id']
+                    if record_id in previous_quantities:
+                        # An item listed twice in one order builds on its first change
+                        previous = previous_quantities[record_id]
+                        inventory_result['previous_quantity'] = previous
+                        inventory_result['new_quantity'] = previous_quantities[record_id] = max(
+                            0, previous + item.get('quantity', 0) * sign
+                        )
                     else:
-                        result['items_failed'].append({
-                            'name': item.get('name'),
-                            'errors': inventory_result.get('errors', [])
-                        })
-                        result['warnings'].extend(inventory_result.get('errors', []))
-                        
-                        logger.error(f"      ❌ Item failed: {'; '.join(inventory_result.get('errors', []))}")
-                        
-                except Exception as e:
-                    error_msg = f"Failed to process item {item.get('name')}: {str(e)}"
+                        inventory_result['success'] = False
+                        inventory_result['errors'].append("Failed to update inventory quantity")
+                    
+                if inventory_result['success']:
+                    # Add SKU to item data for transaction record
+                    item_with_sku = item.copy()
+                    item_with_sku['sku'] = inventory_result['sku']
+                    processed_items.append(item_with_sku)
+                    
+                    result['items_processed'].append({
+                        'name': item.get('name'),
+                        'sku': inventory_result['sku'],
+                        'quantity': item.get('quantity'),
+                        'inventory_record_id': inventory_result.get('inventory_record_id')
+                    })
+                    
+                    result['inventory_updates'].append(inventory_result)
+                    
+                    logger.info("      ✅ Item processed: SKU %s, inventory %s → %s", inventory_result['sku'],
+                                inventory_result['previous_quantity'], inventory_result['new_quantity'])
+                    
+                else:
                     result['items_failed'].append({
                         'name': item.get('name'),
-                        'errors': [error_msg]
+                        'errors': inventory_result.get('errors', [])
                     })
-                    result['warnings'].append(error_msg)
-                    logger.error(f"      💥 Item error: {e}")
+                    result['warnings'].extend(inventory_result.get('errors', []))
+                    
+                    logger.error("      ❌ Item failed: %s", '; '.join(inventory_result.get('errors', [])))
             
             # Step 2: Create transaction record with clean data
             if processed_items:
@@ -109,17 +198,12 @@ class AirtableClient:
                 clean_data['items'] = processed_items
                 clean_data['processing_status'] = 'airtable_complete'
                 clean_data['inventory_items_count'] = len(processed_items)
+                result['record_data'] = clean_data
                 
-                if transaction_type == 'purchase':
-                    transaction_record = self.create_purchase(clean_data)
-                else:
-                    transaction_record = self.create_sale(clean_data)
-                    
-                result['transaction_record_id'] = transaction_record.get('id')
+                if create_record:
+                    self.create_transaction_record(result, transaction_type)
                 result['success'] = True
                 
-                logger.info(f"   ✅ Transaction record created: {result['transaction_record_id']}")
-                
             else:
                 result['errors'].append("No items could be processed successfully")
                 logger.error("   ❌ No items processed successfully")
@@ -130,14 +214,16 @@ class AirtableClient:
             
         return result
         
-    def _process_item_inventory(self, item: Dict, transaction_type: str, transaction_data: Dict) -> Dict:
+    def _process_item_inventory(self, item: Dict) -> Dict:
         """
         Process a single item through inventory management.
         
+        Only finds or creates the inventory record; the caller applies the
+        quantity change with _update_inventory_quantities() and fills in
+        previous_quantity/new_quantity.
+        
         Args:
             item: Item data from parsed email
-            transaction_type: 'purchase' or 'sale'
-            transaction_data: Full transaction context
             
         Returns:
             Result with SKU and inventory record info
@@ -154,7 +240,8 @@ class AirtableClient:
         
         try:
             # Step 1: Find or create inventory record
-            inventory_record = self._find_or_create_inventory_item(item)
+            with self._item_lock(self._generate_sku(item)):
+                inventory_record = self._find_or_create_inventory_item(item)
             
             if not inventory_record:
                 result['errors'].append(f"Could not find or create inventory record for {item.get('name')}")
@@ -162,30 +249,9 @@ class AirtableClient:
             
             result['sku'] = inventory_record['sku']
             result['inventory_record_id'] = inventory_record['record_id']
-            result['previous_quantity'] = inventory_record.get('current_quantity', 0)
+            result['previous_quantity'] = result['new_quantity'] = inventory_record.get('current_quantity', 0)
             result['action'] = inventory_record.get('action', 'found')
-            
-            # Step 2: Calculate new quantity based on transaction type
-            quantity_change = item.get('quantity', 0)
-            if transaction_type == 'sale':
-                quantity_change = -quantity_change  # Sales reduce inventory
-            
-            new_quantity = max(0, result['previous_quantity'] + quantity_change)
-            result['new_quantity'] = new_quantity
-            
-            # Step 3: Update inventory quantity
-            update_success = self._update_inventory_quantity(
-                inventory_record['record_id'],
-                new_quantity,
-                transaction_data.get('order_number', ''),
-                transaction_type
-            )
-            
-            if update_success:
-                result['success'] = True
-                logger.info(f"      📈 Inventory updated: {result['previous_quantity']} → {new_quantity}")
-            else:
-                result['errors'].append("Failed to update inventory quantity")
+            result['success'] = True
                 
         except Exception as e:
             result['errors'].append(f"Inventory processing error: {str(e)}")
@@ -207,7 +273,7 @@ class AirtableClient:
             logger.error("      ❌ No item name provided")
             return None
             
-        logger.info(f"      🔍 Looking up inventory item: {item_name}")
+        logger.info("      🔍 Looking up inventory item: %s", item_name)
         
         # Step 1: Try to find by existing identifiers
         existing_record = None
@@ -216,24 +282,24 @@ class AirtableClient:
         if item.get('sku'):
             existing_record = self._find_inventory_by_sku(item['sku'])
             if existing_record:
-                logger.info(f"      ✅ Found by SKU: {item['sku']}")
+                logger.info("      ✅ Found by SKU: %s", item['sku'])
                 return existing_record
         
         # Try by UPC
         if item.get('upc'):
             existing_record = self._find_inventory_by_upc(item['upc'])
             if existing_record:
-                logger.info(f"      ✅ Found by UPC: {item['upc']}")
+                logger.info("      ✅ Found by UPC: %s", item['upc'])
                 return existing_record
         
         # Try by name
         existing_record = self._find_inventory_by_name(item_name)
         if existing_record:
-            logger.info(f"      ✅ Found by name: {item_name}")
+            logger.info("      ✅ Found by name: %s", item_name)
             return existing_record
         
         # Step 2: Create new inventory item
-        logger.info(f"      🆕 Creating new inventory item")
+        logger.info("      🆕 Creating new inventory item")
         return self._create_new_inventory_item(item)
         
     def _find_inventory_by_sku(self, sku: str) -> Optional[Dict]:
@@ -243,7 +309,7 @@ class AirtableClient:
                 'filterByFormula': f"{{SKU}} = '{sku}'"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/{self.inventory_table}",
                 headers=self.headers,
                 params=params
@@ -273,7 +339,7 @@ class AirtableClient:
                 'filterByFormula': f"{{SKU}} = '{upc}'"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/{self.inventory_table}",
                 headers=self.headers,
                 params=params
@@ -304,7 +370,7 @@ class AirtableClient:
                 'filterByFormula': f"{{'Item Name'}} = '{escaped_name}'"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/{self.inventory_table}",
                 headers=self.headers,
                 params=params
@@ -333,18 +399,19 @@ class AirtableClient:
             sku = self._generate_sku(item)
             
             # Create record with YOUR EXACT field names from InventoryStock table
+            now = datetime.now().isoformat()
             record_data = {
                 "fields": {
                     "SKU": sku,
                     "Item Name": item.get('name', ''),
                     "Quantity": 0,
-                    "Created At": datetime.now().isoformat(),
-                    "Last Updated": datetime.now().isoformat(),
+                    "Created At": now,
+                    "Last Updated": now,
                     "Summary": "Initial creation"
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/{self.inventory_table}",
                 json={"records": [record_data]},
                 headers=self.headers
@@ -419,40 +486,110 @@ class AirtableClient:
         
         return f"AUTO-{prefix}-{name_hash}"
         
-    def _update_inventory_quantity(self, record_id: str, new_quantity: int, 
-                                  order_number: str, transaction_type: str) -> bool:
-        """Update inventory quantity using EXACT field names."""
-        try:
-            update_data = {
-                "fields": {
-                    "Quantity": new_quantity,
-                    "Last Updated": datetime.now().isoformat(),
-                    "Summary": f"{transaction_type.title()}: {order_number}"
-                }
-            }
+    def _update_inventory_quantities(self, changes: Dict[str, int],
+                                     order_number: str, transaction_type: str) -> Dict[str, int]:
+        """
+        Apply quantity changes using EXACT field names, up to 10 records per request.
+        
+        The current quantities are re-read and the new ones written under
+        _inventory_lock, so concurrent transactions never overwrite each other's
+        changes; only this read-modify-write is serialized. Quantities never go
+        below zero. Records whose quantity could not be read are not updated.
+        
+        Args:
+            changes: Quantity change by inventory record ID
+            order_number: Order recorded in the Summary field
+            transaction_type: 'purchase' or 'sale'
             
-            response = requests.patch(
-                f"{self.base_url}/{self.inventory_table}/{record_id}",
-                json=update_data,
+        Returns:
+            Quantity before the change, by ID of each record that was updated
+        """
+        summary = f"{transaction_type.title()}: {order_number}"
+        
+        with self._inventory_lock:
+            previous = self._get_inventory_quantities(list(changes))
+            now = datetime.now().isoformat()
+            records = [
+                {"id": record_id, "fields": {
+                    "Quantity": max(0, quantity + changes[record_id]), "Last Updated": now, "Summary": summary
+                }}
+                for record_id, quantity in previous.items()
+            ]
+            
+            updated = set()
+            for start in range(0, len(records), AIRTABLE_MAX_BATCH):
+                chunk = records[start:start + AIRTABLE_MAX_BATCH]
+                try:
+                    response = self.session.patch(
+                        f"{self.base_url}/{self.inventory_table}",
+                        json={"records": chunk},
+                        headers=self.headers
+                    )
+                    
+                    if response.status_code != 200:
+                        logger.error(f"      ❌ Quantity update failed: {response.status_code}")
+                        logger.error(f"Response: {response.text}")
+                        continue
+                        
+                    updated.update(record['id'] for record in response.json().get('records', []))
+                    
+                except Exception as e:
+                    logger.error(f"      ❌ Failed to update {len(chunk)} inventory quantities: {e}")
+                    
+        return {record_id: previous[record_id] for record_id in updated if record_id in previous}
+        
+    def _get_inventory_quantities(self, record_ids: List[str]) -> Dict[str, int]:
+        """Current Quantity of inventory records, by record ID (unreadable records are left out)."""
+        quantities = {}
+        for start in range(0, len(record_ids), REVIEW_LOOKUP_CHUNK):
+            chunk = record_ids[start:start + REVIEW_LOOKUP_CHUNK]
+            id_match = ', '.join(f"RECORD_ID() = '{record_id}'" for record_id in chunk)
+            try:
+                response = self.session.get(
+                    f"{self.base_url}/{self.inventory_table}",
+                    headers=self.headers,
+                    params={'filterByFormula': f"OR({id_match})", 'fields[]': 'Quantity'}
+                )
+                response.raise_for_status()
+                for record in response.json().get('records', []):
+                    quantities[record['id']] = record['fields'].get('Quantity', 0)
+            except Exception as e:
+                logger.error(f"      ❌ Failed to read {len(chunk)} inventory quantities: {e}")
+        return quantities
+        
+    def _item_lock(self, sku: str) -> Lock:
+        """Lock serializing the find-or-create of one SKU."""
+        with self._item_locks_guard:
+            lock = self._item_locks.get(sku)
+            if lock is None:
+                lock = self._item_locks[sku] = Lock()
+            return lock
+            
+    def create_purchase(self, data: Dict) -> Optional[Dict]:
+        """Create a purchase record in Airtable."""
+        logger.info(f"💾 Creating purchase record in Airtable...")
+        
+        record = self._build_purchase_record(data)
+        
+        try:
+            response = self.session.post(
+                f"{self.base_url}/{self.purchases_table}",
+                json={"records": [record]},
                 headers=self.headers
             )
-            
-            if response.status_code != 200:
-                logger.error(f"      ❌ Quantity update failed: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return False
-                
             response.raise_for_status()
-            return True
+            
+            result = response.json()
+            logger.info(f"✅ Created purchase record: {result['records'][0]['id']}")
+            
+            return result['records'][0]
             
         except Exception as e:
-            logger.error(f"      ❌ Failed to update inventory quantity: {e}")
-            return False
+            logger.error(f"❌ Failed to create purchase record: {str(e)}")
+            raise
             
-    def create_purchase(self, data: Dict) -> Optional[Dict]:
-        """Create a purchase record in Airtable."""
-        logger.info(f"💾 Creating purchase record in Airtable...")
-        
+    def _build_purchase_record(self, data: Dict, processed_at: Optional[str] = None) -> Dict:
+        """Transform parsed purchase data into an Airtable record (processed_at defaults to now)."""
         # Extract parse metadata
         parse_metadata = data.get('parse_metadata', {})
         parse_result = data.get('parse_result', {})
@@ -463,45 +600,50 @@ class AirtableClient:
                 "Order Number": data.get('order_number'),
                 "Date": data.get('date'),
                 "Vendor": data.get('vendor_name'),
-                "Items": json.dumps(data.get('items', [])),
+                "Items": json_utils.dumps(data.get('items', [])),
                 "Subtotal": data.get('subtotal', 0),
                 "Taxes": data.get('taxes', 0),
                 "Shipping": data.get('shipping', 0),
                 "Total": data.get('total', 0),
                 "Email Seq Num": data.get('email_seq_num'),
-                "Processed At": datetime.now().isoformat(),
+                "Processed At": processed_at or datetime.now().isoformat(),
                 "Processing Status": data.get('processing_status', 'airtable_complete'),
                 "Inventory Items Count": data.get('inventory_items_count', 0),
                 "Requires Review": data.get('requires_review', False),
                 "Confidence Score": data.get('confidence_score', 0),
                 "Missing Fields": ', '.join(parse_result.get('missing_fields', [])),
                 "Parse Status": parse_metadata.get('status', 'unknown'),
-                "Parse Warnings": json.dumps(parse_result.get('warnings', [])),
+                "Parse Warnings": json_utils.dumps(parse_result.get('warnings', [])),
                 "Review Notes": self._generate_review_notes(data, parse_result)
             }
         }
+        return record
+            
+    def create_sale(self, data: Dict) -> Optional[Dict]:
+        """Create a sale record in Airtable."""
+        logger.info(f"💾 Creating sale record in Airtable...")
+        
+        record = self._build_sale_record(data)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/{self.purchases_table}",
+            response = self.session.post(
+                f"{self.base_url}/{self.sales_table}",
                 json={"records": [record]},
                 headers=self.headers
             )
             response.raise_for_status()
             
             result = response.json()
-            logger.info(f"✅ Created purchase record: {result['records'][0]['id']}")
+            logger.info(f"✅ Created sale record: {result['records'][0]['id']}")
             
             return result['records'][0]
             
         except Exception as e:
-            logger.error(f"❌ Failed to create purchase record: {str(e)}")
+            logger.error(f"❌ Failed to create sale record: {str(e)}")
             raise
             
-    def create_sale(self, data: Dict) -> Optional[Dict]:
-        """Create a sale record in Airtable."""
-        logger.info(f"💾 Creating sale record in Airtable...")
-        
+    def _build_sale_record(self, data: Dict, processed_at: Optional[str] = None) -> Dict:
+        """Transform parsed sale data into an Airtable record (processed_at defaults to now)."""
         # Extract parse metadata
         parse_metadata = data.get('parse_metadata', {})
         parse_result = data.get('parse_result', {})
@@ -513,40 +655,137 @@ class AirtableClient:
                 "Date": data.get('date'),
                 "Channel": data.get('channel'),
                 "Customer Email": data.get('customer_email'),
-                "Items": json.dumps(data.get('items', [])),
+                "Items": json_utils.dumps(data.get('items', [])),
                 "Subtotal": data.get('subtotal', 0),
                 "Taxes": data.get('taxes', 0),
                 "Fees": data.get('fees', 0),
                 "Total": data.get('total', 0),
                 "Email Seq Num": data.get('email_seq_num'),
-                "Processed At": datetime.now().isoformat(),
+                "Processed At": processed_at or datetime.now().isoformat(),
                 "Processing Status": data.get('processing_status', 'airtable_complete'),
                 "Inventory Items Count": data.get('inventory_items_count', 0),
                 "Requires Review": data.get('requires_review', False),
                 "Confidence Score": data.get('confidence_score', 0),
                 "Missing Fields": ', '.join(parse_result.get('missing_fields', [])),
                 "Parse Status": parse_metadata.get('status', 'unknown'),
-                "Parse Warnings": json.dumps(parse_result.get('warnings', [])),
+                "Parse Warnings": json_utils.dumps(parse_result.get('warnings', [])),
                 "Review Notes": self._generate_review_notes(data, parse_result)
             }
         }
+        return record
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/{self.sales_table}",
-                json={"records": [record]},
-                headers=self.headers
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info(f"✅ Created sale record: {result['records'][0]['id']}")
+    def create_transaction_record(self, result: Dict, transaction_type: str) -> str:
+        """
+        Create the transaction record for a process_transaction() result.
+        
+        Data read back from an existing record (a resolved review carries its
+        airtable_record_id) updates that record in place instead of creating a
+        second one. Sets and returns result['transaction_record_id']; raises if
+        the record could not be saved.
+        """
+        existing_id = result['record_data'].get('airtable_record_id')
+        if existing_id:
+            self.update_transaction_record(existing_id, transaction_type, result['record_data'])
+            result['transaction_record_id'] = existing_id
+        else:
+            transaction_record = self.create_coalesced(transaction_type, result['record_data'])
+            result['transaction_record_id'] = transaction_record.get('id')
+        
+        logger.info(f"   ✅ Transaction record created: {result['transaction_record_id']}")
+        return result['transaction_record_id']
+        
+    def update_transaction_record(self, record_id: str, transaction_type: str, data: Dict) -> Dict:
+        """Overwrite an existing purchase or sale record with completed transaction data."""
+        record = self._record_builders.get(transaction_type, self._build_sale_record)(data)
+        response = self.session.patch(
+            f"{self.base_url}/{self._table_for(transaction_type)}/{record_id}",
+            json=record,
+            headers=self.headers
+        )
+        response.raise_for_status()
+        return response.json()
+        
+    def create_coalesced(self, transaction_type: str, data: Dict) -> Dict:
+        """
+        Create one purchase or sale record, sharing the request with concurrent callers.
+        
+        The first caller waits up to create_batch_window seconds (or until the
+        batch is full) for other workers' records, then creates them all with
+        batch_create(); every caller gets back its own record.
+        
+        Raises:
+            RuntimeError: If the record could not be created
+        """
+        if self.create_batch_window <= 0:
+            return self._creators.get(transaction_type, self.create_sale)(data)
+            
+        with self._pending_creates_lock:
+            pending = self._pending_creates.get(transaction_type)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._pending_creates[transaction_type] = _PendingCreates()
+            index = len(pending.records)
+            pending.records.append(data)
+            if len(pending.records) >= AIRTABLE_MAX_BATCH:
+                # Full: later callers start a new batch
+                del self._pending_creates[transaction_type]
+                pending.full.set()
+                
+        if is_leader:
+            pending.full.wait(self.create_batch_window)
+            with self._pending_creates_lock:
+                if self._pending_creates.get(transaction_type) is pending:
+                    del self._pending_creates[transaction_type]
+            try:
+                pending.created = self.batch_create(transaction_type, pending.records)
+            finally:
+                pending.done.set()
+        else:
+            pending.done.wait()
             
-            return result['records'][0]
+        record = pending.created[index] if index < len(pending.created) else None
+        if not record:
+            raise RuntimeError(f"Failed to create {transaction_type} record")
+        return record
+        
+    def batch_create(self, transaction_type: str, records_data: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Create several purchase or sale records, up to 10 per request.
+        
+        Args:
+            transaction_type: 'purchase' or 'sale'
+            records_data: Parsed transaction data, one dict per record
             
-        except Exception as e:
-            logger.error(f"❌ Failed to create sale record: {str(e)}")
-            raise
+        Returns:
+            Created record per input, in order (None where its request failed)
+        """
+        table = self._table_for(transaction_type)
+        build_record = self._record_builders.get(transaction_type, self._build_sale_record)
+            
+        # One timestamp for the whole batch rather than one per record
+        processed_at = datetime.now().isoformat()
+        
+        created: List[Optional[Dict]] = []
+        for start in range(0, len(records_data), AIRTABLE_MAX_BATCH):
+            chunk = records_data[start:start + AIRTABLE_MAX_BATCH]
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/{table}",
+                    json={"records": [build_record(data, processed_at) for data in chunk]},
+                    headers=self.headers
+                )
+                response.raise_for_status()
+                
+                # Airtable returns created records in request order
+                records = response.json()['records']
+                created.extend(records)
+                logger.info(f"✅ Created {len(records)} {transaction_type} records")
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to create {len(chunk)} {transaction_type} records: {str(e)}")
+                created.extend([None] * len(chunk))
+                
+        return created
             
     def get_records_ready_for_zoho_sync(self, transaction_type: str, limit: int = 10) -> List[Dict]:
         """
@@ -560,14 +799,14 @@ class AirtableClient:
             List of records ready for Zoho sync
         """
         try:
-            table_name = self.purchases_table if transaction_type == 'purchase' else self.sales_table
+            table_name = self._table_for(transaction_type)
             
             params = {
                 'filterByFormula': "{Processing Status} = 'airtable_complete'",
                 'maxRecords': limit
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/{table_name}",
                 headers=self.headers,
                 params=params
@@ -577,42 +816,75 @@ class AirtableClient:
             records = response.json().get('records', [])
             
             # Transform records for Zoho processing
-            processed_records = []
-            for record in records:
-                fields = record['fields']
-                
-                # Parse items JSON
-                items = []
-                if fields.get('Items'):
-                    try:
-                        items = json.loads(fields['Items'])
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid items JSON in record {record['id']}")
-                
-                processed_record = {
-                    'airtable_record_id': record['id'],
-                    'order_number': fields.get('Order Number'),
-                    'date': fields.get('Date'),
-                    'vendor_name': fields.get('Vendor'),
-                    'channel': fields.get('Channel'),
-                    'customer_email': fields.get('Customer Email'),
-                    'items': items,
-                    'subtotal': fields.get('Subtotal', 0),
-                    'taxes': fields.get('Taxes', 0),
-                    'shipping': fields.get('Shipping', 0),
-                    'fees': fields.get('Fees', 0),
-                    'total': fields.get('Total', 0),
-                    'type': transaction_type
-                }
-                
-                processed_records.append(processed_record)
-            
-            return processed_records
+            return [self._record_to_data(record, transaction_type) for record in records]
             
         except Exception as e:
             logger.error(f"Failed to get records ready for Zoho sync: {e}")
             return []
             
+    def get_resolved_reviews(self, transaction_type: str, record_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Find which of the given review records no longer require review.
+        
+        One filtered list request per 100 IDs replaces a GET per record, and
+        only resolved records come back.
+        
+        Args:
+            transaction_type: 'purchase' or 'sale'
+            record_ids: Airtable record IDs awaiting review
+            
+        Returns:
+            Transaction data of the resolved records, by record ID
+        """
+        table_name = self._table_for(transaction_type)
+        resolved = {}
+        
+        for start in range(0, len(record_ids), REVIEW_LOOKUP_CHUNK):
+            chunk = record_ids[start:start + REVIEW_LOOKUP_CHUNK]
+            id_match = ', '.join(f"RECORD_ID() = '{record_id}'" for record_id in chunk)
+            
+            response = self.session.get(
+                f"{self.base_url}/{table_name}",
+                headers=self.headers,
+                params={'filterByFormula': f"AND(OR({id_match}), NOT({{Requires Review}}))"}
+            )
+            response.raise_for_status()
+            
+            for record in response.json().get('records', []):
+                # Only fields the reviewer filled in, so they never blank out parsed values
+                data = self._record_to_data(record, transaction_type, present_only=True)
+                data['requires_review'] = False
+                resolved[record['id']] = data
+                
+        return resolved
+        
+    def _record_to_data(self, record: Dict, transaction_type: str, present_only: bool = False) -> Dict:
+        """
+        Transform a purchase/sale table record back into transaction data.
+        
+        With present_only, fields missing from the record (Airtable omits empty
+        cells) are left out instead of being filled with defaults.
+        """
+        fields = record['fields']
+        data = {'airtable_record_id': record['id'], 'type': transaction_type}
+        
+        for key, field, default in RECORD_FIELDS.get(transaction_type, RECORD_FIELDS['sale']):
+            if field in fields:
+                data[key] = fields[field]
+            elif not present_only:
+                data[key] = default
+        
+        # Parse items JSON
+        if fields.get('Items'):
+            try:
+                data['items'] = json_utils.loads(fields['Items'])
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid items JSON in record {record['id']}")
+        if 'items' not in data and not present_only:
+            data['items'] = []
+        
+        return data
+            
     def mark_record_synced_to_zoho(self, record_id: str, table_type: str, 
                                    zoho_adjustment_id: str = None, errors: List[str] = None) -> bool:
         """
@@ -628,14 +900,14 @@ class AirtableClient:
             Success status
         """
         try:
-            table_name = self.purchases_table if table_type == 'purchase' else self.sales_table
+            table_name = self._table_for(table_type)
             
             if errors:
                 # Mark as failed
                 update_data = {
                     "fields": {
                         "Processing Status": "zoho_sync_failed",
-                        "Zoho Sync Errors": json.dumps(errors),
+                        "Zoho Sync Errors": json_utils.dumps(errors),
                         "Last Sync Attempt": datetime.now().isoformat()
                     }
                 }
@@ -649,7 +921,7 @@ class AirtableClient:
                     }
                 }
             
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.base_url}/{table_name}/{record_id}",
                 json=update_data,
                 headers=self.headers
@@ -16,18 +16,44 @@ class Config:
     # Default values for optional configuration
     DEFAULTS = {
         'POLL_INTERVAL': 300,  # 5 minutes
+        'POLL_INTERVAL_MAX': 900,  # 15 minutes, when polling without IDLE
+        'GMAIL_IDLE_TIMEOUT': 1740,  # 29 minutes
+        'VALIDATION_INTERVAL': 3600,  # 1 hour
+        'ERROR_BACKOFF_MAX': 1800,  # 30 minutes
+        'STATUS_REPORT_EVERY': 25,  # emails between Discord status reports
         'LOG_LEVEL': 'INFO',
         'MAX_RETRIES': 3,
         'RETRY_DELAY': 5,
         'GMAIL_IMAP_SERVER': 'imap.gmail.com',
         'GMAIL_IMAP_PORT': 993,
+        'GMAIL_USE_IDLE': True,
+        'GMAIL_KEEPALIVE_INTERVAL': 1500,
+        'EMAIL_PREFILTER_SUBJECT_KEYWORDS': '',
+        'EMAIL_PREFILTER_SENDERS': '',
         'AIRTABLE_PURCHASES_TABLE': 'Purchases',
         'AIRTABLE_SALES_TABLE': 'Sales',
         'OPENAI_MODEL': 'gpt-4',
         'OPENAI_TEMPERATURE': 0.1,
+        'OPENAI_BATCH_PARSE': True,
+        'OPENAI_BATCH_MAX_EMAILS': 20,
+        'OPENAI_MAX_CONCURRENCY': 4,
+        'OPENAI_REQUESTS_PER_MINUTE': 0,
+        'AIRTABLE_REQUESTS_PER_SECOND': 5,
+        'ZOHO_REQUESTS_PER_MINUTE': 100,
         'ZOHO_API_REGION': 'com',  # com, eu, in, au, jp
         'DISCORD_RETRY_ON_FAIL': True,
+        'DISCORD_OUTBOX_SIZE': 32,
         'EMAIL_BATCH_SIZE': 10,
+        'EMAIL_CONCURRENCY': 5,
+        'PARSE_CACHE_ENABLED': True,
+        'PARSE_CACHE_PATH': 'parse_cache.db',
+        'PARSE_CACHE_TTL': 604800,  # 7 days
+        'PARSE_CACHE_MEMORY_SIZE': 1024,
+        'PARSE_CACHE_MIN_CONFIDENCE': 0.5,
+        'PROCESSED_STORE_PATH': 'processed_emails.db',
+        'PROCESSED_CACHE_SIZE': 100000,
+        'HTTP_POOL_SIZE': 20,
+        'AIRTABLE_CREATE_BATCH_WINDOW': 0.05,
         'ENABLE_DRY_RUN': False,  # For testing without making actual API calls
     }
     
@@ -3,20 +3,86 @@
 import logging
 import requests
 import json
-from typing import Dict, Optional, Any, List
+import time
+from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+
+from . import json_utils
+from .http_session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Discord webhook limits per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+YES_NO = {True: "✅ Yes", False: "❌ No"}
+
+# Per-transaction-type styling for workflow error embeds: (title, color key, order emoji)
+WORKFLOW_ERROR_STYLES = {
+    'purchase': ("❌ Purchase Workflow Failed", 'purchase', "🛒"),
+    'sale': ("❌ Sales Workflow Failed", 'sale', "🛍️"),
+}
+
+def bullet_list(items, limit: Optional[int] = None) -> str:
+    """Render items as '• item' lines, optionally capped with an '... and N more' line."""
+    items = list(items)
+    shown = items if limit is None else items[:limit]
+    text = "\n".join(f"• {item}" for item in shown)
+    if len(items) > len(shown):
+        text += f"\n... and {len(items) - len(shown)} more"
+    return text
+
+
+def embed_field(name: str, value: Any, inline: Optional[bool] = None) -> Dict:
+    """
+    Build one embed field, clipping the value to Discord's 1024-character limit.
+    
+    With inline=None, short values are laid out inline and long ones get their own row.
+    """
+    value = str(value)
+    if inline is None:
+        inline = len(value) < 50
+    return {"name": name, "value": value[:1024], "inline": inline}
+
+
+def _format_detail(value: Any) -> Any:
+    """Render list/dict error details readably (lists capped at 5 entries)."""
+    if isinstance(value, list):
+        return bullet_list(value, limit=5)
+    if isinstance(value, dict):
+        return json.dumps(value, indent=2)[:1000]
+    return value
+
+
+WORKFLOW_NEXT_STEPS = """
+**Action Required:**
+1. Check Zoho API connectivity
+2. Verify vendor/customer exists
+3. Review item configurations
+4. Retry from Airtable if needed
+        """
+
+REVIEW_ACTION_STEPS = """
+**Action Required:**
+1. Open Airtable record: `{record_id}`
+2. Fill missing fields: {missing_fields}
+3. Uncheck 'Requires Review' when complete
+4. System will auto-process within 5 minutes
+        """
+
 
 class DiscordNotifier:
     """Enhanced Discord notifications with workflow-specific messaging."""
     
-    def __init__(self, config):
+    def __init__(self, config, session: Optional[requests.Session] = None):
         self.config = config
         self.webhook_url = config.get('DISCORD_WEBHOOK_URL')
         self.mention_on_error = config.get('DISCORD_MENTION_ON_ERROR')
         self.retry_on_fail = config.get_bool('DISCORD_RETRY_ON_FAIL', True)
+        self.session = session or create_session(config)
         
         # Color codes for different message types
         self.colors = {
@@ -28,8 +94,24 @@ class DiscordNotifier:
             'sale': 0x20c997          # Teal
         }
         
+        # (embed, content) pairs queued for the next flush() (sent together, up to 10 per message)
+        self._queue: List[Tuple[Dict, str]] = []
+        self._queue_lock = Lock()
+        
+        # Webhook POSTs happen on a background thread so a slow Discord never stalls
+        # a cycle. The outbox is bounded; payloads that don't fit are dropped and counted
+        self._outbox: "Queue[Optional[Dict]]" = Queue(maxsize=max(1, config.get_int('DISCORD_OUTBOX_SIZE', 32)))
+        self.dropped_notifications = 0
+        self._sender = Thread(target=self._send_loop, name='discord-sender', daemon=True)
+        self._sender.start()
+        
         logger.info(f"📢 Discord notifier initialized")
         
+    @property
+    def enabled(self) -> bool:
+        """Whether notifications are delivered at all (a webhook is configured)."""
+        return bool(self.webhook_url)
+        
     def test_webhook(self) -> bool:
         """Test Discord webhook connectivity."""
         if not self.webhook_url:
@@ -44,7 +126,7 @@ class DiscordNotifier:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
                 json={"embeds": [test_embed]},
                 timeout=10
@@ -66,13 +148,7 @@ class DiscordNotifier:
         """Send enhanced success notification with workflow details."""
         
         # Build fields from details
-        fields = []
-        for key, value in details.items():
-            fields.append({
-                "name": key,
-                "value": str(value),
-                "inline": True
-            })
+        fields = [embed_field(key, value, inline=True) for key, value in details.items()]
         
         # Add workflow steps if provided
         if extra_info and 'workflow_steps' in extra_info:
@@ -95,8 +171,8 @@ class DiscordNotifier:
         
         self._send_embed(embed)
 
-    def send_purchase_order_success(self, po_data: Dict, zoho_result: Dict):
-        """Send Purchase Order creation success notification."""
+    def send_purchase_order_success(self, po_data: Dict, zoho_result: Dict, queue: bool = False):
+        """Send Purchase Order creation success notification (queued for flush() if queue=True)."""
         
         order_number = po_data.get('order_number', 'Unknown')
         vendor = po_data.get('vendor_name', 'Unknown')
@@ -105,13 +181,13 @@ class DiscordNotifier:
             {"name": "📋 PO Number", "value": zoho_result.get('purchase_order_id', 'Unknown'), "inline": True},
             {"name": "👥 Vendor", "value": vendor, "inline": True},
             {"name": "📦 Items", "value": len(zoho_result.get('items_processed', [])), "inline": True},
-            {"name": "🧾 Bill Generated", "value": "✅ Yes" if zoho_result.get('bill_id') else "❌ No", "inline": True},
+            {"name": "🧾 Bill Generated", "value": YES_NO[bool(zoho_result.get('bill_id'))], "inline": True},
             {"name": "📈 Inventory Updated", "value": "✅ Yes", "inline": True},
             {"name": "💰 COGS Method", "value": "FIFO (Zoho Native)", "inline": True}
         ]
         
         # Add workflow steps
-        workflow_steps = "\n".join([f"• {step}" for step in zoho_result.get('workflow_steps', [])])
+        workflow_steps = bullet_list(zoho_result.get('workflow_steps', []))
         if workflow_steps:
             fields.append({
                 "name": "🔄 Workflow Steps",
@@ -130,27 +206,29 @@ class DiscordNotifier:
             }
         }
         
-        self._send_embed(embed)
+        self._send_or_queue(embed, queue)
 
-    def send_sales_order_success(self, so_data: Dict, zoho_result: Dict):
-        """Send Sales Order creation success notification."""
+    def send_sales_order_success(self, so_data: Dict, zoho_result: Dict, queue: bool = False):
+        """Send Sales Order creation success notification (queued for flush() if queue=True)."""
         
         order_number = so_data.get('order_number', 'Unknown')
         channel = so_data.get('channel', 'Unknown')
+        revenue = zoho_result.get('revenue', 0)
+        cogs = zoho_result.get('cogs', 0)
         
         fields = [
             {"name": "📋 SO Number", "value": zoho_result.get('sales_order_id', 'Unknown'), "inline": True},
             {"name": "🏪 Channel", "value": channel, "inline": True},
             {"name": "📦 Items", "value": len(zoho_result.get('items_processed', [])), "inline": True},
-            {"name": "🧾 Invoice Generated", "value": "✅ Yes" if zoho_result.get('invoice_id') else "❌ No", "inline": True},
-            {"name": "📦 Shipment Created", "value": "✅ Yes" if zoho_result.get('shipment_id') else "❌ No", "inline": True},
-            {"name": "💵 Revenue", "value": f"${zoho_result.get('revenue', 0):.2f}", "inline": True},
-            {"name": "💰 COGS", "value": f"${zoho_result.get('cogs', 0):.2f}", "inline": True},
-            {"name": "📈 Profit", "value": f"${zoho_result.get('revenue', 0) - zoho_result.get('cogs', 0):.2f}", "inline": True}
+            {"name": "🧾 Invoice Generated", "value": YES_NO[bool(zoho_result.get('invoice_id'))], "inline": True},
+            {"name": "📦 Shipment Created", "value": YES_NO[bool(zoho_result.get('shipment_id'))], "inline": True},
+            {"name": "💵 Revenue", "value": f"${revenue:.2f}", "inline": True},
+            {"name": "💰 COGS", "value": f"${cogs:.2f}", "inline": True},
+            {"name": "📈 Profit", "value": f"${revenue - cogs:.2f}", "inline": True}
         ]
         
         # Add workflow steps
-        workflow_steps = "\n".join([f"• {step}" for step in zoho_result.get('workflow_steps', [])])
+        workflow_steps = bullet_list(zoho_result.get('workflow_steps', []))
         if workflow_steps:
             fields.append({
                 "name": "🔄 Workflow Steps",
@@ -169,31 +247,17 @@ class DiscordNotifier:
             }
         }
         
-        self._send_embed(embed)
+        self._send_or_queue(embed, queue)
 
-    def send_error_notification(self, title: str, description: str, details: Dict[str, Any]):
-        """Send error notification with action items."""
+    def send_error_notification(self, title: str, description: str, details: Dict[str, Any], queue: bool = False):
+        """Send error notification with action items (queued for flush() if queue=True)."""
         
         # Add mention if configured
         content = ""
         if self.mention_on_error:
             content = f"<@{self.mention_on_error}>"
         
-        fields = []
-        for key, value in details.items():
-            # Handle lists and complex objects
-            if isinstance(value, list):
-                value = "\n".join([f"• {item}" for item in value[:5]])  # Limit to 5 items
-                if len(details.get(key, [])) > 5:
-                    value += f"\n... and {len(details[key]) - 5} more"
-            elif isinstance(value, dict):
-                value = json.dumps(value, indent=2)[:1000]  # Limit length
-            
-            fields.append({
-                "name": key,
-                "value": str(value)[:1024],  # Discord field value limit
-                "inline": True if len(str(value)) < 50 else False
-            })
+        fields = [embed_field(key, _format_detail(value)) for key, value in details.items()]
         
         embed = {
             "title": title,
@@ -206,22 +270,16 @@ class DiscordNotifier:
             }
         }
         
-        self._send_embed(embed, content)
+        self._send_or_queue(embed, queue, content)
 
     def send_workflow_error(self, transaction_type: str, order_number: str, workflow_stage: str, 
-                          error_details: Dict, context: Dict):
-        """Send workflow-specific error notification."""
+                          error_details: Dict, context: Dict, queue: bool = False):
+        """Send workflow-specific error notification (queued for flush() if queue=True)."""
         
         content = f"<@{self.mention_on_error}>" if self.mention_on_error else ""
         
-        if transaction_type == 'purchase':
-            title = "❌ Purchase Workflow Failed"
-            color = self.colors['purchase']
-            emoji = "🛒"
-        else:
-            title = "❌ Sales Workflow Failed"
-            color = self.colors['sale']
-            emoji = "🛍️"
+        title, color_key, emoji = WORKFLOW_ERROR_STYLES.get(transaction_type, WORKFLOW_ERROR_STYLES['sale'])
+        color = self.colors[color_key]
         
         fields = [
             {"name": f"{emoji} Order", "value": order_number, "inline": True},
@@ -230,15 +288,10 @@ class DiscordNotifier:
         ]
         
         # Add context fields
-        for key, value in context.items():
-            fields.append({
-                "name": key,
-                "value": str(value),
-                "inline": True
-            })
+        fields.extend(embed_field(key, value, inline=True) for key, value in context.items())
         
         # Add error details
-        error_text = "\n".join([f"• {error}" for error in error_details.get('errors', ['Unknown error'])[:3]])
+        error_text = bullet_list(error_details.get('errors', ['Unknown error'])[:3])
         fields.append({
             "name": "🔍 Error Details",
             "value": error_text,
@@ -246,17 +299,9 @@ class DiscordNotifier:
         })
         
         # Add action items
-        action_text = """
-**Action Required:**
-1. Check Zoho API connectivity
-2. Verify vendor/customer exists
-3. Review item configurations
-4. Retry from Airtable if needed
-        """
-        
         fields.append({
             "name": "⚠️ Next Steps",
-            "value": action_text,
+            "value": WORKFLOW_NEXT_STEPS,
             "inline": False
         })
         
@@ -271,31 +316,20 @@ class DiscordNotifier:
             }
         }
         
-        self._send_embed(embed, content)
+        self._send_or_queue(embed, queue, content)
 
     def send_warning_notification(self, title: str, description: str, details: Dict[str, Any], 
                                 extra_info: Optional[Dict] = None):
         """Send warning notification."""
         
-        fields = []
-        for key, value in details.items():
-            if isinstance(value, list):
-                value = "\n".join([f"• {item}" for item in value[:5]])
-            
-            fields.append({
-                "name": key,
-                "value": str(value),
-                "inline": True if len(str(value)) < 50 else False
-            })
+        fields = [
+            embed_field(key, bullet_list(value[:5]) if isinstance(value, list) else value)
+            for key, value in details.items()
+        ]
         
         # Add extra info if provided
         if extra_info:
-            for key, value in extra_info.items():
-                fields.append({
-                    "name": key,
-                    "value": str(value),
-                    "inline": False
-                })
+            fields.extend(embed_field(key, value, inline=False) for key, value in extra_info.items())
         
         embed = {
             "title": title,
@@ -311,28 +345,21 @@ class DiscordNotifier:
         self._send_embed(embed)
 
     def send_human_review_notification(self, transaction_type: str, order_number: str, 
-                                     missing_fields: List[str], record_id: str, confidence: float):
-        """Send human review required notification."""
+                                     missing_fields: List[str], record_id: str, confidence: float,
+                                     queue: bool = False):
+        """Send human review required notification (queued for flush() if queue=True)."""
         
         fields = [
             {"name": "📋 Order", "value": order_number, "inline": True},
             {"name": "📊 Type", "value": transaction_type.title(), "inline": True},
             {"name": "🎯 Confidence", "value": f"{confidence:.1%}", "inline": True},
-            {"name": "❌ Missing Fields", "value": "\n".join([f"• {field}" for field in missing_fields]), "inline": False},
+            {"name": "❌ Missing Fields", "value": bullet_list(missing_fields), "inline": False},
             {"name": "🗃️ Airtable Record", "value": record_id, "inline": True}
         ]
         
-        action_text = f"""
-**Action Required:**
-1. Open Airtable record: `{record_id}`
-2. Fill missing fields: {', '.join(missing_fields)}
-3. Uncheck 'Requires Review' when complete
-4. System will auto-process within 5 minutes
-        """
-        
         fields.append({
             "name": "⚡ Action Steps",
-            "value": action_text,
+            "value": REVIEW_ACTION_STEPS.format(record_id=record_id, missing_fields=', '.join(missing_fields)),
             "inline": False
         })
         
@@ -347,18 +374,12 @@ class DiscordNotifier:
             }
         }
         
-        self._send_embed(embed)
+        self._send_or_queue(embed, queue)
 
     def send_info_notification(self, title: str, description: str, details: Dict[str, Any]):
         """Send informational notification."""
         
-        fields = []
-        for key, value in details.items():
-            fields.append({
-                "name": key,
-                "value": str(value),
-                "inline": True
-            })
+        fields = [embed_field(key, value, inline=True) for key, value in details.items()]
         
         embed = {
             "title": title,
@@ -373,8 +394,8 @@ class DiscordNotifier:
         
         self._send_embed(embed)
 
-    def send_validation_alert(self, validation_type: str, findings: Dict):
-        """Send validation check alerts."""
+    def send_validation_alert(self, validation_type: str, findings: Dict, queue: bool = False):
+        """Send validation check alerts (queued for flush() if queue=True)."""
         
         if validation_type == "inventory_adjustments":
             auto_adjustments = findings.get('auto_adjustments', 0)
@@ -387,7 +408,7 @@ class DiscordNotifier:
                 ]
                 
                 if findings.get('auto_adjustment_ids'):
-                    adj_list = "\n".join([f"• {adj_id}" for adj_id in findings['auto_adjustment_ids'][:5]])
+                    adj_list = bullet_list(findings['auto_adjustment_ids'][:5])
                     fields.append({
                         "name": "📋 Adjustment IDs",
                         "value": adj_list,
@@ -405,7 +426,7 @@ class DiscordNotifier:
                     }
                 }
                 
-                self._send_embed(embed)
+                self._send_or_queue(embed, queue)
         
         elif validation_type == "inventory_sync":
             discrepancies = findings.get('discrepancies', [])
@@ -419,8 +440,9 @@ class DiscordNotifier:
                 
                 # Show first few discrepancies
                 if discrepancies:
-                    disc_list = "\n".join([f"• {disc['sku']}: AT={disc['airtable_qty']} ZO={disc['zoho_qty']}" 
-                                         for disc in discrepancies[:5]])
+                    disc_list = bullet_list(
+                        f"{disc['sku']}: AT={disc['airtable_qty']} ZO={disc['zoho_qty']}" for disc in discrepancies[:5]
+                    )
                     fields.append({
                         "name": "📋 Sample Discrepancies",
                         "value": disc_list,
@@ -438,7 +460,74 @@ class DiscordNotifier:
                     }
                 }
                 
-                self._send_embed(embed)
+                self._send_or_queue(embed, queue)
+
+    def queue_embed(self, embed: Dict, content: str = ""):
+        """Queue an embed (and optional message content, e.g. a mention) for the next flush()."""
+        with self._queue_lock:
+            self._queue.append((embed, content))
+
+    def flush(self) -> int:
+        """
+        Send all queued embeds, packing as many into each webhook message as Discord allows.
+        
+        Returns:
+            Number of webhook messages handed to the sender thread
+        """
+        with self._queue_lock:
+            embeds, self._queue = self._queue, []
+            
+        if not embeds:
+            return 0
+            
+        if not self.webhook_url:
+            logger.warning(f"⚠️ No Discord webhook URL - dropping {len(embeds)} queued notifications")
+            return 0
+        
+        messages = 0
+        batch: List[Dict] = []
+        batch_chars = 0
+        batch_content = ""
+        for embed, content in embeds:
+            size = self._embed_size(embed)
+            if batch and (len(batch) >= MAX_EMBEDS_PER_MESSAGE or batch_chars + size > MAX_EMBED_CHARS_PER_MESSAGE):
+                self._deliver(self._batch_payload(batch, batch_content))
+                messages += 1
+                batch, batch_chars, batch_content = [], 0, ""
+            batch.append(embed)
+            batch_chars += size
+            # Mentions are identical for every error, so one per message is enough
+            batch_content = batch_content or content
+            
+        self._deliver(self._batch_payload(batch, batch_content))
+        messages += 1
+        
+        logger.debug(f"📢 Flushed {len(embeds)} Discord notifications in {messages} messages")
+        return messages
+
+    @staticmethod
+    def _batch_payload(embeds: List[Dict], content: str) -> Dict:
+        """Build a webhook payload for several embeds."""
+        payload = {"embeds": embeds}
+        if content:
+            payload["content"] = content
+        return payload
+
+    @staticmethod
+    def _embed_size(embed: Dict) -> int:
+        """Count the characters Discord applies to its per-message embed limit."""
+        size = len(embed.get('title', '')) + len(embed.get('description', ''))
+        size += len(embed.get('footer', {}).get('text', ''))
+        for field in embed.get('fields', []):
+            size += len(str(field.get('name', ''))) + len(str(field.get('value', '')))
+        return size
+
+    def _send_or_queue(self, embed: Dict, queue: bool, content: str = ""):
+        """Queue the embed for the next flush() or send it right away."""
+        if queue:
+            self.queue_embed(embed, content)
+        else:
+            self._send_embed(embed, content)
 
     def _send_embed(self, embed: Dict, content: str = ""):
         """Send Discord embed message."""
@@ -450,10 +539,79 @@ class DiscordNotifier:
         if content:
             payload["content"] = content
         
+        self._deliver(payload)
+
+    def _deliver(self, payload: Dict):
+        """Hand a payload to the sender thread without blocking (dropped if the outbox is full)."""
+        try:
+            self._outbox.put_nowait(payload)
+        except Full:
+            self.dropped_notifications += 1
+            logger.warning(f"⚠️ Discord outbox full - dropped notification ({self.dropped_notifications} so far)")
+
+    def _send_loop(self):
+        """
+        Sender thread: POST payloads in order until close() sends the stop marker.
+
+        Payloads that piled up while a POST was in flight are merged into as few
+        webhook messages as the embed limits allow, so a burst of errors costs
+        one round trip per message instead of one per notification.
+        """
+        stopping = False
+        while not stopping:
+            payload = self._outbox.get()
+            if payload is None:
+                break
+            while True:
+                try:
+                    pending = self._outbox.get_nowait()
+                except Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                merged = self._merge_payloads(payload, pending)
+                if merged is None:
+                    self._post_payload(payload)
+                    payload = pending
+                else:
+                    payload = merged
+            self._post_payload(payload)
+
+    def _merge_payloads(self, first: Dict, second: Dict) -> Optional[Dict]:
+        """Combine two payloads into one message, or None if it would break Discord's limits."""
+        embeds = first.get('embeds', []) + second.get('embeds', [])
+        if len(embeds) > MAX_EMBEDS_PER_MESSAGE:
+            return None
+        if sum(self._embed_size(embed) for embed in embeds) > MAX_EMBED_CHARS_PER_MESSAGE:
+            return None
+        content = first.get('content', '')
+        other = second.get('content', '')
+        if content and other and content != other:
+            return None
+        return self._batch_payload(embeds, content or other)
+
+    def close(self, timeout: float = 30.0):
+        """Send everything still in the outbox, then stop the sender thread."""
+        if not self._sender.is_alive():
+            return
+        try:
+            self._outbox.put(None, timeout=timeout)
+        except Full:
+            logger.warning("⚠️ Discord outbox did not drain - stopping without sending the rest")
+            return
+        self._sender.join(timeout)
+
+    def _post_payload(self, payload: Dict):
+        """POST a webhook payload, retrying once on failure."""
+        # Encoded once and reused by the retry; the session keeps the connection alive
+        body = json_utils.dumps_bytes(payload)
+        headers = {'Content-Type': 'application/json'}
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
-                json=payload,
+                data=body,
+                headers=headers,
                 timeout=10
             )
             
@@ -465,7 +623,7 @@ class DiscordNotifier:
                 if self.retry_on_fail and response.status_code != 429:  # Don't retry rate limits
                     logger.info("🔄 Retrying Discord notification...")
                     time.sleep(2)
-                    requests.post(self.webhook_url, json=payload, timeout=10)
+                    self.session.post(self.webhook_url, data=body, headers=headers, timeout=10)
                     
         except Exception as e:
             logger.error(f"💥 Failed to send Discord notification: {e}")
@@ -473,7 +631,7 @@ class DiscordNotifier:
                 try:
                     logger.info("🔄 Retrying Discord notification after error...")
                     time.sleep(5)
-                    requests.post(self.webhook_url, json=payload, timeout=10)
+                    self.session.post(self.webhook_url, data=body, headers=headers, timeout=10)
                 except:
                     logger.error("💥 Discord retry also failed")
 
@@ -10,13 +10,15 @@ import requests
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
+from .http_session import create_session
+
 logger = logging.getLogger(__name__)
 
 
 class GitHubGistTokenManager:
     """Manages Zoho access tokens using GitHub secret Gist for persistence."""
     
-    def __init__(self, config):
+    def __init__(self, config, session: Optional[requests.Session] = None):
         self.config = config
         self.github_token = config.get('GITHUB_TOKEN')
         self.gist_id = config.get('ZOHO_ACCESS_GIST_ID')
@@ -27,6 +29,8 @@ class GitHubGistTokenManager:
         if not self.gist_id:
             raise ValueError("ZOHO_ACCESS_GIST_ID environment variable is required")
         
+        self.session = session or create_session(config)
+        
         logger.info("GitHub Gist token manager initialized")
         logger.info(f"   - Gist ID: {self.gist_id}")
         logger.info(f"   - Storage: Plain text (no encryption)")
@@ -47,7 +51,7 @@ class GitHubGistTokenManager:
                 'Accept': 'application/vnd.github.v3+json'
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f'https://api.github.com/gists/{self.gist_id}',
                 headers=headers,
                 timeout=10
@@ -147,7 +151,7 @@ class GitHubGistTokenManager:
             # Update or create gist
             if self._gist_exists():
                 # Update existing gist
-                response = requests.patch(
+                response = self.session.patch(
                     f'https://api.github.com/gists/{self.gist_id}',
                     headers=headers,
                     json=gist_data,
@@ -155,7 +159,7 @@ class GitHubGistTokenManager:
                 )
             else:
                 # Create new gist
-                response = requests.post(
+                response = self.session.post(
                     'https://api.github.com/gists',
                     headers=headers,
                     json=gist_data,
@@ -208,7 +212,7 @@ class GitHubGistTokenManager:
                 'Accept': 'application/vnd.github.v3+json'
             }
             
-            response = requests.patch(
+            response = self.session.patch(
                 f'https://api.github.com/gists/{self.gist_id}',
                 headers=headers,
                 json=gist_data,
@@ -235,7 +239,7 @@ class GitHubGistTokenManager:
                 'Accept': 'application/vnd.github.v3+json'
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f'https://api.github.com/gists/{self.gist_id}',
                 headers=headers,
                 timeout=10
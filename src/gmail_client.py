@@ -3,16 +3,111 @@
 import imaplib
 import email
 import logging
+import re
 import time
+import select
+import ssl
 import chardet
 import html2text
-from typing import List, Dict, Optional, Set
+from typing import Callable, List, Dict, Optional, Set
 from datetime import datetime
 from email.header import decode_header
-from threading import Lock
+from threading import Event, Lock
 
 logger = logging.getLogger(__name__)
 
+# Fallback HTML stripping used when html2text fails
+SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL)
+STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Headers-only fetch used by the prefilter; PEEK leaves \Seen untouched
+PREFILTER_FETCH = '(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM TO DATE MESSAGE-ID)])'
+
+# Full message fetch. Only the RFC822 literal is parsed, so FLAGS/INTERNALDATE are
+# not requested; RFC822 (not PEEK) keeps the existing implicit \Seen on fetch
+FULL_FETCH = '(RFC822)'
+
+# Re-issue IDLE before servers drop it (Gmail and RFC 2177 allow ~30 minutes)
+IDLE_RENEW_SECONDS = 29 * 60
+
+# How often an IDLE wait checks for a shutdown request
+STOP_CHECK_SECONDS = 1.0
+
+# Upper bound on full messages requested per FETCH, to keep responses a sane size
+FETCH_CHUNK_SIZE = 100
+
+
+def compact_seq_set(seq_nums: List[str]) -> str:
+    """Build an IMAP sequence set, collapsing consecutive runs (e.g. '3:7,9')."""
+    numbers = sorted({int(seq_num) for seq_num in seq_nums})
+    ranges = []
+    start = prev = numbers[0]
+    for number in numbers[1:]:
+        if number != prev + 1:
+            ranges.append(f"{start}:{prev}" if start != prev else str(start))
+            start = number
+        prev = number
+    ranges.append(f"{start}:{prev}" if start != prev else str(start))
+    return ','.join(ranges)
+
+
+class SeqNumSet:
+    """
+    Set of IMAP sequence numbers stored as a bitmap.
+    
+    Sequence numbers are small, dense integers (1..mailbox size), so one bit
+    per number is exact - no false positives - and far smaller than a set of
+    strings. Accepts numbers as str or int, like the rest of the client.
+    Numbers below 1 are never members (a negative index would hit the wrong byte).
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+
+    def add(self, seq_num) -> None:
+        number = int(seq_num)
+        if number < 1:
+            return
+        index = number >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index + 1 - len(self._bits)))
+        self._bits[index] |= 1 << (number & 7)
+
+    def update(self, seq_nums) -> None:
+        numbers = [number for number in map(int, seq_nums) if number > 0]
+        if not numbers:
+            return
+        # Grow the bitmap once for the whole batch
+        size = (max(numbers) >> 3) + 1
+        if size > len(self._bits):
+            self._bits.extend(bytes(size - len(self._bits)))
+        bits = self._bits
+        for number in numbers:
+            bits[number >> 3] |= 1 << (number & 7)
+
+    def discard(self, seq_num) -> None:
+        number = int(seq_num)
+        index = number >> 3
+        if 0 <= index < len(self._bits):
+            self._bits[index] &= ~(1 << (number & 7)) & 0xFF
+
+    def clear(self) -> None:
+        self._bits = bytearray()
+
+    def __bool__(self) -> bool:
+        # count() scans in C rather than iterating byte by byte
+        return self._bits.count(0) != len(self._bits)
+
+    def __contains__(self, seq_num) -> bool:
+        try:
+            number = int(seq_num)
+        except (TypeError, ValueError):
+            return False
+        index = number >> 3
+        return 0 < number and index < len(self._bits) and bool(self._bits[index] & (1 << (number & 7)))
+
 
 class GmailClient:
     """Handle Gmail IMAP operations using sequence numbers consistently."""
@@ -20,15 +115,30 @@ class GmailClient:
     def __init__(self, config):
         self.config = config
         self.imap = None
-        self.processed_seq_nums: Set[str] = set()
+        self.processed_seq_nums = SeqNumSet()
         self.connection_lock = Lock()
         self.last_reconnect = None
         self.reconnect_delay = 5
+        self.reconnect_count = 0  # re-authentications after the first login
         self.max_fetch_batch = config.get_int('EMAIL_BATCH_SIZE', 10)
         self.html_converter = html2text.HTML2Text()
         self.html_converter.ignore_links = False
         self.html_converter.ignore_images = True
         self.processed_label_name = config.get('GMAIL_PROCESSED_LABEL', 'PROCESSED')
+        self.use_idle = config.get_bool('GMAIL_USE_IDLE', True)
+        
+        # Optional two-stage fetch: only download bodies for likely order emails
+        self.prefilter_keywords = [k.lower() for k in config.get_list('EMAIL_PREFILTER_SUBJECT_KEYWORDS')]
+        self.prefilter_senders = [s.lower() for s in config.get_list('EMAIL_PREFILTER_SENDERS')]
+        
+        # Skip the keepalive NOOP while the session has been used recently
+        self.keepalive_interval = config.get_int('GMAIL_KEEPALIVE_INTERVAL', 1500)
+        self._last_activity = 0.0
+        
+        # Mail already known to be waiting, so wait_for_new_mail() returns at once:
+        # unread mail left over by a capped fetch, or a higher EXISTS count than seen
+        self.has_backlog = False
+        self._mailbox_size = 0
         
         # Cache capabilities
         self._capabilities = None
@@ -44,6 +154,7 @@ class GmailClient:
     def connect(self, retry: bool = True) -> bool:
         max_retries = self.config.get_int('MAX_RETRIES', 3) if retry else 1
         retry_delay = self.config.get_int('RETRY_DELAY', 5)
+        reconnecting = self.imap is not None
 
         for attempt in range(max_retries):
             try:
@@ -66,12 +177,17 @@ class GmailClient:
                     status, data = self.imap.select('INBOX')
                     if status != 'OK':
                         raise Exception(f"Failed to select INBOX: {data}")
+                    self._mailbox_size = int(data[0] or 0)
+                    self.imap.untagged_responses.pop('EXISTS', None)
                     
                     # Cache capabilities for this session
                     self._load_capabilities()
                     
                     self.processed_seq_nums.clear()
-                    self.last_reconnect = datetime.now()
+                    self.last_reconnect = time.monotonic()
+                    self._last_activity = time.monotonic()
+                    if reconnecting:
+                        self.reconnect_count += 1
                     logger.info("Connected to Gmail successfully")
                     return True
 
@@ -119,24 +235,231 @@ class GmailClient:
         return False
 
     def ensure_connection(self) -> bool:
+        # Reuse the authenticated session without a round trip while it is fresh
+        if self.imap and time.monotonic() - self._last_activity < self.keepalive_interval:
+            return True
+            
         try:
             if self.imap:
                 self.imap.noop()
+                self._last_activity = time.monotonic()
                 return True
         except:
             logger.info("Connection lost, reconnecting...")
 
         if self.last_reconnect:
-            elapsed = (datetime.now() - self.last_reconnect).total_seconds()
+            elapsed = time.monotonic() - self.last_reconnect
             if elapsed < self.reconnect_delay:
                 time.sleep(self.reconnect_delay - elapsed)
 
         return self.connect()
 
+    @property
+    def idle_supported(self) -> bool:
+        """Whether waits use IMAP IDLE push instead of sleeping."""
+        return self.use_idle and self.imap is not None and self._check_capability('IDLE')
+
+    def wait_for_new_mail(self, timeout: float, stop: Optional[Event] = None) -> bool:
+        """
+        Block until the server announces new mail or the timeout elapses.
+        
+        Uses IMAP IDLE when the server supports it, otherwise just sleeps
+        for the timeout like a regular poll. Long waits re-issue IDLE every
+        IDLE_RENEW_SECONDS, since servers drop it after about 30 minutes.
+        Returns immediately if mail is already waiting (see _mail_pending).
+        
+        Args:
+            timeout: Maximum seconds to wait
+            stop: Optional event that ends the wait early once set
+            
+        Returns:
+            True if new mail arrived, False on timeout
+        """
+        if self._mail_pending():
+            logger.info("Unread mail already waiting, skipping wait")
+            return True
+            
+        if not self.use_idle or not self.ensure_connection() or not self._check_capability('IDLE'):
+            self._sleep(timeout, stop)
+            return False
+        
+        new_mail = False
+        deadline = time.monotonic() + timeout
+        try:
+            while not new_mail:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (stop is not None and stop.is_set()):
+                    break
+                    
+                idle_result = self._idle(min(remaining, IDLE_RENEW_SECONDS), stop)
+                if idle_result is None:
+                    self._sleep(max(0.0, deadline - time.monotonic()), stop)
+                    return False
+                new_mail = idle_result
+        except (imaplib.IMAP4.error, OSError) as e:
+            # The next ensure_connection() will notice and reconnect
+            logger.warning(f"IDLE interrupted: {e}")
+            self._last_activity = 0.0
+            return False
+        
+        if new_mail:
+            logger.info("New mail announced by server")
+        return new_mail
+
+    def _mail_pending(self) -> bool:
+        """
+        Whether unread mail is known to be waiting without asking the server.
+        
+        True when the last fetch was capped at max_emails, or when a command
+        since the last check got an untagged EXISTS above the known mailbox size
+        (mail that arrived mid-cycle is never announced by a later IDLE).
+        """
+        if self.has_backlog:
+            return True
+        if self.imap is None:
+            return False
+            
+        exists = self.imap.untagged_responses.pop('EXISTS', None) or []
+        counts = [int(count) for count in exists if count and count.isdigit()]
+        if not counts:
+            return False
+            
+        previous, self._mailbox_size = self._mailbox_size, counts[-1]
+        return max(counts) > previous
+
+    @staticmethod
+    def _sleep(seconds: float, stop: Optional[Event]):
+        """Sleep, waking early if stop is set."""
+        if stop is not None:
+            stop.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _idle(self, timeout: float, stop: Optional[Event] = None) -> Optional[bool]:
+        """
+        Run one IDLE command for up to timeout seconds (less once stop is set).
+        
+        Returns:
+            True on EXISTS, False on timeout, None if the server rejected IDLE
+        """
+        tag = self.imap._new_tag()
+        self.imap.send(tag + b' IDLE\r\n')
+        response = self.imap.readline()
+        if not response.startswith(b'+'):
+            self.imap.tagged_commands.pop(tag, None)
+            logger.warning(f"IDLE rejected by server: {response!r}")
+            return None
+        
+        new_mail = False
+        deadline = time.monotonic() + timeout
+        try:
+            while not new_mail:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                if stop is not None:
+                    if stop.is_set():
+                        break
+                    # Wake periodically so a shutdown doesn't wait out the IDLE
+                    remaining = min(remaining, STOP_CHECK_SECONDS)
+                    
+                # select() only sees the socket: lines already read into imaplib's
+                # buffer (or decrypted by TLS) would otherwise wait out the timeout
+                if not self._has_buffered_input():
+                    readable, _, _ = select.select([self.imap.sock], [], [], remaining)
+                    if not readable:
+                        continue
+                
+                line = self.imap.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                new_mail = self._note_untagged(line)
+        finally:
+            # End IDLE and drain untagged responses up to the tagged completion
+            self.imap.send(b'DONE\r\n')
+            while True:
+                line = self.imap.readline()
+                if not line or line.startswith(tag):
+                    break
+                if self._note_untagged(line):
+                    new_mail = True
+            # The completion was read here rather than by imaplib, so drop its bookkeeping
+            self.imap.tagged_commands.pop(tag, None)
+        
+        self._last_activity = time.monotonic()
+        return new_mail
+
+    def _has_buffered_input(self) -> bool:
+        """Whether response data is waiting in the TLS layer or imaplib's read buffer."""
+        sock = self.imap.sock
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        
+        # peek() returns buffered bytes without blocking once the socket is
+        # non-blocking; with nothing buffered or on the wire it raises or returns b''
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(self.imap.file.peek(1))
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return False
+        finally:
+            sock.settimeout(timeout)
+
+    def _note_untagged(self, line: bytes) -> bool:
+        """
+        Track mailbox changes from a raw untagged line read during IDLE.
+        
+        Returns True if '* N EXISTS' shows the mailbox grew; '* N EXPUNGE'
+        invalidates the remembered sequence numbers.
+        """
+        parts = line.split()
+        if len(parts) != 3 or not parts[1].isdigit():
+            return False
+        kind = parts[2].upper()
+        if kind == b'EXPUNGE':
+            self._mailbox_size = max(0, self._mailbox_size - 1)
+            self._forget_seq_nums()
+            return False
+        if kind != b'EXISTS':
+            return False
+        previous, self._mailbox_size = self._mailbox_size, int(parts[1])
+        return self._mailbox_size > previous
+
+    def _forget_seq_nums(self) -> None:
+        """
+        Drop remembered sequence numbers after an expunge.
+        
+        Expunging renumbers every later message, so a remembered number could
+        now belong to a new, unprocessed email that would be skipped. The
+        persistent Message-ID store still catches anything already processed.
+        """
+        if self.processed_seq_nums:
+            logger.debug("Messages expunged, forgetting processed sequence numbers")
+        self.processed_seq_nums.clear()
+
     def fetch_unread_emails(self, max_emails: Optional[int] = None,
                             since_date: Optional[datetime] = None,
-                            from_sender: Optional[str] = None) -> List[Dict]:
+                            from_sender: Optional[str] = None,
+                            is_processed: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """
+        Fetch unread emails.
+        
+        Args:
+            max_emails: Maximum number of emails to fetch (defaults to EMAIL_BATCH_SIZE)
+            since_date: Only fetch emails received on or after this date
+            from_sender: Only fetch emails from this sender
+            is_processed: Called with each email's headers (and seq_num) when prefilter
+                rules are configured; emails it accepts are returned headers-only
+                instead of being fetched in full. Without rules every email is
+                fetched in full in one pass, so callers check the returned headers
+            
+        Returns:
+            List of email dictionaries
+        """
         emails = []
+        self.has_backlog = False
         if not self.ensure_connection():
             logger.error("Could not establish connection to Gmail")
             return emails
@@ -150,7 +473,7 @@ class GmailClient:
                 from_sender=from_sender
             )
 
-            logger.info(f"IMAP search query: {search_criteria}")
+            logger.debug("IMAP search query: %s", search_criteria)
             status, data = self.imap.search(None, search_criteria)
 
             if status != 'OK':
@@ -160,39 +483,44 @@ class GmailClient:
                 if status != 'OK':
                     return emails
 
+            # Sequence numbers shift when messages are expunged (seen in any response since)
+            if self.imap.untagged_responses.pop('EXPUNGE', None):
+                self._forget_seq_nums()
+                
             seq_num_list = data[0].split()
             if not seq_num_list:
                 return emails
 
-            seq_num_list = seq_num_list[:max_emails]
+            pending = []
+            for seq_num in seq_num_list:
+                # FIX: Handle both bytes and different types of sequence numbers safely
+                if isinstance(seq_num, bytes):
+                    seq_num_str = seq_num.decode()
+                elif isinstance(seq_num, int):
+                    seq_num_str = str(seq_num)
+                else:
+                    seq_num_str = str(seq_num)
+                    
+                if seq_num_str not in self.processed_seq_nums:
+                    pending.append(seq_num_str)
+                    
+            # Cap after filtering so already-processed emails don't take up slots;
+            # anything left over is picked up by the next cycle without waiting
+            self.has_backlog = len(pending) > max_emails
+            pending = pending[:max_emails]
 
-            batch_size = 5
-            for i in range(0, len(seq_num_list), batch_size):
-                batch = seq_num_list[i:i + batch_size]
+            # The header pass only pays for itself when rules can skip bodies
+            if pending and (self.prefilter_keywords or self.prefilter_senders):
+                emails = self._fetch_emails_prefiltered(pending, is_processed)
+            elif pending:
+                emails = self._fetch_emails_bulk(pending)
 
-                for seq_num in batch:
-                    # FIX: Handle both bytes and different types of sequence numbers safely
-                    if isinstance(seq_num, bytes):
-                        seq_num_str = seq_num.decode()
-                    elif isinstance(seq_num, int):
-                        seq_num_str = str(seq_num)
-                    else:
-                        seq_num_str = str(seq_num)
-                        
-                    if seq_num_str in self.processed_seq_nums:
-                        continue
-                    try:
-                        email_dict = self._fetch_single_email(seq_num_str)
-                        if email_dict:
-                            emails.append(email_dict)
-                    except Exception as e:
-                        logger.error(f"Error fetching email sequence {seq_num_str}: {str(e)}")
-                        continue
-                if i + batch_size < len(seq_num_list):
-                    time.sleep(0.5)
+            self._last_activity = time.monotonic()
 
         except Exception as e:
             logger.error(f"Error fetching emails: {str(e)}")
+            # Force a NOOP check (and reconnect if needed) on the next call
+            self._last_activity = 0.0
 
         return emails
 
@@ -220,6 +548,121 @@ class GmailClient:
         else:
             return f'({" ".join(criteria_parts)})'
 
+    def _fetch_emails_prefiltered(self, seq_nums: List[str],
+                                  is_processed: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """
+        Fetch headers for all emails, then full bodies only for candidates.
+        
+        Emails that is_processed() accepts, or whose subject and sender match none
+        of the configured prefilter rules, are returned headers-only with
+        'prefiltered' set, so callers can skip them without parsing.
+        
+        Args:
+            seq_nums: Sequence numbers as strings
+            is_processed: Optional check for emails handled in an earlier run
+            
+        Returns:
+            List of email dictionaries in the order they were requested
+        """
+        try:
+            status, msg_data = self.imap.fetch(compact_seq_set(seq_nums), PREFILTER_FETCH)
+            if status != 'OK' or not msg_data:
+                raise Exception(f"Header fetch failed: {msg_data}")
+        except Exception as e:
+            logger.warning(f"Header prefetch failed, fetching full emails: {e}")
+            return self._fetch_emails_bulk(seq_nums)
+            
+        headers = {}
+        for part in msg_data:
+            if not isinstance(part, tuple) or len(part) < 2:
+                continue
+            seq_num_str = part[0].split(None, 1)[0].decode()
+            try:
+                headers[seq_num_str] = self._parse_headers(email.message_from_bytes(part[1]))
+                headers[seq_num_str]['seq_num'] = seq_num_str
+            except Exception as e:
+                logger.error(f"Error parsing headers for sequence {seq_num_str}: {str(e)}")
+        
+        seen = {s for s, h in headers.items() if is_processed and is_processed(h)}
+        use_rules = bool(self.prefilter_keywords or self.prefilter_senders)
+        
+        # Anything we could not classify is fetched in full to be safe
+        candidates = [
+            s for s in seq_nums
+            if s not in headers or (s not in seen and (not use_rules or self._is_candidate(headers[s])))
+        ]
+        logger.info(f"🔎 Prefilter: fetching {len(candidates)} of {len(seq_nums)} emails in full "
+                    f"({len(seen)} already processed)")
+        
+        fetched = {e['seq_num']: e for e in self._fetch_emails_bulk(candidates)} if candidates else {}
+        
+        emails = []
+        prefiltered = []
+        for seq_num_str in seq_nums:
+            if seq_num_str in fetched:
+                emails.append(fetched[seq_num_str])
+            elif seq_num_str in headers:
+                email_dict = headers[seq_num_str]
+                email_dict.update({'seq_num': seq_num_str, 'body': '', 'body_type': 'prefiltered', 'prefiltered': True})
+                emails.append(email_dict)
+                prefiltered.append(seq_num_str)
+        self.processed_seq_nums.update(prefiltered)
+                
+        return emails
+
+    def _is_candidate(self, headers: Dict) -> bool:
+        """Whether an email's subject or sender matches the prefilter rules."""
+        subject = headers.get('subject', '').lower()
+        sender = headers.get('from', '').lower()
+        return (any(keyword in subject for keyword in self.prefilter_keywords) or
+                any(allowed in sender for allowed in self.prefilter_senders))
+
+    def _fetch_emails_bulk(self, seq_nums: List[str]) -> List[Dict]:
+        """
+        Fetch several emails with a single IMAP FETCH command per 100 messages.
+        
+        Args:
+            seq_nums: Sequence numbers as strings
+            
+        Returns:
+            List of email dictionaries in the order they were requested
+        """
+        if len(seq_nums) > FETCH_CHUNK_SIZE:
+            emails = []
+            for start in range(0, len(seq_nums), FETCH_CHUNK_SIZE):
+                emails.extend(self._fetch_emails_bulk(seq_nums[start:start + FETCH_CHUNK_SIZE]))
+            return emails
+            
+        try:
+            status, msg_data = self.imap.fetch(compact_seq_set(seq_nums), FULL_FETCH)
+            if status != 'OK' or not msg_data:
+                raise Exception(f"Bulk fetch failed: {msg_data}")
+        except Exception as e:
+            logger.warning(f"Bulk fetch failed, falling back to per-message fetch: {e}")
+            emails = []
+            for seq_num_str in seq_nums:
+                email_dict = self._fetch_single_email(seq_num_str)
+                if email_dict:
+                    emails.append(email_dict)
+            return emails
+
+        # Response interleaves (b'<seq> (RFC822 {n}', raw_bytes) tuples with b')' terminators
+        fetched = {}
+        for part in msg_data:
+            if not isinstance(part, tuple) or len(part) < 2:
+                continue
+            seq_num_str = part[0].split(None, 1)[0].decode()
+            try:
+                message = email.message_from_bytes(part[1])
+                email_dict = self._parse_email_enhanced(message)
+                email_dict['seq_num'] = seq_num_str
+                fetched[seq_num_str] = email_dict
+            except Exception as e:
+                logger.error(f"Error parsing email sequence {seq_num_str}: {str(e)}")
+        self.processed_seq_nums.update(fetched)
+
+        return [fetched[seq_num_str] for seq_num_str in seq_nums if seq_num_str in fetched]
+
     def _fetch_single_email(self, seq_num_str: str) -> Optional[Dict]:
         """
         FIXED: Fetch single email with proper type handling.
@@ -232,7 +675,7 @@ class GmailClient:
         """
         try:
             # seq_num_str is already a string at this point
-            status, msg_data = self.imap.fetch(seq_num_str, '(RFC822 FLAGS INTERNALDATE)')
+            status, msg_data = self.imap.fetch(seq_num_str, FULL_FETCH)
             if status != 'OK' or not msg_data or not msg_data[0]:
                 return None
                 
@@ -247,13 +690,17 @@ class GmailClient:
             logger.error(f"Error fetching single email {seq_num_str}: {str(e)}")
             return None
 
-    def _parse_email_enhanced(self, message) -> Dict:
+    def _parse_headers(self, message) -> Dict:
         email_dict = {}
         email_dict['subject'] = self._decode_header_enhanced(message.get('Subject', ''))
         email_dict['from'] = self._decode_header_enhanced(message.get('From', ''))
         email_dict['to'] = self._decode_header_enhanced(message.get('To', ''))
         email_dict['date'] = message.get('Date', '')
         email_dict['message_id'] = message.get('Message-ID', '')
+        return email_dict
+
+    def _parse_email_enhanced(self, message) -> Dict:
+        email_dict = self._parse_headers(message)
 
         body_plain = ""
         body_html = ""
@@ -354,11 +801,10 @@ class GmailClient:
             return str(header_value)
 
     def _strip_html_basic(self, html_content: str) -> str:
-        import re
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<[^>]+>', ' ', html_content)
-        html_content = re.sub(r'\s+', ' ', html_content)
+        html_content = SCRIPT_RE.sub('', html_content)
+        html_content = STYLE_RE.sub('', html_content)
+        html_content = TAG_RE.sub(' ', html_content)
+        html_content = WHITESPACE_RE.sub(' ', html_content)
         return html_content.strip()
 
     def mark_as_processed(self, seq_num: str, use_flag: bool = True) -> bool:
@@ -396,6 +842,79 @@ class GmailClient:
             logger.error(f"Error marking email as processed: {str(e)}")
             return False
 
+    def mark_many_as_processed(self, seq_nums: List[str], use_flag: bool = True) -> Set[str]:
+        """
+        Mark several emails as processed with one STORE for the flags and one for the label.
+        
+        Args:
+            seq_nums: Sequence numbers as strings
+            use_flag: Also set \\Flagged as a backup marker
+            
+        Returns:
+            Set of sequence numbers that were marked successfully
+        """
+        if not seq_nums or not self.ensure_connection():
+            return set()
+        
+        seq_set = compact_seq_set(seq_nums)
+        try:
+            # \Seen and the backup \Flagged marker go out in the same STORE
+            flags = '(\\Seen \\Flagged)' if use_flag else '\\Seen'
+            status, data = self.imap.store(seq_set, '+FLAGS', flags)
+            if status != 'OK':
+                logger.warning(f"Bulk mark failed, falling back to per-message store: {data}")
+                return {seq_num for seq_num in seq_nums if self.mark_as_processed(seq_num, use_flag)}
+            
+            # Try to add Gmail label if supported
+            if self._check_capability('X-GM-EXT-1'):
+                try:
+                    status, data = self.imap.store(seq_set, '+X-GM-LABELS', f'({self.processed_label_name})')
+                    if status != 'OK':
+                        logger.debug(f"Could not add Gmail label: {data}")
+                except Exception as e:
+                    logger.debug(f"Gmail label operation failed: {e}")
+                    if not use_flag:
+                        # Without the label, fall back to the \Flagged marker
+                        status, data = self.imap.store(seq_set, '+FLAGS', '\\Flagged')
+                        if status != 'OK':
+                            logger.warning(f"Could not flag emails: {data}")
+                    
+            self.processed_seq_nums.update(seq_nums)
+            self._last_activity = time.monotonic()
+            return set(seq_nums)
+            
+        except Exception as e:
+            logger.error(f"Error marking emails as processed: {str(e)}")
+            self._last_activity = 0.0
+            return set()
+
+    def release(self, seq_nums: List[str]) -> bool:
+        """
+        Put fetched but unprocessed emails back in the unread queue.
+        
+        The full fetch sets \\Seen implicitly, so it is removed again, and the
+        sequence numbers are forgotten so the next fetch picks them up.
+        
+        Returns:
+            True if the server accepted the flag change
+        """
+        for seq_num in seq_nums:
+            self.processed_seq_nums.discard(seq_num)
+        if not seq_nums or not self.ensure_connection():
+            return False
+            
+        try:
+            status, data = self.imap.store(compact_seq_set(seq_nums), '-FLAGS', '\\Seen')
+            if status != 'OK':
+                logger.warning(f"Could not return emails to unread: {data}")
+                return False
+            self._last_activity = time.monotonic()
+            return True
+        except Exception as e:
+            logger.error(f"Error returning emails to unread: {str(e)}")
+            self._last_activity = 0.0
+            return False
+
     def get_folder_list(self) -> List[str]:
         if not self.ensure_connection():
             return []
@@ -4,14 +4,130 @@ import json
 import logging
 import time
 import re
-from typing import Dict, Optional, List, Any, Union, Tuple
+from typing import Callable, Dict, Optional, List, Any, Union, Tuple
 from datetime import datetime
-from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, fields
 from enum import Enum
+from dateutil import parser as date_parser
 from openai import OpenAI, RateLimitError, APIError, APIConnectionError
 
+from . import json_utils
+from .parse_cache import ParseCache
+from .rate_limiter import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Patterns for locating the JSON payload in a model response, in priority order
+JSON_BLOCK_PATTERNS = (
+    re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL | re.IGNORECASE),  # ```json { ... } ```
+    re.compile(r'```\s*(\{.*?\})\s*```', re.DOTALL | re.IGNORECASE),     # ``` { ... } ```
+    re.compile(r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})', re.DOTALL | re.IGNORECASE),  # Direct JSON object
+)
+
+# Sensitive data scrubbed from emails before they are sent to OpenAI
+CARD_NUMBER_RE = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
+SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+
+
+# System prompt shared by every parse request. It must stay byte-for-byte
+# identical between calls (no timestamps or per-email values) so the
+# provider can serve the prefix from its prompt cache.
+COMPLETENESS_SYSTEM_PROMPT = """You are an expert email parser for inventory management. Parse purchase and sales emails with STRICT completeness requirements.
+
+COMPLETENESS REQUIREMENTS (per PRD):
+- Item names: REQUIRED for all items
+- Quantities: REQUIRED for each item
+- Unit prices: REQUIRED for each item
+- Tax: REQUIRED as a separate field (not included in item prices)
+- Shipping: OPTIONAL
+
+CRITICAL INSTRUCTIONS:
+1. NEVER guess or invent data. If a field is missing, set it to null.
+2. Extract EXACTLY what is in the email. Do not interpolate missing values.
+3. Tax must be captured separately from item prices.
+4. Mark any item missing name, quantity, or unit price as incomplete.
+5. ALWAYS respond with valid JSON wrapped in ```json ``` blocks.
+
+For PURCHASE emails return:
+```json
+{
+    "type": "purchase",
+    "date": "YYYY-MM-DD" or null,
+    "vendor_name": "exact vendor name" or null,
+    "order_number": "exact order number" or null,
+    "items": [
+        {
+            "name": "exact product name" or null,
+            "sku": "SKU if present" or null,
+            "upc": "UPC if present" or null,
+            "product_id": "any other ID" or null,
+            "quantity": number or null,
+            "unit_price": number (excluding tax) or null,
+            "item_tax": number (if item-specific) or null
+        }
+    ],
+    "subtotal": number or null,
+    "taxes": number (total tax as separate field) or null,
+    "shipping": number or null,
+    "total": number or null
+}
+```
+
+For SALES emails return:
+```json
+{
+    "type": "sale",
+    "date": "YYYY-MM-DD" or null,
+    "channel": "eBay/Shopify/Amazon/etc" or null,
+    "order_number": "exact order number" or null,
+    "customer_email": "email if present" or null,
+    "items": [
+        {
+            "name": "exact product name" or null,
+            "sku": "SKU if present" or null,
+            "upc": "UPC if present" or null,
+            "product_id": "any other ID" or null,
+            "quantity": number or null,
+            "sale_price": number (excluding tax) or null,
+            "item_tax": number (if item-specific) or null
+        }
+    ],
+    "subtotal": number or null,
+    "taxes": number (total tax as separate field) or null,
+    "fees": number or null,
+    "shipping": number or null,
+    "total": number or null
+}
+```
+
+If the email is neither clearly a purchase nor sale:
+```json
+{
+    "type": "unknown",
+    "reason": "brief explanation",
+    "partial_data": {any fields you could extract}
+}
+```
+
+IMPORTANT: 
+- Set any missing field to null
+- Tax MUST be a separate field from item prices
+- Do NOT include tax in unit_price or sale_price
+- Extract all available product identifiers (SKU, UPC, product ID)
+- ALWAYS wrap your JSON response in ```json ``` blocks"""
+
+
+# Fixed preamble of batch requests; per-email content is appended after it
+BATCH_PROMPT_HEADER = """Parse each of the following emails into structured JSON following the STRICT completeness rules.
+
+Treat every email independently - never copy values between emails.
+Return ONE JSON object of the form {"results": [ ... ]} containing exactly one object per email,
+each using the purchase/sale/unknown format and an extra "email_index" field with the email's number.
+Always wrap the JSON in ```json ``` blocks.
+
+"""
+
 
 class ParseStatus(Enum):
     """Email parsing status codes."""
@@ -31,6 +147,22 @@ class DataCompleteness(Enum):
     INVALID = "invalid"
 
 
+def _is_present(value: Any) -> bool:
+    return bool(value)
+
+
+def _is_positive(value: Any) -> bool:
+    return value is not None and value > 0
+
+
+def _is_non_negative(value: Any) -> bool:
+    return value is not None and value >= 0
+
+
+def _is_set(value: Any) -> bool:
+    return value is not None
+
+
 @dataclass
 class ItemCompleteness:
     """Track completeness of individual items."""
@@ -42,11 +174,7 @@ class ItemCompleteness:
     @property
     def is_complete(self) -> bool:
         """Check if item has all required fields."""
-        return all([
-            self.has_name,
-            self.has_quantity,
-            self.has_unit_price
-        ])
+        return self.has_name and self.has_quantity and self.has_unit_price
         
     @property
     def missing_fields(self) -> List[str]:
@@ -78,12 +206,28 @@ class ParseResult:
     completeness: DataCompleteness = DataCompleteness.INVALID
     completeness_details: Dict = field(default_factory=dict)
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage."""
-        result = asdict(self)
+    def to_dict(self, copy: bool = True) -> Dict:
+        """
+        Convert to dictionary for storage.
+        
+        With copy=False the dict shares this result's lists and dicts instead of
+        deep-copying them; use it only when the dict is serialized straight away.
+        """
+        if copy:
+            result = asdict(self)
+        else:
+            result = {f.name: getattr(self, f.name) for f in fields(self)}
         result['status'] = self.status.value
         result['completeness'] = self.completeness.value
         return result
+        
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParseResult':
+        """Rebuild a ParseResult from to_dict() output."""
+        values = {f.name: data[f.name] for f in fields(cls) if f.name in data}
+        values['status'] = ParseStatus(data.get('status', ParseStatus.FAILED.value))
+        values['completeness'] = DataCompleteness(data.get('completeness', DataCompleteness.INVALID.value))
+        return cls(**values)
 
 
 class EmailParser:
@@ -94,15 +238,44 @@ class EmailParser:
         'purchase': {
             'required': ['date', 'vendor_name', 'items', 'taxes'],
             'optional': ['order_number', 'shipping', 'subtotal', 'total'],
-            'item_required': ['name', 'quantity', 'unit_price']
+            'item_required': ['name', 'quantity', 'unit_price'],
+            'party_field': 'vendor_name'
         },
         'sale': {
             'required': ['date', 'channel', 'items', 'taxes'],
             'optional': ['order_number', 'customer_email', 'fees', 'shipping', 'subtotal', 'total'],
-            'item_required': ['name', 'quantity', 'sale_price']
+            'item_required': ['name', 'quantity', 'sale_price'],
+            'party_field': 'channel'
         }
     }
     
+    # Per-item checks for each type's item_required fields: (ItemCompleteness flag, field, check)
+    ITEM_FIELD_CHECKS = {
+        transaction_type: tuple(zip(
+            ('has_name', 'has_quantity', 'has_unit_price'),
+            requirements['item_required'],
+            (_is_present, _is_positive, _is_non_negative)
+        ))
+        for transaction_type, requirements in COMPLETE_DATA_REQUIREMENTS.items()
+    }
+    
+    # Top-level checks for each type (completeness tracker key, field, check); taxes may be 0
+    FIELD_CHECKS = {
+        transaction_type: (
+            ('has_date', 'date', _is_present),
+            ('has_vendor_or_channel', requirements['party_field'], _is_present),
+            ('has_taxes', 'taxes', _is_set),
+        )
+        for transaction_type, requirements in COMPLETE_DATA_REQUIREMENTS.items()
+    }
+    
+    # Confidence deductions for missing critical fields (completeness tracker key, penalty)
+    CONFIDENCE_PENALTIES = (
+        ('has_date', 0.2),
+        ('has_vendor_or_channel', 0.2),
+        ('has_taxes', 0.15),
+    )
+    
     # Field validation patterns
     VALIDATION_PATTERNS = {
         'date': r'^\d{4}-\d{2}-\d{2}$',
@@ -111,6 +284,7 @@ class EmailParser:
         'sku': r'^[A-Za-z0-9\-_]+$',
         'upc': r'^\d{12,13}$'
     }
+    VALIDATION_REGEXES = {name: re.compile(pattern) for name, pattern in VALIDATION_PATTERNS.items()}
     
     def __init__(self, config):
         self.config = config
@@ -121,19 +295,74 @@ class EmailParser:
         self.retry_delay = config.get_int('OPENAI_RETRY_DELAY', 2)
         self.enable_sanitization = config.get_bool('ENABLE_DATA_SANITIZATION', True)
         self.strict_completeness = config.get_bool('STRICT_COMPLETENESS_CHECK', True)
+        self.batch_parse = config.get_bool('OPENAI_BATCH_PARSE', True)
+        # Larger batch prompts get slower and less reliable, so batches are split
+        self.batch_max_emails = max(2, config.get_int('OPENAI_BATCH_MAX_EMAILS', 20))
+        self.parse_concurrency = max(1, config.get_int('OPENAI_MAX_CONCURRENCY', 4))
+        
+        # Optional client-side cap on requests per minute (0 = rely on SDK retries)
+        requests_per_minute = config.get_float('OPENAI_REQUESTS_PER_MINUTE', 0)
+        self.rate_limiter = TokenBucket(requests_per_minute, per=60) if requests_per_minute > 0 else None
+        
+        # Cache of results for identical emails (e.g. re-sent or duplicated notifications)
+        self.cache = None
+        if config.get_bool('PARSE_CACHE_ENABLED', True):
+            try:
+                self.cache = ParseCache(config)
+            except Exception as e:
+                logger.warning(f"Parse cache disabled: {e}")
+        # Extractions scored below this are not replayed; a re-send gets a fresh parse
+        self.cache_min_confidence = config.get_float('PARSE_CACHE_MIN_CONFIDENCE', 0.5)
         
-    def parse_email(self, body: str, subject: str) -> ParseResult:
+    # Results worth replaying for an identical email; errors are always retried
+    CACHEABLE_STATUSES = (ParseStatus.SUCCESS, ParseStatus.INCOMPLETE, ParseStatus.UNKNOWN_TYPE)
+    
+    def _cacheable(self, result: ParseResult) -> bool:
+        """Whether a result should be stored in the parse cache."""
+        if result.status not in self.CACHEABLE_STATUSES:
+            return False
+        # "Not an order" carries no extraction (and no confidence score) to doubt
+        return result.status == ParseStatus.UNKNOWN_TYPE or result.confidence_score >= self.cache_min_confidence
+    
+    def parse_email(self, body: str, subject: str, sender: Optional[str] = None) -> ParseResult:
         """
         Parse email content with comprehensive completeness validation.
         
         Args:
             body: Email body content
             subject: Email subject
+            sender: From header, used to namespace the parse cache
             
         Returns:
             ParseResult with status, data, completeness info
         """
-        start_time = time.time()
+        if not self.cache:
+            return self._parse_email_uncached(body, subject)
+            
+        cache_key = self.cache.make_key(subject, body, sender)
+        try:
+            cached = self.cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Parse cache lookup failed: {e}")
+            cached = None
+            
+        if cached:
+            logger.info(f"♻️ Parse cache hit for: {subject[:60]}")
+            return ParseResult.from_dict(cached)
+            
+        result = self._parse_email_uncached(body, subject)
+        
+        if self._cacheable(result):
+            try:
+                self.cache.put(cache_key, result.to_dict(copy=False), sender)
+            except Exception as e:
+                logger.warning(f"Parse cache store failed: {e}")
+                
+        return result
+        
+    def _parse_email_uncached(self, body: str, subject: str) -> ParseResult:
+        """Parse email content by calling OpenAI."""
+        start_time = time.monotonic()
         
         # Sanitize input if needed
         if self.enable_sanitization:
@@ -159,13 +388,13 @@ class EmailParser:
                     return ParseResult(
                         status=ParseStatus.API_ERROR,
                         errors=["Failed to parse OpenAI response"],
-                        parse_time=time.time() - start_time,
+                        parse_time=time.monotonic() - start_time,
                         completeness=DataCompleteness.INVALID
                     )
                 
                 # Validate completeness and enrich the data
                 validation_result = self._validate_completeness(parsed_data)
-                validation_result.parse_time = time.time() - start_time
+                validation_result.parse_time = time.monotonic() - start_time
                 
                 # Log sanitized version
                 self._log_result(validation_result)
@@ -182,7 +411,7 @@ class EmailParser:
                 return ParseResult(
                     status=ParseStatus.API_ERROR,
                     errors=[f"Rate limit exceeded: {str(e)}"],
-                    parse_time=time.time() - start_time,
+                    parse_time=time.monotonic() - start_time,
                     completeness=DataCompleteness.INVALID
                 )
                 
@@ -194,7 +423,7 @@ class EmailParser:
                 return ParseResult(
                     status=ParseStatus.API_ERROR,
                     errors=[f"API error: {str(e)}"],
-                    parse_time=time.time() - start_time,
+                    parse_time=time.monotonic() - start_time,
                     completeness=DataCompleteness.INVALID
                 )
                 
@@ -203,22 +432,186 @@ class EmailParser:
                 return ParseResult(
                     status=ParseStatus.FAILED,
                     errors=[f"Unexpected error: {str(e)}"],
-                    parse_time=time.time() - start_time,
+                    parse_time=time.monotonic() - start_time,
                     completeness=DataCompleteness.INVALID
                 )
         
         return ParseResult(
             status=ParseStatus.FAILED,
             errors=["Max retries exceeded"],
-            parse_time=time.time() - start_time,
+            parse_time=time.monotonic() - start_time,
             completeness=DataCompleteness.INVALID
         )
         
+    def _parse_batch_chunk(self, chunk: List[int], emails: List[Dict], cache_keys: List[bytes],
+                           results: List[Optional[ParseResult]],
+                           on_result: Optional[Callable[[int, ParseResult], None]] = None) -> None:
+        """Parse the emails at the given indexes with one OpenAI request, filling results in place."""
+        if len(chunk) < 2:
+            return  # A single email is cheaper to parse with the regular prompt
+            
+        start_time = time.monotonic()
+        try:
+            batch_data = self._call_openai_batch([emails[i] for i in chunk])
+        except Exception as e:
+            logger.warning(f"Batch parse failed, falling back to per-email parsing: {e}")
+            batch_data = []
+            
+        per_email_time = (time.monotonic() - start_time) / len(chunk)
+        for position, data in enumerate(batch_data):
+            index = data.pop('email_index', position + 1) if isinstance(data, dict) else None
+            if not isinstance(index, int) or not 1 <= index <= len(chunk):
+                continue
+            target = chunk[index - 1]
+            if results[target] is not None:
+                continue
+                
+            cleaned = self._clean_parsed_data(data)
+            if not cleaned:
+                continue
+                
+            result = self._validate_completeness(cleaned)
+            result.parse_time = per_email_time
+            self._log_result(result)
+            results[target] = result
+            
+            if self.cache and self._cacheable(result):
+                try:
+                    self.cache.put(cache_keys[target], result.to_dict(copy=False), emails[target].get('from'))
+                except Exception as e:
+                    logger.warning(f"Parse cache store failed: {e}")
+                    
+            if on_result:
+                on_result(target, result)
+                    
+        covered = sum(1 for i in chunk if results[i] is not None)
+        logger.info(f"Batch parse covered {covered}/{len(chunk)} emails in {time.monotonic() - start_time:.2f}s")
+        
+    def parse_emails_batch(self, emails: List[Dict],
+                           on_result: Optional[Callable[[int, ParseResult], None]] = None) -> List[ParseResult]:
+        """
+        Parse several emails with a single OpenAI request.
+        
+        Cached emails are served from the parse cache; anything the batch
+        response does not cover is parsed individually, so one bad email
+        never fails the rest.
+        
+        Args:
+            emails: Email dicts with 'subject', 'body' and optional 'from'
+            on_result: Called with (index, result) as soon as each email's result
+                is final, possibly from a worker thread, so callers can start
+                processing while the rest of the batch is still being parsed
+            
+        Returns:
+            ParseResult per email, in input order
+        """
+        results: List[Optional[ParseResult]] = [None] * len(emails)
+        
+        def finish(i: int, result: ParseResult) -> None:
+            results[i] = result
+            if on_result:
+                on_result(i, result)
+                
+        cache_keys = [
+            ParseCache.make_key(email_data.get('subject', ''), email_data.get('body', ''), email_data.get('from'))
+            for email_data in emails
+        ]
+        
+        if self.cache:
+            for i, email_data in enumerate(emails):
+                try:
+                    cached = self.cache.get(cache_keys[i])
+                except Exception as e:
+                    logger.warning(f"Parse cache lookup failed: {e}")
+                    cached = None
+                if cached:
+                    logger.info(f"♻️ Parse cache hit for: {email_data.get('subject', '')[:60]}")
+                    finish(i, ParseResult.from_dict(cached))
+        
+        # Identical emails in one batch (resends, duplicates) are parsed once
+        first_index: Dict[bytes, int] = {}
+        duplicates: Dict[int, int] = {}
+        pending = []
+        for i, result in enumerate(results):
+            if result is not None:
+                continue
+            if cache_keys[i] in first_index:
+                duplicates[i] = first_index[cache_keys[i]]
+            else:
+                first_index[cache_keys[i]] = i
+                pending.append(i)
+        
+        # Each chunk is one OpenAI request; chunks run concurrently
+        if self.batch_parse and len(pending) > 1:
+            chunks = [pending[start:start + self.batch_max_emails]
+                      for start in range(0, len(pending), self.batch_max_emails)]
+            with ThreadPoolExecutor(max_workers=min(self.parse_concurrency, len(chunks))) as pool:
+                list(pool.map(lambda chunk: self._parse_batch_chunk(chunk, emails, cache_keys, results, on_result),
+                              chunks))
+        
+        # Anything not covered by a batch is parsed on its own, also concurrently
+        uncovered = [i for i in pending if results[i] is None]
+        if uncovered:
+            with ThreadPoolExecutor(max_workers=min(self.parse_concurrency, len(uncovered))) as pool:
+                list(pool.map(
+                    lambda i: finish(i, self.parse_email(emails[i].get('body', ''), emails[i].get('subject', ''),
+                                                         sender=emails[i].get('from'))),
+                    uncovered
+                ))
+                
+        # to_dict() deep-copies, so duplicates don't share mutable parse data
+        for i, source in duplicates.items():
+            logger.info(f"♻️ Duplicate email in batch, reusing parse: {emails[i].get('subject', '')[:60]}")
+            finish(i, ParseResult.from_dict(results[source].to_dict()))
+                
+        return results
+        
+    def _call_openai_batch(self, emails: List[Dict]) -> List[Dict]:
+        """Call OpenAI once for several emails and return the raw per-email objects."""
+        sections = []
+        for i, email_data in enumerate(emails, 1):
+            body = email_data.get('body', '')
+            subject = email_data.get('subject', '')
+            if self.enable_sanitization:
+                body = self._sanitize_input(body)
+                subject = self._sanitize_input(subject)
+            sections.append(f"=== EMAIL {i} ===\nEmail Subject: {subject}\n\nEmail Body:\n---\n{body}\n---")
+            
+        prompt = BATCH_PROMPT_HEADER + f"Number of emails: {len(emails)}\n\n" + "\n\n".join(sections)
+        
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._get_completeness_focused_prompt()},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=min(2000 * len(emails), 16000)
+        )
+        
+        self._log_usage(response)
+        content = response.choices[0].message.content
+        json_text = self._extract_json_from_text(content or '')
+        if not json_text:
+            raise ValueError("No JSON found in batch response")
+            
+        payload = json_utils.loads(json_text)
+        batch_results = payload.get('results') if isinstance(payload, dict) else payload
+        if not isinstance(batch_results, list):
+            raise ValueError("Batch response has no results list")
+            
+        return batch_results
+        
     def _call_openai(self, body: str, subject: str) -> Optional[str]:
         """Call OpenAI API with the email content."""
         try:
             prompt = self._create_enhanced_prompt(body, subject)
             
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+                
             # Removed response_format parameter as it's not supported by all models
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -230,6 +623,7 @@ class EmailParser:
                 max_tokens=2000
             )
             
+            self._log_usage(response)
             return response.choices[0].message.content
             
         except Exception as e:
@@ -247,7 +641,7 @@ class EmailParser:
                 return None
             
             # Try to parse as JSON
-            data = json.loads(json_text)
+            data = json_utils.loads(json_text)
             
             # Clean up the data
             return self._clean_parsed_data(data)
@@ -259,18 +653,19 @@ class EmailParser:
             
     def _extract_json_from_text(self, text: str) -> Optional[str]:
         """Extract JSON object from text response."""
-        # Try to find JSON block markers first
-        json_patterns = [
-            r'```json\s*(\{.*?\})\s*```',  # ```json { ... } ```
-            r'```\s*(\{.*?\})\s*```',     # ``` { ... } ```
-            r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})',  # Direct JSON object
-        ]
+        # Most responses are a bare JSON object: take it whole without running the
+        # patterns (the direct-object pattern only matches two levels of nesting,
+        # so on a deeper batch response it would return an inner object)
+        stripped = text.strip()
+        if stripped.startswith('{') and stripped.endswith('}'):
+            return stripped
         
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            if matches:
+        # Try to find JSON block markers first
+        for pattern in JSON_BLOCK_PATTERNS:
+            match = pattern.search(text)
+            if match:
                 # Return the first match
-                return matches[0].strip()
+                return match.group(1).strip()
         
         # If no clear JSON block found, try to extract the largest JSON-like structure
         # Look for anything that starts with { and ends with }
@@ -349,43 +744,20 @@ class EmailParser:
             else:
                 result.warnings.append(f"Unexpected transaction type: {transaction_type}")
                 
-        # Get requirements for this transaction type
-        requirements = self.COMPLETE_DATA_REQUIREMENTS.get(transaction_type, {})
-        
-        # Track completeness
-        completeness_tracker = {
-            'has_date': False,
-            'has_vendor_or_channel': False,
-            'has_all_items': False,
-            'has_taxes': False,
-            'items_complete': [],
-            'items_incomplete': []
-        }
-        
-        # Check date
-        if data.get('date'):
-            completeness_tracker['has_date'] = True
-            self._validate_date(data, result)
-        else:
-            result.missing_fields.append('date')
-            
-        # Check vendor/channel
-        if transaction_type == 'purchase':
-            if data.get('vendor_name'):
-                completeness_tracker['has_vendor_or_channel'] = True
-            else:
-                result.missing_fields.append('vendor_name')
-        else:  # sale
-            if data.get('channel'):
-                completeness_tracker['has_vendor_or_channel'] = True
-            else:
-                result.missing_fields.append('channel')
-                
-        # Check tax (required as separate field per PRD)
-        if data.get('taxes') is not None:
-            completeness_tracker['has_taxes'] = True
-        else:
-            result.missing_fields.append('taxes')
+        # Get checks for this transaction type (unexpected types are checked as sales)
+        field_checks = self.FIELD_CHECKS.get(transaction_type, self.FIELD_CHECKS['sale'])
+        item_checks = self.ITEM_FIELD_CHECKS.get(transaction_type, self.ITEM_FIELD_CHECKS['sale'])
+        
+        # Track completeness: date, vendor/channel and tax (required as separate field per PRD)
+        completeness_tracker = {'has_all_items': False, 'items_complete': [], 'items_incomplete': []}
+        for flag, field_name, check in field_checks:
+            completeness_tracker[flag] = check(data.get(field_name))
+            if not completeness_tracker[flag]:
+                result.missing_fields.append(field_name)
+            elif flag == 'has_date':
+                # Validated in turn, so an invalid date keeps its place in missing_fields
+                self._validate_date(data, result)
+        if not completeness_tracker['has_taxes']:
             result.warnings.append("Tax must be captured as a separate field")
             
         # Validate items completeness
@@ -396,53 +768,45 @@ class EmailParser:
             completeness_tracker['has_all_items'] = False
         else:
             all_items_complete = True
-            price_field = 'unit_price' if transaction_type == 'purchase' else 'sale_price'
             
             for i, item in enumerate(items):
-                item_check = ItemCompleteness()
-                
-                # Check item name
-                if item.get('name'):
-                    item_check.has_name = True
-                else:
-                    result.missing_fields.append(f'item_{i+1}_name')
-                    
-                # Check quantity
-                if item.get('quantity') is not None and item.get('quantity') > 0:
-                    item_check.has_quantity = True
-                else:
-                    result.missing_fields.append(f'item_{i+1}_quantity')
-                    
-                # Check unit price
-                if item.get(price_field) is not None and item.get(price_field) >= 0:
-                    item_check.has_unit_price = True
-                else:
-                    result.missing_fields.append(f'item_{i+1}_{price_field}')
+                # Check name, quantity and unit price; most items pass every check
+                failed = [(flag, field_name) for flag, field_name, check in item_checks
+                          if not check(item.get(field_name))]
                     
                 # Check for SKU or other identifier
-                if item.get('sku') or item.get('upc') or item.get('product_id'):
-                    item_check.has_sku_or_identifier = True
-                else:
+                has_identifier = bool(item.get('sku') or item.get('upc') or item.get('product_id'))
+                if not has_identifier:
                     result.warnings.append(f"Item {i+1}: Missing SKU/identifier")
                     
                 # Track item completeness
-                if item_check.is_complete:
+                if not failed:
                     completeness_tracker['items_complete'].append({
                         'index': i,
                         'name': item.get('name'),
                         'complete': True
                     })
-                else:
-                    all_items_complete = False
-                    completeness_tracker['items_incomplete'].append({
-                        'index': i,
-                        'name': item.get('name', f'Item {i+1}'),
-                        'missing': item_check.missing_fields
-                    })
-                    result.incomplete_items.append({
-                        'item': item,
-                        'missing_fields': item_check.missing_fields
-                    })
+                    continue
+                    
+                all_items_complete = False
+                result.missing_fields.extend(f'item_{i+1}_{field_name}' for _, field_name in failed)
+                
+                # Only incomplete items need the per-item breakdown
+                failed_flags = {flag for flag, _ in failed}
+                item_check = ItemCompleteness(
+                    has_sku_or_identifier=has_identifier,
+                    **{flag: flag not in failed_flags for flag, _, _ in item_checks}
+                )
+                missing = item_check.missing_fields
+                completeness_tracker['items_incomplete'].append({
+                    'index': i,
+                    'name': item.get('name', f'Item {i+1}'),
+                    'missing': missing
+                })
+                result.incomplete_items.append({
+                    'item': item,
+                    'missing_fields': list(missing)
+                })
                     
             completeness_tracker['has_all_items'] = all_items_complete
             
@@ -450,12 +814,10 @@ class EmailParser:
         self._validate_amounts(data, result)
         
         # Determine overall completeness
-        is_complete = all([
-            completeness_tracker['has_date'],
-            completeness_tracker['has_vendor_or_channel'],
-            completeness_tracker['has_all_items'],
-            completeness_tracker['has_taxes']
-        ])
+        # Complete = every item complete and every FIELD_CHECKS flag set (short-circuits)
+        is_complete = completeness_tracker['has_all_items'] and all(
+            completeness_tracker[flag] for flag, _, _ in field_checks
+        )
         
         if is_complete:
             result.completeness = DataCompleteness.COMPLETE
@@ -490,10 +852,9 @@ class EmailParser:
         date_field = data.get('date')
         
         if date_field:
-            if not re.match(self.VALIDATION_PATTERNS['date'], date_field):
+            if not self.VALIDATION_REGEXES['date'].match(date_field):
                 try:
-                    from dateutil import parser
-                    parsed_date = parser.parse(date_field)
+                    parsed_date = date_parser.parse(date_field)
                     data['date'] = parsed_date.strftime('%Y-%m-%d')
                     result.warnings.append(f"Date reformatted from '{date_field}'")
                 except:
@@ -539,12 +900,9 @@ class EmailParser:
         score = 1.0
         
         # Major deductions for missing critical fields
-        if not completeness_tracker['has_date']:
-            score -= 0.2
-        if not completeness_tracker['has_vendor_or_channel']:
-            score -= 0.2
-        if not completeness_tracker['has_taxes']:
-            score -= 0.15
+        for key, penalty in self.CONFIDENCE_PENALTIES:
+            if not completeness_tracker[key]:
+                score -= penalty
         if not completeness_tracker['has_all_items']:
             incomplete_ratio = len(completeness_tracker['items_incomplete']) / max(1, len(data.get('items', [])))
             score -= 0.3 * incomplete_ratio
@@ -569,16 +927,29 @@ class EmailParser:
             pass
         return None
         
+    def _log_usage(self, response) -> None:
+        """Log token usage, including how much of the prompt was served from cache."""
+        usage = getattr(response, 'usage', None)
+        if not usage:
+            return
+            
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+        logger.debug(
+            f"OpenAI usage: prompt={usage.prompt_tokens} (cached={cached_tokens}), "
+            f"completion={usage.completion_tokens}"
+        )
+        
     def _sanitize_input(self, text: str) -> str:
         """Sanitize input text to remove sensitive information."""
         if not text:
             return text
             
         # Remove credit card numbers
-        text = re.sub(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b', '[CARD_NUMBER]', text)
+        text = CARD_NUMBER_RE.sub('[CARD_NUMBER]', text)
         
         # Remove SSN patterns
-        text = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '[SSN]', text)
+        text = SSN_RE.sub('[SSN]', text)
         
         # Limit length
         max_length = 10000
@@ -612,89 +983,7 @@ class EmailParser:
         
     def _get_completeness_focused_prompt(self) -> str:
         """Get system prompt focused on completeness requirements."""
-        return """You are an expert email parser for inventory management. Parse purchase and sales emails with STRICT completeness requirements.
-
-COMPLETENESS REQUIREMENTS (per PRD):
-- Item names: REQUIRED for all items
-- Quantities: REQUIRED for each item
-- Unit prices: REQUIRED for each item
-- Tax: REQUIRED as a separate field (not included in item prices)
-- Shipping: OPTIONAL
-
-CRITICAL INSTRUCTIONS:
-1. NEVER guess or invent data. If a field is missing, set it to null.
-2. Extract EXACTLY what is in the email. Do not interpolate missing values.
-3. Tax must be captured separately from item prices.
-4. Mark any item missing name, quantity, or unit price as incomplete.
-5. ALWAYS respond with valid JSON wrapped in ```json ``` blocks.
-
-For PURCHASE emails return:
-```json
-{
-    "type": "purchase",
-    "date": "YYYY-MM-DD" or null,
-    "vendor_name": "exact vendor name" or null,
-    "order_number": "exact order number" or null,
-    "items": [
-        {
-            "name": "exact product name" or null,
-            "sku": "SKU if present" or null,
-            "upc": "UPC if present" or null,
-            "product_id": "any other ID" or null,
-            "quantity": number or null,
-            "unit_price": number (excluding tax) or null,
-            "item_tax": number (if item-specific) or null
-        }
-    ],
-    "subtotal": number or null,
-    "taxes": number (total tax as separate field) or null,
-    "shipping": number or null,
-    "total": number or null
-}
-```
-
-For SALES emails return:
-```json
-{
-    "type": "sale",
-    "date": "YYYY-MM-DD" or null,
-    "channel": "eBay/Shopify/Amazon/etc" or null,
-    "order_number": "exact order number" or null,
-    "customer_email": "email if present" or null,
-    "items": [
-        {
-            "name": "exact product name" or null,
-            "sku": "SKU if present" or null,
-            "upc": "UPC if present" or null,
-            "product_id": "any other ID" or null,
-            "quantity": number or null,
-            "sale_price": number (excluding tax) or null,
-            "item_tax": number (if item-specific) or null
-        }
-    ],
-    "subtotal": number or null,
-    "taxes": number (total tax as separate field) or null,
-    "fees": number or null,
-    "shipping": number or null,
-    "total": number or null
-}
-```
-
-If the email is neither clearly a purchase nor sale:
-```json
-{
-    "type": "unknown",
-    "reason": "brief explanation",
-    "partial_data": {any fields you could extract}
-}
-```
-
-IMPORTANT: 
-- Set any missing field to null
-- Tax MUST be a separate field from item prices
-- Do NOT include tax in unit_price or sale_price
-- Extract all available product identifiers (SKU, UPC, product ID)
-- ALWAYS wrap your JSON response in ```json ``` blocks"""
+        return COMPLETENESS_SYSTEM_PROMPT
         
     def _create_enhanced_prompt(self, body: str, subject: str) -> str:
         """Create enhanced prompt with completeness focus."""
@@ -0,0 +1,145 @@
+"""Persistent cache of OpenAI parse results keyed by email content."""
+
+import logging
+import re
+import sqlite3
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from threading import Lock
+
+from . import json_utils
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class ParseCache:
+    """
+    SQLite-backed cache mapping email content to a stored parse result.
+
+    Entries are keyed by the raw SHA-256 digest (32-byte BLOB) of the sender
+    domain, subject and body, so a hit is only served for an identical email from the same
+    sender domain. Runs of whitespace are collapsed first, so a re-send that
+    was only re-wrapped still hits. Near-duplicate templates are deliberately not matched:
+    two order confirmations from one vendor differ only in the numbers we
+    need to extract.
+
+    Recently used entries are also kept in a small in-memory LRU
+    (PARSE_CACHE_MEMORY_SIZE) so repeat hits skip the database.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.path = config.get('PARSE_CACHE_PATH', 'parse_cache.db')
+        self.ttl = config.get_int('PARSE_CACHE_TTL', 604800)
+        self.memory_size = config.get_int('PARSE_CACHE_MEMORY_SIZE', 1024)
+        self._memory: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = Lock()
+
+        # Shared by worker threads; access is serialized through _lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key BLOB PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+        logger.info(f"🗄️ Parse cache initialized: {self.path} (TTL: {self.ttl}s)")
+
+    @staticmethod
+    def sender_domain(sender: Optional[str]) -> str:
+        """Extract the domain part of a From header, used as cache namespace."""
+        if not sender:
+            return ''
+        address = sender.rsplit('<', 1)[-1].rstrip('> ').strip()
+        return address.rsplit('@', 1)[-1].lower() if '@' in address else address.lower()
+
+    @staticmethod
+    def make_key(subject: str, body: str, sender: Optional[str] = None) -> bytes:
+        """Build the cache key for an email."""
+        digest = hashlib.sha256()
+        for part in (ParseCache.sender_domain(sender), subject or '', body or ''):
+            part = WHITESPACE_RE.sub(' ', part).strip()
+            digest.update(part.encode('utf-8', errors='ignore'))
+            digest.update(b'\0')
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Dict]:
+        """Return the cached result dict for key, or None on miss/expiry."""
+        with self._lock:
+            row = self._memory.get(key)
+            if row:
+                self._memory.move_to_end(key)
+            else:
+                row = self._conn.execute(
+                    "SELECT result, created_at FROM parse_cache WHERE key = ?", (key,)
+                ).fetchone()
+
+            if not row:
+                return None
+
+            result, created_at = row
+            if time.time() - created_at > self.ttl:
+                self._memory.pop(key, None)
+                self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._remember(key, result, created_at)
+
+        return json_utils.loads(result)
+
+    def put(self, key: bytes, result: Dict, sender: Optional[str] = None) -> None:
+        """Store a result dict under key."""
+        try:
+            payload = json_utils.dumps(result)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Parse result not cacheable: {e}")
+            return
+
+        created_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, namespace, result, created_at) VALUES (?, ?, ?, ?)",
+                (key, self.sender_domain(sender), payload, created_at)
+            )
+            self._conn.commit()
+            self._remember(key, payload, created_at)
+
+    def _remember(self, key: bytes, payload: str, created_at: float) -> None:
+        """Keep the serialized entry in the memory LRU (caller holds _lock)."""
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = (payload, created_at)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM parse_cache WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"🧹 Purged {cursor.rowcount} expired parse cache entries")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
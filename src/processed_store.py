@@ -0,0 +1,144 @@
+"""Persistent record of processed emails with a bounded in-memory LRU."""
+
+import hashlib
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Iterable
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing over one 128-bit digest instead of k separate hashes
+        digest = hashlib.blake2b(key.encode('utf-8', errors='ignore'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class ProcessedStore:
+    """
+    Track which emails have been processed, surviving restarts.
+
+    Lookups hit an OrderedDict LRU capped at PROCESSED_CACHE_SIZE entries and
+    fall back to SQLite, so memory stays bounded however long the service runs.
+    A Bloom filter over every stored key answers the common "never seen" case
+    without touching the database.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.path = config.get('PROCESSED_STORE_PATH', 'processed_emails.db')
+        self.capacity = max(1, config.get_int('PROCESSED_CACHE_SIZE', 100000))
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processed (
+                key TEXT PRIMARY KEY,
+                ts INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._bloom = self._build_bloom()
+
+        # Warm the LRU with the most recently processed keys (oldest first)
+        rows = self._conn.execute(
+            "SELECT key FROM processed ORDER BY ts DESC LIMIT ?", (self.capacity,)
+        ).fetchall()
+        for (key,) in reversed(rows):
+            self._recent[key] = None
+
+        logger.info(f"🗄️ Processed email store initialized: {self.path} ({len(self._recent)} recent entries)")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._recent:
+                self._recent.move_to_end(key)
+                return True
+
+            if key not in self._bloom:
+                return False
+
+            row = self._conn.execute(
+                "SELECT 1 FROM processed WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row:
+                self._remember(key)
+                return True
+
+        return False
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        """Record keys as processed in memory and on disk."""
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+
+        now = int(time.time())
+        with self._lock:
+            for key in keys:
+                self._remember(key)
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed (key, ts) VALUES (?, ?)",
+                [(key, now) for key in keys]
+            )
+            self._conn.commit()
+
+            for key in keys:
+                self._bloom.add(key)
+            if self._bloom.count > self._bloom.capacity:
+                # Past capacity the false-positive rate climbs; rebuild larger
+                self._bloom = self._build_bloom()
+
+    def _build_bloom(self) -> BloomFilter:
+        """Build a Bloom filter holding every stored key, sized with headroom."""
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM processed").fetchone()
+        bloom = BloomFilter(max(self.capacity, total * 2))
+        for (key,) in self._conn.execute("SELECT key FROM processed"):
+            bloom.add(key)
+        return bloom
+
+    def _remember(self, key: str) -> None:
+        """Insert into the LRU, evicting the least recently used entry on overflow."""
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.capacity:
+            self._recent.popitem(last=False)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
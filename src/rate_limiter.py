@@ -0,0 +1,37 @@
+"""Client-side request throttling shared by the API clients."""
+
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` requests per `per` seconds.
+
+    Requests are throttled before they are sent rather than retried after a
+    429, so parallel workers do not burn their retry budget against the
+    provider's rate limit. Up to `rate` requests may go out back to back.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0):
+        self.capacity = max(1.0, float(rate))
+        self.fill_rate = rate / per  # tokens per second
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+
+            # Take the tokens now (possibly going negative) so concurrent callers
+            # queue up behind each other instead of all waking at once
+            self._tokens -= tokens
+            wait = -self._tokens / self.fill_rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
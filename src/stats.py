@@ -0,0 +1,88 @@
+"""Session statistics for the reconciliation loop."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+COUNTER_NAMES = (
+    'emails_processed',
+    'parse_successful',
+    'parse_failed',
+    'complete_data',
+    'incomplete_data',
+    'airtable_saved',
+    'synced_to_zoho',
+    'purchase_orders_created',
+    'sales_orders_created',
+    'bills_created',
+    'invoices_created',
+    'shipments_created',
+    'inventory_updated',
+    'human_reviews_required',
+    'errors',
+)
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """
+    Counters for the current session, safe to increment from worker threads.
+
+    Each thread increments its own shard, so incr() never takes a lock on the
+    hot path; reads (attribute access, counters()) sum the shards. Shards are
+    pre-populated with every counter name and only ever written by their owning
+    thread, so readers can iterate them while workers are still counting.
+    """
+    # Wall-clock start is only for display; durations use the monotonic clock
+    session_start: datetime = field(default_factory=datetime.now)
+    monotonic_start: float = field(default_factory=time.monotonic)
+    _local: threading.local = field(default_factory=threading.local, repr=False, compare=False)
+    _shards: List[Dict[str, int]] = field(default_factory=list, repr=False, compare=False)
+    _shards_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Increment a counter by name."""
+        shard = getattr(self._local, 'counts', None)
+        if shard is None:
+            shard = self._new_shard()
+        if name not in shard:
+            raise AttributeError(f"Unknown counter: {name}")
+        shard[name] += amount
+
+    def incr_many(self, names: Iterable[str]) -> None:
+        """Increment several counters by one, looking up this thread's shard once."""
+        shard = getattr(self._local, 'counts', None)
+        if shard is None:
+            shard = self._new_shard()
+        for name in names:
+            if name not in shard:
+                raise AttributeError(f"Unknown counter: {name}")
+            shard[name] += 1
+
+    def _new_shard(self) -> Dict[str, int]:
+        """Register a counter shard for the calling thread (once per thread)."""
+        shard = dict.fromkeys(COUNTER_NAMES, 0)
+        with self._shards_lock:
+            self._shards.append(shard)
+        self._local.counts = shard
+        return shard
+
+    def __getattr__(self, name: str) -> int:
+        if name in COUNTER_NAMES:
+            return sum(shard[name] for shard in list(self._shards))
+        raise AttributeError(name)
+
+    @property
+    def runtime_seconds(self) -> float:
+        """Seconds since the session started."""
+        return time.monotonic() - self.monotonic_start
+
+    def counters(self) -> Dict[str, int]:
+        """Snapshot of all counters."""
+        totals = dict.fromkeys(COUNTER_NAMES, 0)
+        for shard in list(self._shards):
+            for name in COUNTER_NAMES:
+                totals[name] += shard[name]
+        return totals
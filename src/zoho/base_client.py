@@ -3,26 +3,34 @@
 import logging
 import requests
 import json
+import time
 from typing import Dict, Optional
 from datetime import datetime
 from threading import Lock
 
 from ..github_token_manager import GitHubGistTokenManager
+from ..http_session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Refresh the access token this many seconds before Zoho says it expires
+TOKEN_EXPIRY_MARGIN = 60
+
 
 class ZohoBaseClient:
     """Base Zoho client handling authentication and core API operations."""
     
-    def __init__(self, config):
+    def __init__(self, config, session: Optional[requests.Session] = None):
         self.config = config
         self.organization_id = config.get('ZOHO_ORGANIZATION_ID')
         self.access_token = None
+        self._token_expiry = 0.0  # time.monotonic() deadline for access_token
+        self._token_lock = Lock()
+        self.session = session or create_session(config)
         
         # Initialize GitHub Gist token manager
         try:
-            self.token_manager = GitHubGistTokenManager(config)
+            self.token_manager = GitHubGistTokenManager(config, self.session)
             self.use_token_caching = True
             logger.info("GitHub Gist token caching enabled")
         except ValueError as e:
@@ -57,6 +65,7 @@ class ZohoBaseClient:
             'taxes': {}
         }
         self._cache_lock = Lock()
+        self._connection_lock = Lock()
         
         logger.info(f"🔧 Zoho base client initialized:")
         logger.info(f"   - Base URL: {self.base_url}")
@@ -67,28 +76,60 @@ class ZohoBaseClient:
         if self.is_available is not None:
             return self.is_available
             
-        logger.info("🔗 First Zoho API access - establishing connection...")
-        
-        # Initialize connection - FIX: Use _ensure_access_token
-        if self._ensure_access_token():
-            self.is_available = self.test_connection()
-            if self.is_available:
-                self._load_cache()
-                logger.info("✅ Zoho connection established successfully")
+        # Workers may hit Zoho concurrently; only one of them should connect
+        with self._connection_lock:
+            if self.is_available is not None:
+                return self.is_available
+                
+            logger.info("🔗 First Zoho API access - establishing connection...")
+            
+            # Initialize connection - FIX: Use _ensure_access_token
+            if self._ensure_access_token():
+                self.is_available = self.test_connection()
+                if self.is_available:
+                    self._load_cache()
+                    logger.info("✅ Zoho connection established successfully")
+                else:
+                    logger.warning("⚠️ Zoho connection failed - will retry on next API call")
             else:
-                logger.warning("⚠️ Zoho connection failed - will retry on next API call")
-        else:
-            self.is_available = False
-            logger.error("❌ Failed to get Zoho access token")
+                self.is_available = False
+                logger.error("❌ Failed to get Zoho access token")
+                
+            return self.is_available
+
+    def _ensure_access_token(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Ensure we have a valid access token using GitHub Gist caching.
+        
+        The current token is reused until it is within TOKEN_EXPIRY_MARGIN of
+        expiry. Refreshes are serialized, so concurrent workers that all hit an
+        expired token trigger a single refresh.
+        
+        Args:
+            stale_token: Token the server just rejected; forces a refresh
+                unless another thread has already replaced it
+        """
+        if self._token_is_fresh(stale_token):
+            return True
             
-        return self.is_available
+        with self._token_lock:
+            if self._token_is_fresh(stale_token):
+                return True
+                
+            if self.use_token_caching and self.token_manager:
+                return self._get_cached_or_refresh_token()
+            else:
+                return self._refresh_access_token_legacy()
 
-    def _ensure_access_token(self) -> bool:
-        """Ensure we have a valid access token using GitHub Gist caching."""
-        if self.use_token_caching and self.token_manager:
-            return self._get_cached_or_refresh_token()
-        else:
-            return self._refresh_access_token_legacy()
+    def _token_is_fresh(self, stale_token: Optional[str] = None) -> bool:
+        """Whether the current token can be used without refreshing."""
+        return (bool(self.access_token) and self.access_token != stale_token and
+                time.monotonic() < self._token_expiry - TOKEN_EXPIRY_MARGIN)
+
+    def _set_access_token(self, access_token: str, expires_in: float) -> None:
+        """Store a token together with its monotonic expiry deadline."""
+        self.access_token = access_token
+        self._token_expiry = time.monotonic() + expires_in
 
     def _get_cached_or_refresh_token(self) -> bool:
         """Get token from cache or refresh if needed."""
@@ -100,7 +141,8 @@ class ZohoBaseClient:
                 test_token = cached_token['access_token']
                 if self._validate_token(test_token):
                     logger.info("Using valid cached access token")
-                    self.access_token = test_token
+                    expires_at = datetime.fromisoformat(cached_token['expires_at'])
+                    self._set_access_token(test_token, (expires_at - datetime.utcnow()).total_seconds())
                     return True
                 else:
                     logger.info("Cached token is invalid, refreshing...")
@@ -125,7 +167,7 @@ class ZohoBaseClient:
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/organizations",
                 headers=headers,
                 timeout=10
@@ -151,7 +193,7 @@ class ZohoBaseClient:
                 'grant_type': 'refresh_token'
             }
             
-            response = requests.post(auth_url, data=data, timeout=30)
+            response = self.session.post(auth_url, data=data, timeout=30)
             response.raise_for_status()
             
             token_data = response.json()
@@ -167,7 +209,7 @@ class ZohoBaseClient:
             else:
                 logger.warning("Failed to cache new access token, but will continue")
             
-            self.access_token = access_token
+            self._set_access_token(access_token, expires_in)
             logger.info("Zoho access token refreshed successfully")
             return True
             
@@ -189,13 +231,14 @@ class ZohoBaseClient:
                 'grant_type': 'refresh_token'
             }
             
-            response = requests.post(auth_url, data=data, timeout=30)
+            response = self.session.post(auth_url, data=data, timeout=30)
             response.raise_for_status()
             
             token_data = response.json()
-            self.access_token = token_data.get('access_token')
+            access_token = token_data.get('access_token')
             
-            if self.access_token:
+            if access_token:
+                self._set_access_token(access_token, token_data.get('expires_in', 3600))
                 logger.debug("Legacy token refresh successful")
                 return True
             else:
@@ -228,7 +271,11 @@ class ZohoBaseClient:
         try:
             logger.debug(f"Making {method} request to: {url}")
             
-            response = requests.request(
+            # Refresh ahead of expiry instead of waiting for a 401
+            self._ensure_access_token()
+            used_token = self.access_token
+            
+            response = self.session.request(
                 method=method,
                 url=url,
                 json=data,
@@ -240,7 +287,7 @@ class ZohoBaseClient:
             # Handle token expiration - FIX: Use _ensure_access_token
             if response.status_code == 401 and retry:
                 logger.info("🔑 Token expired, refreshing...")
-                self._ensure_access_token()
+                self._ensure_access_token(stale_token=used_token)
                 return self._make_api_request(method, endpoint, data, params, retry=False)
                 
             response.raise_for_status()
@@ -1,7 +1,8 @@
 """Zoho entity management for vendors, customers, and items."""
 
 import logging
-from typing import Dict
+from threading import Lock
+from typing import Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,16 @@ class ZohoEntityManager:
         self.default_inventory_account = self.config.get('ZOHO_DEFAULT_INVENTORY_ACCOUNT')
         self.default_cogs_account = self.config.get('ZOHO_DEFAULT_COGS_ACCOUNT')
         self.default_sales_account = self.config.get('ZOHO_DEFAULT_SALES_ACCOUNT')
+        
+        # Per-entity locks serialize search-then-create so concurrent workers don't
+        # create duplicates, without making unrelated records wait on each other
+        self._create_locks: Dict[Tuple[str, str], Lock] = {}
+        self._create_locks_guard = Lock()
+
+    def _create_lock(self, kind: str, key: str) -> Lock:
+        """Get the lock guarding creation of one vendor, customer or item."""
+        with self._create_locks_guard:
+            return self._create_locks.setdefault((kind, key), Lock())
 
     # ===========================================
     # VENDOR MANAGEMENT
@@ -31,43 +42,49 @@ class ZohoEntityManager:
             if standardized_name in self.base_client._cache['vendors']:
                 return self.base_client._cache['vendors'][standardized_name]
         
-        try:
-            # Search for existing vendor
-            search_response = self.base_client._make_api_request('GET', 'contacts', {
-                'contact_type': 'vendor',
-                'search_text': standardized_name
-            })
-            
-            vendors = search_response.get('contacts', [])
-            for vendor in vendors:
-                if vendor.get('contact_name', '').lower() == standardized_name.lower():
-                    vendor_id = vendor['contact_id']
-                    
-                    with self.base_client._cache_lock:
-                        self.base_client._cache['vendors'][standardized_name] = vendor_id
-                    
-                    logger.info(f"✅ Found existing vendor: {standardized_name} (ID: {vendor_id})")
-                    return vendor_id
-            
-            # Create new vendor
-            vendor_create_data = {
-                'contact_name': standardized_name,
-                'contact_type': 'vendor',
-                'company_name': standardized_name
-            }
-            
-            create_response = self.base_client._make_api_request('POST', 'contacts', vendor_create_data)
-            vendor_id = create_response.get('contact', {}).get('contact_id')
-            
+        with self._create_lock('vendors', standardized_name):
+            # Another worker may have resolved it while we waited
             with self.base_client._cache_lock:
-                self.base_client._cache['vendors'][standardized_name] = vendor_id
-            
-            logger.info(f"✅ Created new vendor: {standardized_name} (ID: {vendor_id})")
-            return vendor_id
+                if standardized_name in self.base_client._cache['vendors']:
+                    return self.base_client._cache['vendors'][standardized_name]
             
-        except Exception as e:
-            logger.error(f"❌ Failed to find/create vendor {vendor_name}: {e}")
-            raise
+            try:
+                # Search for existing vendor
+                search_response = self.base_client._make_api_request('GET', 'contacts', {
+                    'contact_type': 'vendor',
+                    'search_text': standardized_name
+                })
+                
+                vendors = search_response.get('contacts', [])
+                for vendor in vendors:
+                    if vendor.get('contact_name', '').lower() == standardized_name.lower():
+                        vendor_id = vendor['contact_id']
+                        
+                        with self.base_client._cache_lock:
+                            self.base_client._cache['vendors'][standardized_name] = vendor_id
+                        
+                        logger.info(f"✅ Found existing vendor: {standardized_name} (ID: {vendor_id})")
+                        return vendor_id
+                
+                # Create new vendor
+                vendor_create_data = {
+                    'contact_name': standardized_name,
+                    'contact_type': 'vendor',
+                    'company_name': standardized_name
+                }
+                
+                create_response = self.base_client._make_api_request('POST', 'contacts', vendor_create_data)
+                vendor_id = create_response.get('contact', {}).get('contact_id')
+                
+                with self.base_client._cache_lock:
+                    self.base_client._cache['vendors'][standardized_name] = vendor_id
+                
+                logger.info(f"✅ Created new vendor: {standardized_name} (ID: {vendor_id})")
+                return vendor_id
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to find/create vendor {vendor_name}: {e}")
+                raise
 
     def _standardize_vendor_name(self, vendor_name: str) -> str:
         """Clean and standardize vendor names."""
@@ -103,46 +120,52 @@ class ZohoEntityManager:
             if standardized_name in self.base_client._cache['customers']:
                 return self.base_client._cache['customers'][standardized_name]
         
-        try:
-            # Search for existing customer
-            search_response = self.base_client._make_api_request('GET', 'contacts', {
-                'contact_type': 'customer',
-                'search_text': standardized_name
-            })
-            
-            customers = search_response.get('contacts', [])
-            for customer in customers:
-                if customer.get('contact_name', '').lower() == standardized_name.lower():
-                    customer_id = customer['contact_id']
-                    
-                    with self.base_client._cache_lock:
-                        self.base_client._cache['customers'][standardized_name] = customer_id
-                    
-                    logger.info(f"✅ Found existing customer: {standardized_name} (ID: {customer_id})")
-                    return customer_id
-            
-            # Create new customer
-            customer_create_data = {
-                'contact_name': standardized_name,
-                'contact_type': 'customer',
-                'company_name': standardized_name
-            }
-            
-            if customer_email:
-                customer_create_data['email'] = customer_email
-            
-            create_response = self.base_client._make_api_request('POST', 'contacts', customer_create_data)
-            customer_id = create_response.get('contact', {}).get('contact_id')
-            
+        with self._create_lock('customers', standardized_name):
+            # Another worker may have resolved it while we waited
             with self.base_client._cache_lock:
-                self.base_client._cache['customers'][standardized_name] = customer_id
-            
-            logger.info(f"✅ Created new customer: {standardized_name} (ID: {customer_id})")
-            return customer_id
+                if standardized_name in self.base_client._cache['customers']:
+                    return self.base_client._cache['customers'][standardized_name]
             
-        except Exception as e:
-            logger.error(f"❌ Failed to find/create customer {channel_name}: {e}")
-            raise
+            try:
+                # Search for existing customer
+                search_response = self.base_client._make_api_request('GET', 'contacts', {
+                    'contact_type': 'customer',
+                    'search_text': standardized_name
+                })
+                
+                customers = search_response.get('contacts', [])
+                for customer in customers:
+                    if customer.get('contact_name', '').lower() == standardized_name.lower():
+                        customer_id = customer['contact_id']
+                        
+                        with self.base_client._cache_lock:
+                            self.base_client._cache['customers'][standardized_name] = customer_id
+                        
+                        logger.info(f"✅ Found existing customer: {standardized_name} (ID: {customer_id})")
+                        return customer_id
+                
+                # Create new customer
+                customer_create_data = {
+                    'contact_name': standardized_name,
+                    'contact_type': 'customer',
+                    'company_name': standardized_name
+                }
+                
+                if customer_email:
+                    customer_create_data['email'] = customer_email
+                
+                create_response = self.base_client._make_api_request('POST', 'contacts', customer_create_data)
+                customer_id = create_response.get('contact', {}).get('contact_id')
+                
+                with self.base_client._cache_lock:
+                    self.base_client._cache['customers'][standardized_name] = customer_id
+                
+                logger.info(f"✅ Created new customer: {standardized_name} (ID: {customer_id})")
+                return customer_id
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to find/create customer {channel_name}: {e}")
+                raise
 
     def _standardize_channel_name(self, channel_name: str) -> str:
         """Clean and standardize channel names for customer creation."""
@@ -182,36 +205,42 @@ class ZohoEntityManager:
             if sku in self.base_client._cache['items']:
                 return self.base_client._cache['items'][sku]
         
-        try:
-            # Search for existing item by SKU
-            search_response = self.base_client._make_api_request('GET', 'items', {'sku': sku})
-            items = search_response.get('items', [])
+        with self._create_lock('items', sku):
+            # Another worker may have resolved it while we waited
+            with self.base_client._cache_lock:
+                if sku in self.base_client._cache['items']:
+                    return self.base_client._cache['items'][sku]
             
-            if items:
-                item_id = items[0]['item_id']
+            try:
+                # Search for existing item by SKU
+                search_response = self.base_client._make_api_request('GET', 'items', {'sku': sku})
+                items = search_response.get('items', [])
+                
+                if items:
+                    item_id = items[0]['item_id']
+                    
+                    with self.base_client._cache_lock:
+                        self.base_client._cache['items'][sku] = item_id
+                    
+                    logger.debug(f"✅ Found existing item: {sku} (ID: {item_id})")
+                    return item_id
+                
+                # Create new item
+                logger.info(f"📦 Creating new item: {sku} - {item_name}")
+                item_data = self._build_item_creation_data(sku, item_name)
+                
+                create_response = self.base_client._make_api_request('POST', 'items', item_data)
+                item_id = create_response.get('item', {}).get('item_id')
                 
                 with self.base_client._cache_lock:
                     self.base_client._cache['items'][sku] = item_id
                 
-                logger.debug(f"✅ Found existing item: {sku} (ID: {item_id})")
+                logger.info(f"✅ Created new item: {sku} (ID: {item_id})")
                 return item_id
-            
-            # Create new item
-            logger.info(f"📦 Creating new item: {sku} - {item_name}")
-            item_data = self._build_item_creation_data(sku, item_name)
-            
-            create_response = self.base_client._make_api_request('POST', 'items', item_data)
-            item_id = create_response.get('item', {}).get('item_id')
-            
-            with self.base_client._cache_lock:
-                self.base_client._cache['items'][sku] = item_id
-            
-            logger.info(f"✅ Created new item: {sku} (ID: {item_id})")
-            return item_id
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to ensure item exists {sku}: {e}")
-            raise
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to ensure item exists {sku}: {e}")
+                raise
 
     def _build_item_creation_data(self, sku: str, item_name: str) -> Dict:
         """Build item creation data with proper account setup."""
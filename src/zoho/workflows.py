@@ -2,7 +2,7 @@
 
 import logging
 from typing import Dict, List
-from datetime import datetime
+from datetime import date
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,11 @@ class ZohoWorkflowProcessor:
         self.auto_create_invoices = self.config.get_bool('ZOHO_AUTO_CREATE_INVOICES', True)
         self.auto_create_shipments = self.config.get_bool('ZOHO_AUTO_CREATE_SHIPMENTS', True)
         self.allow_direct_adjustments = self.config.get_bool('ZOHO_ALLOW_DIRECT_ADJUSTMENTS', False)
+        
+        self._workflows = {
+            'purchase': self._process_purchase_with_proper_workflow,
+            'sale': self._process_sale_with_proper_workflow
+        }
 
     def process_complete_data(self, clean_data: Dict, transaction_type: str) -> Dict:
         """Process clean data from Airtable through proper Zoho workflows."""
@@ -46,12 +51,10 @@ class ZohoWorkflowProcessor:
             
         try:
             if self.use_proper_workflows:
-                if transaction_type == 'purchase':
-                    return self._process_purchase_with_proper_workflow(clean_data)
-                elif transaction_type == 'sale':
-                    return self._process_sale_with_proper_workflow(clean_data)
-                else:
-                    result['errors'].append(f"Unknown transaction type: {transaction_type}")
+                workflow = self._workflows.get(transaction_type)
+                if workflow:
+                    return workflow(clean_data)
+                result['errors'].append(f"Unknown transaction type: {transaction_type}")
             else:
                 logger.warning("⚠️ Using legacy direct adjustment workflow - DEPRECATED")
                 if not self.allow_direct_adjustments:
@@ -276,7 +279,7 @@ class ZohoWorkflowProcessor:
         """Build purchase order data structure."""
         po_data = {
             'vendor_id': vendor_id,
-            'date': airtable_data.get('date', datetime.now().strftime('%Y-%m-%d')),
+            'date': airtable_data.get('date') or date.today().isoformat(),
             'reference_number': airtable_data.get('order_number', ''),
             'notes': f"Auto-generated from email parsing - Order: {airtable_data.get('order_number', '')}",
             'line_items': []
@@ -300,7 +303,7 @@ class ZohoWorkflowProcessor:
     def _build_receive_data(self, po_id: str, items: List[Dict]) -> Dict:
         """Build receive data for marking PO as received."""
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': date.today().isoformat(),
             'line_items': [
                 {
                     'item_id': item['item_id'],
@@ -314,7 +317,7 @@ class ZohoWorkflowProcessor:
         """Build sales order data structure."""
         so_data = {
             'customer_id': customer_id,
-            'date': airtable_data.get('date', datetime.now().strftime('%Y-%m-%d')),
+            'date': airtable_data.get('date') or date.today().isoformat(),
             'reference_number': airtable_data.get('order_number', ''),
             'notes': f"Auto-generated from email parsing - Order: {airtable_data.get('order_number', '')}",
             'line_items': []
@@ -338,7 +341,7 @@ class ZohoWorkflowProcessor:
     def _build_shipment_data(self, so_id: str, items: List[Dict]) -> Dict:
         """Build shipment data structure."""
         return {
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': date.today().isoformat(),
             'delivery_method': 'Standard',
             'line_items': [
                 {
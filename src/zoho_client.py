@@ -1,7 +1,8 @@
 """Main Zoho client - refactored with modular architecture."""
 
 import logging
-from typing import Dict
+import requests
+from typing import Dict, Optional
 from datetime import datetime
 
 from .zoho.base_client import ZohoBaseClient
@@ -14,12 +15,12 @@ logger = logging.getLogger(__name__)
 class ZohoClient:
     """Main Zoho client with proper Purchase Order and Sales Order workflows."""
     
-    def __init__(self, config):
-        """Initialize the modular Zoho client."""
+    def __init__(self, config, session: Optional[requests.Session] = None):
+        """Initialize the modular Zoho client (session: shared HTTP session, optional)."""
         self.config = config
         
         # Initialize components
-        self.base_client = ZohoBaseClient(config)
+        self.base_client = ZohoBaseClient(config, session)
         self.entity_manager = ZohoEntityManager(self.base_client)
         self.workflow_processor = ZohoWorkflowProcessor(self.base_client, self.entity_manager)
         
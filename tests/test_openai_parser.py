@@ -0,0 +1,40 @@
+"""Tests for EmailParser completeness validation."""
+
+import unittest
+
+from src.openai_parser import DataCompleteness, EmailParser
+
+
+class ValidateCompletenessTest(unittest.TestCase):
+
+    def setUp(self):
+        # Validation needs no client or config, so skip __init__
+        self.parser = EmailParser.__new__(EmailParser)
+
+    def test_missing_fields_keep_check_order_for_invalid_date(self):
+        data = {
+            'type': 'sale',
+            'date': 'not a date',
+            'taxes': 1.5,
+            'items': [{'name': 'Widget', 'quantity': 2, 'sale_price': 9.99}],
+        }
+
+        result = self.parser._validate_completeness(data)
+
+        self.assertEqual(result.missing_fields, ['date', 'channel'])
+        self.assertEqual(result.completeness, DataCompleteness.INCOMPLETE)
+        self.assertEqual(data['date_original'], 'not a date')
+
+    def test_missing_fields_order_for_missing_date(self):
+        data = {
+            'type': 'purchase',
+            'items': [{'name': 'Widget', 'quantity': 0, 'unit_price': 4.0}],
+        }
+
+        result = self.parser._validate_completeness(data)
+
+        self.assertEqual(result.missing_fields, ['date', 'vendor_name', 'taxes', 'item_1_quantity'])
+
+
+if __name__ == '__main__':
+    unittest.main()